@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Run any of the plotting analyses from one process.
+
+Each subcommand is one of the plot_*.py scripts with the same options; ``all``
+sorts the given exports by kind (detected from the CSV header), loads each
+one once, and renders every applicable analysis through a single worker pool.
+Analyses that read the same export share its in-memory frame: a randomized
+export feeds both the overall and the sensitivity figures, and a set of
+multi-policy exports feeds both the cache-size and the reliability comparison.
+
+Export kinds (header columns -> analyses):
+    timeline      time, hits, misses, hitRate  timeline
+    randomized    runIndex                     randomized, sensitivity
+    combined      device and network           combined
+    device        device                       device (cache size)
+    network       network                      network (reliability)
+    multi-policy  any other policy metrics     metrics; device/network across several files
+
+Usage:
+    python aware_plots.py all data/*.csv --output-dir figures
+    python aware_plots.py timeline data/multi-policy-timeline-1234.csv --stats
+"""
+
+import argparse
+import sys
+from pathlib import Path
+import pandas as pd
+from common import (run_render_plans, report_render_results, enable_profiling, report_profile,
+                    add_format_argument)
+import plot_metrics
+import plot_timeline
+import plot_randomized_overall
+import plot_sensitivity
+import plot_cache_size_comparison
+import plot_network_reliability_comparison
+import plot_combined_comparison
+
+
+TIMELINE_COLUMNS = {'policy', 'time', 'hits', 'misses', 'hitRate'}
+MULTI_POLICY_COLUMNS = {'policy', 'cacheSize', 'cacheHitRate', 'deliveryRate'}
+
+# name: (module, accepted export kinds, reads several files as one frame, default prefix)
+# A default prefix of None means the stem of each input file.
+ANALYSES = {
+    'metrics': (plot_metrics, ('multi-policy',), False, None),
+    'timeline': (plot_timeline, ('timeline',), True, None),
+    'randomized': (plot_randomized_overall, ('randomized',), False, None),
+    'sensitivity': (plot_sensitivity, ('randomized',), False, None),
+    'device': (plot_cache_size_comparison, ('device', 'multi-policy'), True, 'cache_size_comparison'),
+    'network': (plot_network_reliability_comparison, ('network', 'multi-policy'), True,
+                'network_reliability_comparison'),
+    'combined': (plot_combined_comparison, ('combined',), False, 'combined_comparison'),
+}
+
+
+def detect_kind(csv_path):
+    """Classify an export from its header row."""
+    try:
+        columns = set(pd.read_csv(csv_path, nrows=0).columns)
+    except FileNotFoundError:
+        print(f"Error: File not found: {csv_path}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error reading header of {csv_path}: {e}")
+        sys.exit(1)
+
+    if TIMELINE_COLUMNS <= columns:
+        return 'timeline'
+    if 'policy' in columns and 'runIndex' in columns:
+        return 'randomized'
+    if MULTI_POLICY_COLUMNS <= columns:
+        if {'device', 'network'} <= columns:
+            return 'combined'
+        if 'device' in columns:
+            return 'device'
+        if 'network' in columns:
+            return 'network'
+        return 'multi-policy'
+    if 'alertId' in columns:
+        print(f"Error: {csv_path} is a per-alert export; replay it with replay_sweep.py first")
+    else:
+        print(f"Error: Unrecognized export: {csv_path} (columns: {', '.join(sorted(columns))})")
+    sys.exit(1)
+
+
+def add_common_arguments(parser):
+    add_format_argument(parser)
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help='Number of worker processes for reading files and rendering plots (default: one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                       help='Re-render every figure even if its inputs are unchanged')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print wall/CPU time and peak memory for each load/validate/aggregate/render/save stage')
+    parser.add_argument('--profile-json', metavar='FILE',
+                       help='Also write the --profile report to FILE as JSON (implies --profile)')
+
+
+def plan_analysis(name, files, args, prefix_for):
+    """Load ``files`` and plan one analysis; one plan per file unless it reads them together."""
+    module, _, multi, default_prefix = ANALYSES[name]
+    groups = [files] if multi else [[f] for f in files]
+    plans = []
+    for group in groups:
+        print(f"\n=== {name}: {', '.join(group)} ===")
+        prefix = prefix_for(default_prefix or Path(group[0]).stem)
+        data = module.load_inputs(group if multi else group[0], args)
+        plans.append(module.plan_jobs(data, args, prefix, group))
+    return plans
+
+
+def run_subcommand(args):
+    module, kinds, multi, default_prefix = ANALYSES[args.command]
+    for csv_file in args.files:
+        kind = detect_kind(csv_file)
+        if kind not in kinds:
+            print(f"Error: {csv_file} is a {kind} export; '{args.command}' expects {' or '.join(kinds)}")
+            sys.exit(1)
+
+    def prefix_for(default):
+        if not args.output:
+            return default
+        # Several single-file inputs each get their own prefix under --output
+        if not multi and len(args.files) > 1:
+            return f"{args.output}-{default}"
+        return args.output
+
+    return plan_analysis(args.command, args.files, args, prefix_for)
+
+
+def run_all(args):
+    by_kind = {}
+    for csv_file in args.files:
+        by_kind.setdefault(detect_kind(csv_file), []).append(csv_file)
+    print("Exports: " + ", ".join(f"{len(files)} {kind}" for kind, files in by_kind.items()))
+
+    out_dir = Path(args.output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    def prefix_for(default):
+        return str(out_dir / default)
+
+    plans = []
+    for name in ('metrics', 'combined'):
+        kind = ANALYSES[name][1][0]
+        if kind in by_kind:
+            plans += plan_analysis(name, by_kind[kind], args, prefix_for)
+
+    # Timeline exports are taken as separate experiments here, not replicate
+    # runs; pass replicates to the timeline subcommand together
+    for csv_file in by_kind.get('timeline', []):
+        plans += plan_analysis('timeline', [csv_file], args, prefix_for)
+
+    # One frame per randomized export, shared by the overall and sensitivity figures
+    for csv_file in by_kind.get('randomized', []):
+        print(f"\n=== randomized, sensitivity: {csv_file} ===")
+        df = plot_randomized_overall.load_inputs(csv_file, args)
+        prefix = prefix_for(Path(csv_file).stem)
+        plans.append(plot_randomized_overall.plan_jobs(df, args, prefix, [csv_file]))
+        plans.append(plot_sensitivity.plan_jobs(df, args, prefix, [csv_file]))
+
+    for name in ('device', 'network'):
+        if name in by_kind:
+            plans += plan_analysis(name, by_kind[name], args, prefix_for)
+
+    # Several multi-policy exports (e.g. one per cache size or reliability) are
+    # loaded into one frame and compared along whichever axis varies
+    multi_policy = by_kind.get('multi-policy', [])
+    if len(multi_policy) > 1:
+        print(f"\n=== device, network: {len(multi_policy)} multi-policy exports ===")
+        df = plot_cache_size_comparison.load_and_combine_data(multi_policy, jobs=args.jobs)
+        for name, column in (('device', 'cacheSize'), ('network', 'reliability')):
+            module, _, _, default_prefix = ANALYSES[name]
+            if column in df.columns and df[column].nunique() > 1:
+                module.validate_data(df)
+                plans.append(module.plan_jobs(df, args, prefix_for(default_prefix), multi_policy))
+    return plans
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='aware-plots',
+        description='Run the plotting analyses in one process, loading each export once',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Every analysis that applies to the given exports, into figures/
+  python aware_plots.py all data/*.csv --output-dir figures
+
+  # One analysis; same options as the matching plot_*.py script
+  python aware_plots.py randomized data/randomized-comparison-123.csv --ci bca
+  python aware_plots.py device data/multi-policy-comparison-cache*.csv --stats
+  python aware_plots.py timeline data/timeline-seed-*.csv --band 5,95 --output figures/timeline
+        """
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True, metavar='command')
+
+    for name, (module, kinds, multi, _) in ANALYSES.items():
+        sub = subparsers.add_parser(name, help=f"{module.__name__}.py ({' or '.join(kinds)} exports)")
+        sub.add_argument('files', nargs='+', metavar='csv_file',
+                         help='Export(s) to plot' + (' together' if multi else ', each on its own'))
+        sub.add_argument('--output', '-o', help='Output file prefix (default: as the script)')
+        add_common_arguments(sub)
+        module.add_arguments(sub)
+
+    # Options shared between analyses (--stats, --confidence) resolve to one flag
+    sub = subparsers.add_parser('all', help='Every analysis that applies to the given exports',
+                                conflict_handler='resolve')
+    sub.add_argument('files', nargs='+', metavar='csv_file', help='Exports of any kind')
+    sub.add_argument('--output-dir', '-o', default='.', help='Directory for all figures (default: .)')
+    add_common_arguments(sub)
+    for module in dict.fromkeys(module for module, _, _, _ in ANALYSES.values()):
+        module.add_arguments(sub)
+
+    args = parser.parse_args()
+    if args.profile or args.profile_json:
+        enable_profiling()
+
+    plans = run_all(args) if args.command == 'all' else run_subcommand(args)
+
+    print("\nGenerating plots...")
+    results = run_render_plans(plans, n_jobs=args.jobs, formats=args.formats)
+    report_profile(args.profile_json)
+    if report_render_results(results):
+        sys.exit(1)
+
+    print(f"\n✓ All plots generated successfully!")
+
+
+if __name__ == '__main__':
+    main()
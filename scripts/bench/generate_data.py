@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic CSVs in the simulator's export formats for benchmarking.
+
+Columns match the exporters in src/sim/multiPolicyBatch.ts and
+src/sim/randomizedBatch.ts exactly (same names, same order):
+
+    multi       exportMultiPolicyCSV
+    timeline    exportMultiPolicyTimelineCSV
+    randomized  exportRandomizedMultiPolicyCSV
+    device      exportDeviceComparisonCSV
+    network     exportNetworkComparisonCSV
+    combined    exportCombinedComparisonCSV
+    alerts      "Export Alerts CSV" in src/ui/RunsHistory.tsx
+
+Values are random but plausible (rates in [0, 1], monotone hit/miss counters),
+which is all the plotting scripts need to exercise their full code paths.
+
+Usage:
+    python generate_data.py timeline --policies 4 --samples 100000 -o timeline.csv
+    python generate_data.py combined --grid 10 -o combined.csv
+    python generate_data.py randomized --runs 5000 -o randomized.csv
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common import (COMBINED_COLUMNS, DEVICE_PROFILES, METRIC_COLUMNS,  # noqa: E402
+                    MULTI_POLICY_COLUMNS, NETWORK_PROFILES, POLICY_ORDER)
+
+MULTI_COLUMNS = MULTI_POLICY_COLUMNS
+TIMELINE_COLUMNS = ['policy', 'time', 'cacheSize', 'hits', 'misses', 'hitRate']
+RANDOMIZED_COLUMNS = (['runIndex', 'policy', 'seed', 'scenario', 'cacheSize', 'alerts', 'reliability',
+                       'durationSec', 'queryRatePerMin', 'wS', 'wU', 'wF',
+                       'pushRateLimitPerMin', 'pushDedupWindowSec', 'pushThreshold',
+                       'pfExplorationEpsilon', 'pfHashBuckets', 'pfTemperature', 'pfDecay',
+                       'pfLearningRate', 'pfRegularization'] + METRIC_COLUMNS)
+DEVICE_COLUMNS = ['device'] + MULTI_COLUMNS
+NETWORK_COLUMNS = ['network'] + MULTI_COLUMNS
+ALERT_COLUMNS = ['runId', 'timestamp', 'scenario', 'policy', 'seed', 'alertId', 'eventType', 'severity',
+                 'urgency', 'issuedAt', 'ttlSec', 'regionId', 'geokey', 'threadKey', 'updateNo',
+                 'sizeBytes', 'delivered']
+
+SCENARIOS = ['Rural', 'Suburban', 'Urban']
+
+
+def policy_names(n_policies: int):
+    """The simulator's policies first, then synthetic extras (Policy5, Policy6, ...)."""
+    names = list(POLICY_ORDER[:n_policies])
+    names += [f'Policy{i + 1}' for i in range(len(names), n_policies)]
+    return names
+
+
+def device_profiles(n: int):
+    """``n`` (name, cacheSize) pairs; extends the built-in list by doubling."""
+    profiles = list(DEVICE_PROFILES[:n])
+    size = DEVICE_PROFILES[-1][1]
+    while len(profiles) < n:
+        size *= 2
+        profiles.append((f'Device {len(profiles) + 1}', size))
+    return profiles
+
+
+def network_profiles(n: int):
+    """``n`` (name, reliability) pairs; extends the built-in list evenly over (0, 1]."""
+    if n <= len(NETWORK_PROFILES):
+        return list(NETWORK_PROFILES[:n])
+    return [(f'Network {i + 1}', round(r, 3)) for i, r in enumerate(np.linspace(1.0, 0.05, n))]
+
+
+def _metrics(rng, n: int) -> dict:
+    cols = {m: np.round(rng.random(n), 6) for m in METRIC_COLUMNS}
+    cols['pushesSent'] = rng.integers(0, 500, n)
+    return cols
+
+
+def _runs(rng, policies, n_cells: int, seed_prefix: str = 'bench') -> dict:
+    """Columns shared by all per-policy exports, for ``n_cells`` × policies rows."""
+    n = n_cells * len(policies)
+    return {
+        'policy': np.tile(policies, n_cells),
+        'seed': np.repeat([f'{seed_prefix}-{i}' for i in range(n_cells)], len(policies)),
+        'scenario': rng.choice(SCENARIOS, n),
+        'alerts': rng.integers(100, 2000, n),
+        'durationSec': np.full(n, 3600),
+        'queryRatePerMin': np.full(n, 6),
+    }
+
+
+def generate_multi(n_policies: int = 4, cache_size: int = 128, reliability: float = 0.9,
+                   runs: int = 1, seed: int = 0) -> pd.DataFrame:
+    """One row per policy (per run) in the exportMultiPolicyCSV layout."""
+    rng = np.random.default_rng(seed)
+    cols = _runs(rng, policy_names(n_policies), runs)
+    n = len(cols['policy'])
+    cols.update(cacheSize=np.full(n, cache_size), reliability=np.full(n, reliability))
+    cols.update(_metrics(rng, n))
+    return pd.DataFrame(cols)[MULTI_COLUMNS]
+
+
+def generate_device(n_policies: int = 4, n_devices: int = 5, runs: int = 1, seed: int = 0) -> pd.DataFrame:
+    frames = []
+    for i, (name, cache_size) in enumerate(device_profiles(n_devices)):
+        df = generate_multi(n_policies, cache_size=cache_size, runs=runs, seed=seed + i)
+        df.insert(0, 'device', name)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)[DEVICE_COLUMNS]
+
+
+def generate_network(n_policies: int = 4, n_networks: int = 8, runs: int = 1, seed: int = 0) -> pd.DataFrame:
+    frames = []
+    for i, (name, reliability) in enumerate(network_profiles(n_networks)):
+        df = generate_multi(n_policies, reliability=reliability, runs=runs, seed=seed + i)
+        df.insert(0, 'network', name)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)[NETWORK_COLUMNS]
+
+
+def generate_combined(n_policies: int = 4, n_devices: int = 5, n_networks: int = 8,
+                      runs: int = 1, seed: int = 0) -> pd.DataFrame:
+    """Every device × network cell, in the exportCombinedComparisonCSV layout."""
+    frames = []
+    for d, (device, cache_size) in enumerate(device_profiles(n_devices)):
+        for k, (network, reliability) in enumerate(network_profiles(n_networks)):
+            df = generate_multi(n_policies, cache_size=cache_size, reliability=reliability,
+                                runs=runs, seed=seed + d * n_networks + k)
+            df.insert(0, 'network', network)
+            df.insert(0, 'device', device)
+            frames.append(df)
+    return pd.concat(frames, ignore_index=True)[COMBINED_COLUMNS]
+
+
+def generate_timeline(n_policies: int = 4, n_samples: int = 720, cache_size: int = 128,
+                      step_sec: float = 5.0, seed: int = 0) -> pd.DataFrame:
+    """Cumulative hit/miss samples per policy (exportMultiPolicyTimelineCSV)."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    t = np.round(np.arange(n_samples) * step_sec, 2)
+    for policy in policy_names(n_policies):
+        queries = rng.integers(0, 5, n_samples)
+        hits = np.cumsum(rng.binomial(queries, rng.uniform(0.3, 0.8)))
+        misses = np.cumsum(queries) - hits
+        total = hits + misses
+        hit_rate = np.divide(hits, total, out=np.zeros(n_samples), where=total > 0)
+        frames.append(pd.DataFrame({
+            'policy': policy,
+            'time': t,
+            'cacheSize': np.minimum(cache_size, np.arange(n_samples) // 2),
+            'hits': hits,
+            'misses': misses,
+            'hitRate': np.round(hit_rate, 6),
+        }))
+    return pd.concat(frames, ignore_index=True)[TIMELINE_COLUMNS]
+
+
+def generate_randomized(n_policies: int = 4, n_runs: int = 100, seed: int = 0) -> pd.DataFrame:
+    """Randomized runs, one row per policy per run (exportRandomizedMultiPolicyCSV)."""
+    rng = np.random.default_rng(seed)
+    policies = policy_names(n_policies)
+    p = len(policies)
+    n = n_runs * p
+
+    def per_run(values):
+        return np.repeat(values, p)
+
+    cols = _runs(rng, policies, n_runs, seed_prefix='rand')
+    cols.update({
+        'runIndex': per_run(np.arange(1, n_runs + 1)),
+        'scenario': per_run(rng.choice(SCENARIOS, n_runs)),
+        'cacheSize': per_run(rng.choice([32, 64, 128, 256, 512], n_runs)),
+        'reliability': per_run(np.round(rng.uniform(0.3, 1.0, n_runs), 3)),
+        'wS': per_run(np.round(rng.random(n_runs), 4)),
+        'wU': per_run(np.round(rng.random(n_runs), 4)),
+        'wF': per_run(np.round(rng.random(n_runs), 4)),
+        'pushRateLimitPerMin': per_run(rng.integers(1, 10, n_runs)),
+        'pushDedupWindowSec': per_run(rng.integers(10, 300, n_runs)),
+        'pushThreshold': per_run(np.round(rng.random(n_runs), 4)),
+        'pfExplorationEpsilon': per_run(np.round(rng.uniform(0, 0.2, n_runs), 4)),
+        'pfHashBuckets': per_run(rng.choice([256, 1024, 4096], n_runs)),
+        'pfTemperature': per_run(np.round(rng.uniform(0.1, 2.0, n_runs), 4)),
+        'pfDecay': per_run(np.round(rng.uniform(0.8, 1.0, n_runs), 4)),
+        'pfLearningRate': per_run(np.round(rng.uniform(0.001, 0.1, n_runs), 4)),
+        'pfRegularization': per_run(np.round(rng.uniform(0, 0.01, n_runs), 5)),
+    })
+    cols.update(_metrics(rng, n))
+    return pd.DataFrame(cols)[RANDOMIZED_COLUMNS]
+
+
+def generate_alerts(n_alerts: int = 1000, n_runs: int = 1, n_regions: int = 40,
+                    reliability: float = 0.9, seed: int = 0) -> pd.DataFrame:
+    """Issued alerts per run, threaded like the simulator's alert generator.
+
+    About 30% of alerts update an existing ``eventType:regionId`` thread, the
+    rest either join that base thread or start a numbered sub-thread, which
+    gives the re-reference pattern the trace tools analyse.
+    """
+    rng = np.random.default_rng(seed)
+    frames = []
+    for run in range(n_runs):
+        n = n_alerts
+        event = rng.choice(['Flood', 'Shelter', 'Other'], n, p=[0.7, 0.15, 0.15])
+        # Skewed region popularity, as with the simulator's weighted regions
+        region_p = 1.0 / np.arange(1, n_regions + 1)
+        region = np.char.add('R', rng.choice(n_regions, n, p=region_p / region_p.sum()).astype(str))
+        thread = np.char.add(np.char.add(event.astype(str), ':'), region)
+        sub = (rng.random(n) >= 0.3) & (rng.random(n) < 0.4)
+        thread = np.where(sub, np.char.add(np.char.add(thread, ':'), rng.integers(0, 1000, n).astype(str)),
+                          thread)
+        update_no = pd.Series(thread).groupby(thread).cumcount().values + 1
+        severity = rng.choice(['Minor', 'Moderate', 'Severe', 'Extreme'], n, p=[0.3, 0.35, 0.25, 0.1])
+        base = np.select([event == 'Flood', event == 'Shelter'], [1800, 1200], 900)
+        size = np.round(base * (1 + np.select([severity == 'Extreme', severity == 'Severe'], [0.3, 0.15], 0)))
+        frames.append(pd.DataFrame({
+            'runId': f'run-{run}',
+            'timestamp': 1_700_000_000_000 + run,
+            'scenario': rng.choice(SCENARIOS),
+            'policy': 'LRU',
+            'seed': f'bench-{run}',
+            'alertId': [f'A{i + 1}' for i in range(n)],
+            'eventType': event,
+            'severity': severity,
+            'urgency': rng.choice(['Immediate', 'Expected', 'Future'], n),
+            'issuedAt': np.cumsum(rng.integers(1, 10, n)),
+            'ttlSec': np.maximum(120, np.round(rng.normal(1800, 450, n))).astype(int),
+            'regionId': region,
+            'geokey': region,
+            'threadKey': thread,
+            'updateNo': update_no,
+            'sizeBytes': size.astype(int),
+            'delivered': np.where(rng.random(n) < reliability, 'true', 'false'),
+        }))
+    return pd.concat(frames, ignore_index=True)[ALERT_COLUMNS]
+
+
+GENERATORS = {
+    'multi': generate_multi,
+    'device': generate_device,
+    'network': generate_network,
+    'combined': generate_combined,
+    'timeline': generate_timeline,
+    'randomized': generate_randomized,
+    'alerts': generate_alerts,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate synthetic simulator CSV exports for benchmarking',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python generate_data.py multi --policies 6 -o multi.csv
+  python generate_data.py timeline --samples 1000000 -o timeline.csv
+  python generate_data.py combined --grid 12 --runs 3 -o combined.csv
+  python generate_data.py alerts --samples 100000 --runs 4 -o alerts.csv
+        """
+    )
+    parser.add_argument('kind', choices=sorted(GENERATORS), help='Export format to generate')
+    parser.add_argument('--output', '-o', required=True, help='Output CSV path')
+    parser.add_argument('--policies', '-p', type=int, default=4, help='Number of policies (default: 4)')
+    parser.add_argument('--runs', '-r', type=int, default=1,
+                       help='Runs per cell (randomized: number of randomized runs; default: 1)')
+    parser.add_argument('--grid', '-g', type=int, default=None,
+                       help='Devices and/or network levels for device/network/combined exports')
+    parser.add_argument('--samples', type=int, default=720,
+                       help='Timeline samples per policy, or alerts per run (default: 720)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+
+    args = parser.parse_args()
+
+    if args.kind == 'multi':
+        df = generate_multi(args.policies, runs=args.runs, seed=args.seed)
+    elif args.kind == 'device':
+        df = generate_device(args.policies, args.grid or 5, runs=args.runs, seed=args.seed)
+    elif args.kind == 'network':
+        df = generate_network(args.policies, args.grid or 8, runs=args.runs, seed=args.seed)
+    elif args.kind == 'combined':
+        df = generate_combined(args.policies, args.grid or 5, args.grid or 8, runs=args.runs, seed=args.seed)
+    elif args.kind == 'timeline':
+        df = generate_timeline(args.policies, args.samples, seed=args.seed)
+    elif args.kind == 'alerts':
+        df = generate_alerts(args.samples, max(args.runs, 1), seed=args.seed)
+    else:
+        df = generate_randomized(args.policies, max(args.runs, 1), seed=args.seed)
+
+    df.to_csv(args.output, index=False)
+    print(f"✓ Wrote {len(df)} rows to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
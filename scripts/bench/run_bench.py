@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Benchmark the plotting scripts over a ladder of input sizes.
+
+For each rung (total CSV rows) synthetic exports are generated with
+generate_data.py, then every selected script is run end to end in a fresh
+process with ``--force --profile-json`` so the figures are always rendered and
+the per-stage (load/validate/aggregate/render/save) breakdown is captured.
+
+With ``--startup`` the ladder is skipped and each script's startup cost is
+measured instead: ``python -X importtime -c "import <script>"`` for the
+import time (and which heavy modules it pulls in) and ``<script> --help``
+for the wall time of a run that never touches data.
+
+With ``--smoke`` nothing is timed: each script (and ``aware_plots.py all``)
+runs once on a tiny input with only its required arguments, so a broken
+default invocation fails the run even though the ladder passes explicit
+flags.
+
+Results are appended to a JSON history file; each entry records the git
+revision, a label and the per-script timings so later runs can be compared
+against a baseline entry.
+
+Usage:
+    python run_bench.py
+    python run_bench.py --startup --label lazy-imports
+    python run_bench.py --smoke
+    python run_bench.py --rows 1e3,1e4,1e5,1e6 --scripts timeline,randomized --label after-stream
+    python run_bench.py --baseline before-stream
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from generate_data import generate_combined, generate_multi, generate_randomized, generate_timeline
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_HISTORY = Path(__file__).resolve().parent / 'history.json'
+DEFAULT_ROWS = '1e3,1e4,1e5'
+
+# Cache sizes / reliabilities used for the multi-file comparison scripts
+CACHE_LADDER = [32, 128, 512, 1024]
+RELIABILITY_LADDER = [1.0, 0.9, 0.7, 0.3]
+
+
+def _write(df, path: Path) -> Path:
+    if not path.exists():
+        df.to_csv(path, index=False)
+    return path
+
+
+def prepare_inputs(script: str, rows: int, policies: int, grid: int, data_dir: Path):
+    """Generate the CSVs for one script at one rung and return its CLI input arguments.
+
+    Rows are spread over repeated runs (timeline samples for the timeline
+    script) so the policy set and grid stay fixed while the row count grows.
+    ``plot_metrics`` reads one row per policy and is benchmarked at a fixed
+    size as a startup/rendering baseline.
+    """
+    tag = f"{script}-{rows}-p{policies}-g{grid}"
+    if script == 'metrics':
+        return [str(_write(generate_multi(policies), data_dir / f'{tag}.csv'))]
+    if script == 'timeline':
+        samples = max(rows // policies, 2)
+        return [str(_write(generate_timeline(policies, samples), data_dir / f'{tag}.csv'))]
+    if script == 'randomized':
+        runs = max(rows // policies, 1)
+        return [str(_write(generate_randomized(policies, runs), data_dir / f'{tag}.csv'))]
+    if script == 'cache':
+        runs = max(rows // (policies * len(CACHE_LADDER)), 1)
+        files = [str(_write(generate_multi(policies, cache_size=c, runs=runs, seed=i),
+                            data_dir / f'{tag}-{c}.csv'))
+                 for i, c in enumerate(CACHE_LADDER)]
+        return ['--files'] + files
+    if script == 'network':
+        runs = max(rows // (policies * len(RELIABILITY_LADDER)), 1)
+        files = []
+        for i, r in enumerate(RELIABILITY_LADDER):
+            df = generate_multi(policies, reliability=r, runs=runs, seed=i)
+            files.append(str(_write(df, data_dir / f'{tag}-{r}.csv')))
+        return ['--files'] + files
+    if script == 'combined':
+        runs = max(rows // (policies * grid * grid), 1)
+        df = generate_combined(policies, grid, grid, runs=runs)
+        return ['--file', str(_write(df, data_dir / f'{tag}.csv'))]
+    raise ValueError(f"Unknown script: {script}")
+
+
+SCRIPTS = {
+    'metrics': 'plot_metrics.py',
+    'timeline': 'plot_timeline.py',
+    'randomized': 'plot_randomized_overall.py',
+    'cache': 'plot_cache_size_comparison.py',
+    'network': 'plot_network_reliability_comparison.py',
+    'combined': 'plot_combined_comparison.py',
+}
+
+
+def run_one(script: str, inputs, out_dir: Path, jobs: int):
+    """Run one script end to end; return wall time, stage totals and peak memory."""
+    profile_json = out_dir / f'{script}-profile.json'
+    cmd = [sys.executable, str(SCRIPTS_DIR / SCRIPTS[script])] + list(inputs) + [
+        '--output', str(out_dir / script), '--force', '--jobs', str(jobs),
+        '--profile-json', str(profile_json)]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    result = {'wall_s': round(wall, 4), 'returncode': proc.returncode}
+    if proc.returncode != 0:
+        result['error'] = (proc.stderr or proc.stdout)[-2000:]
+        return result
+    with open(profile_json) as f:
+        stages = json.load(f)['stages']
+    totals = {}
+    for r in stages:
+        totals[r['stage']] = round(totals.get(r['stage'], 0.0) + r['wall_s'], 4)
+    result['stages'] = totals
+    result['peak_mb'] = round(max((r['peak_mb'] for r in stages), default=0.0), 2)
+    return result
+
+
+# Modules a script should only import once it renders a figure
+PLOTTING_MODULES = ('matplotlib.pyplot', 'seaborn', 'mpl_toolkits.mplot3d')
+
+
+def parse_importtime(stderr: str):
+    """``-X importtime`` output as ``[(depth, module, cumulative_us)]`` in report order."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        entries.append((depth, name.strip(), int(cumulative)))
+    return entries
+
+
+def run_startup(script: str, repeats: int):
+    """Best-of-``repeats`` import time and ``--help`` wall time of one script, each in a fresh process."""
+    module = Path(SCRIPTS[script]).stem
+    best_import, best_entries, best_help = None, [], None
+    for _ in range(repeats):
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                              cwd=SCRIPTS_DIR, capture_output=True, text=True)
+        if proc.returncode != 0:
+            return {'returncode': proc.returncode, 'error': proc.stderr[-2000:]}
+        entries = parse_importtime(proc.stderr)
+        total = next((us for _, name, us in entries if name == module), 0) / 1e6
+        if best_import is None or total < best_import:
+            best_import, best_entries = total, entries
+
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, str(SCRIPTS_DIR / SCRIPTS[script]), '--help'],
+                              capture_output=True, text=True)
+        wall = time.perf_counter() - start
+        if proc.returncode != 0:
+            return {'returncode': proc.returncode, 'error': (proc.stderr or proc.stdout)[-2000:]}
+        best_help = wall if best_help is None else min(best_help, wall)
+
+    # Heaviest direct imports of the script module (depth 1 under it)
+    heaviest = sorted(((name, us) for depth, name, us in best_entries if depth == 1),
+                      key=lambda item: -item[1])[:5]
+    imported = {name for _, name, _ in best_entries}
+    return {
+        'returncode': 0,
+        'import_s': round(best_import, 4),
+        'help_s': round(best_help, 4),
+        'plotting_imported': [m for m in PLOTTING_MODULES if m in imported],
+        'heaviest': [[name, round(us / 1e6, 4)] for name, us in heaviest],
+    }
+
+
+SMOKE_ROWS = 200
+
+
+def run_smoke(scripts, policies: int, grid: int, workdir: Path):
+    """Run each script, then aware_plots.py all, with default options; return the failures.
+
+    Every run happens in its own empty directory so the default output
+    prefixes land there, and a run only passes if it exits cleanly and
+    writes at least one figure.
+    """
+    data_dir = workdir / 'data'
+    data_dir.mkdir(parents=True, exist_ok=True)
+    runs = []
+    all_inputs = []
+    for script in scripts:
+        inputs = prepare_inputs(script, SMOKE_ROWS, policies, grid, data_dir)
+        all_inputs += [i for i in inputs if not i.startswith('--')]
+        runs.append((script, [str(SCRIPTS_DIR / SCRIPTS[script])] + inputs))
+    runs.append(('aware-all', [str(SCRIPTS_DIR / 'aware_plots.py'), 'all'] + all_inputs))
+
+    failed = []
+    for name, cmd in runs:
+        out_dir = workdir / f'smoke-{name}'
+        out_dir.mkdir(exist_ok=True)
+        print(f"  {name:<12}", end='', flush=True)
+        proc = subprocess.run([sys.executable] + cmd, cwd=out_dir, capture_output=True, text=True)
+        figures = [p for p in out_dir.iterdir() if p.suffix == '.png']
+        if proc.returncode != 0 or not figures:
+            print('FAILED')
+            failed.append((name, (proc.stderr or proc.stdout)[-2000:] or 'no figures written'))
+        else:
+            print(f"ok ({len(figures)} figures)")
+    return failed
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR,
+                             capture_output=True, text=True)
+        return out.stdout.strip() or 'unknown'
+    except OSError:
+        return 'unknown'
+
+
+def load_history(path: Path):
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def find_baseline(history, label=None, kind='results'):
+    """Latest ``kind`` entry (ladder 'results' or 'startup') with ``label``, or the latest one."""
+    for entry in reversed(history):
+        if kind in entry and (label is None or entry.get('label') == label):
+            return entry
+    return None
+
+
+def new_entry(args, params):
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': git_revision(),
+        'label': args.label,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'params': params,
+    }
+
+
+def print_results(entry, baseline=None):
+    base = {}
+    if baseline:
+        base = {(r['script'], r['rows']): r for r in baseline['results']}
+        print(f"\nBaseline: {baseline.get('label') or '-'} @ {baseline['revision']} ({baseline['timestamp']})")
+    print(f"\n{'Script':<12} {'Rows':>10} {'Wall s':>9} {'Load':>8} {'Render':>8} {'Save':>8} {'Peak MB':>8}  {'vs base':>8}")
+    print("-" * 82)
+    for r in entry['results']:
+        if r.get('returncode'):
+            print(f"{r['script']:<12} {r['rows']:>10} {'FAILED':>9}")
+            continue
+        s = r.get('stages', {})
+        ratio = ''
+        b = base.get((r['script'], r['rows']))
+        if b and not b.get('returncode'):
+            ratio = f"{r['wall_s'] / b['wall_s']:.2f}x"
+        print(f"{r['script']:<12} {r['rows']:>10} {r['wall_s']:>9.2f} {s.get('load', 0):>8.2f} "
+              f"{s.get('render', 0):>8.2f} {s.get('save', 0):>8.2f} {r.get('peak_mb', 0):>8.1f}  {ratio:>8}")
+
+
+def print_startup(entry, baseline=None):
+    base = {}
+    if baseline:
+        base = {r['script']: r for r in baseline.get('startup', [])}
+        print(f"\nBaseline: {baseline.get('label') or '-'} @ {baseline['revision']} ({baseline['timestamp']})")
+    print(f"\n{'Script':<12} {'Import s':>9} {'--help s':>9}  {'vs base':>8}  {'Plotting libs at import'}")
+    print("-" * 82)
+    for r in entry['startup']:
+        if r.get('returncode'):
+            print(f"{r['script']:<12} {'FAILED':>9}")
+            continue
+        ratio = ''
+        b = base.get(r['script'])
+        if b and not b.get('returncode'):
+            ratio = f"{r['help_s'] / b['help_s']:.2f}x"
+        plotting = ', '.join(r['plotting_imported']) or 'none'
+        print(f"{r['script']:<12} {r['import_s']:>9.3f} {r['help_s']:>9.3f}  {ratio:>8}  {plotting}")
+    for r in entry['startup']:
+        if not r.get('returncode'):
+            heaviest = ', '.join(f"{name} {sec * 1000:.0f}ms" for name, sec in r['heaviest'])
+            print(f"  {r['script']:<10} heaviest imports: {heaviest}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the plotting scripts over a scale ladder of synthetic inputs',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Default ladder (10^3..10^5 rows), all scripts
+  python run_bench.py --label baseline
+
+  # Large ladder for the row-heavy scripts only
+  python run_bench.py --rows 1e3,1e4,1e5,1e6,1e7 --scripts timeline,randomized
+
+  # Import time and --help latency of every script (best of 5 fresh processes)
+  python run_bench.py --startup --label lazy-imports
+
+  # Default-options smoke run of every script, nothing recorded
+  python run_bench.py --smoke
+
+  # Compare against a labelled entry without running anything
+  python run_bench.py --compare-only --baseline baseline
+        """
+    )
+    parser.add_argument('--rows', default=DEFAULT_ROWS,
+                       help=f'Comma-separated total row counts (default: {DEFAULT_ROWS})')
+    parser.add_argument('--scripts', default=','.join(SCRIPTS),
+                       help=f"Comma-separated subset of: {', '.join(SCRIPTS)}")
+    parser.add_argument('--policies', '-p', type=int, default=4, help='Number of policies (default: 4)')
+    parser.add_argument('--grid', '-g', type=int, default=5,
+                       help='Devices (and network levels) in the combined grid (default: 5)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='--jobs passed to each script (default: 1, render in-process)')
+    parser.add_argument('--startup', action='store_true',
+                       help='Measure import time (python -X importtime) and --help latency instead of the row ladder')
+    parser.add_argument('--repeats', type=int, default=5,
+                       help='Fresh processes per script for --startup; the best is kept (default: 5)')
+    parser.add_argument('--smoke', action='store_true',
+                       help='Run each script once on a tiny input with default options instead of the ladder')
+    parser.add_argument('--workdir', help='Directory for generated data and figures (default: temporary)')
+    parser.add_argument('--history', default=str(DEFAULT_HISTORY),
+                       help='JSON history file to append results to (default: bench/history.json)')
+    parser.add_argument('--label', help='Label stored with this entry (e.g. a branch or change name)')
+    parser.add_argument('--baseline', help='Label of the history entry to compare against (default: latest)')
+    parser.add_argument('--compare-only', action='store_true',
+                       help='Do not run; compare the latest entry against --baseline')
+
+    args = parser.parse_args()
+
+    history_path = Path(args.history)
+    history = load_history(history_path)
+
+    if args.compare_only:
+        if not history:
+            print(f"Error: No history in {history_path}")
+            sys.exit(1)
+        if 'startup' in history[-1]:
+            print_startup(history[-1], find_baseline(history[:-1], args.baseline, 'startup'))
+        else:
+            print_results(history[-1], find_baseline(history[:-1], args.baseline))
+        return
+
+    scripts = [s.strip() for s in args.scripts.split(',') if s.strip()]
+    unknown = [s for s in scripts if s not in SCRIPTS]
+    if unknown:
+        print(f"Error: Unknown scripts: {unknown}. Choose from: {', '.join(SCRIPTS)}")
+        sys.exit(1)
+
+    if args.smoke:
+        workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix='aware-smoke-'))
+        print(f"Working directory: {workdir}")
+        failed = run_smoke(scripts, args.policies, args.grid, workdir)
+        for name, error in failed:
+            print(f"\nError in {name}:\n{error}")
+        if failed:
+            sys.exit(1)
+        print("\n✓ All scripts ran with default options")
+        return
+
+    if args.startup:
+        entry = {**new_entry(args, {'repeats': args.repeats}), 'startup': []}
+        for script in scripts:
+            print(f"  {script:<12}", end='', flush=True)
+            result = run_startup(script, args.repeats)
+            print(f"{result['help_s']:.3f}s" if not result['returncode'] else 'FAILED')
+            entry['startup'].append({'script': script, **result})
+        baseline = find_baseline(history, args.baseline, 'startup')
+        history.append(entry)
+        history_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(history_path, 'w') as f:
+            json.dump(history, f, indent=2)
+        print_startup(entry, baseline)
+        print(f"\n✓ Appended results to {history_path}")
+        failed = [r for r in entry['startup'] if r['returncode']]
+        for r in failed:
+            print(f"\nError in {r['script']}:\n{r['error']}")
+        if failed:
+            sys.exit(1)
+        return
+
+    rungs = [int(float(r)) for r in args.rows.split(',')]
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix='aware-bench-'))
+    data_dir = workdir / 'data'
+    data_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Working directory: {workdir}")
+
+    entry = {**new_entry(args, {'policies': args.policies, 'grid': args.grid, 'jobs': args.jobs}),
+             'results': []}
+    for rows in rungs:
+        for script in scripts:
+            out_dir = workdir / f'out-{rows}'
+            out_dir.mkdir(exist_ok=True)
+            print(f"  {script:<12} rows={rows:<10}", end='', flush=True)
+            inputs = prepare_inputs(script, rows, args.policies, args.grid, data_dir)
+            result = run_one(script, inputs, out_dir, args.jobs)
+            status = f"{result['wall_s']:.2f}s" if not result['returncode'] else 'FAILED'
+            print(status)
+            entry['results'].append({'script': script, 'rows': rows, **result})
+
+    baseline = find_baseline(history, args.baseline)
+    history.append(entry)
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_path, 'w') as f:
+        json.dump(history, f, indent=2)
+
+    print_results(entry, baseline)
+    print(f"\n✓ Appended results to {history_path}")
+    failed = [r for r in entry['results'] if r['returncode']]
+    for r in failed:
+        print(f"\nError in {r['script']} (rows={r['rows']}):\n{r['error']}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
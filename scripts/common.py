@@ -2,10 +2,31 @@
 Common plotting utilities and consistent styling for policy visualizations.
 
 This module centralizes color/marker/linestyle mappings and tie-handling logic
-so all plotting scripts render consistently.
+so all plotting scripts render consistently. It also provides the shared CSV
+loader, which keeps a columnar sidecar of each CSV so repeated runs over the
+same export skip text parsing, and the figure render scheduler, which skips
+figures whose inputs have not changed since they were last written.
 """
 
-from typing import Dict, List
+import argparse
+import glob
+import hashlib
+import json
+import math
+import os
+import pickle
+import sys
+import time
+import traceback
+import tracemalloc
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
 
 # Consistent policy order (also used when resolving ties)
 POLICY_ORDER: List[str] = [
@@ -23,6 +44,53 @@ POLICY_COLORS: Dict[str, str] = {
     'PAFTinyLFU': '#8b5cf6',   # purple
 }
 
+# Figure style shared by every plotting script (applied by setup_plotting())
+PLOT_STYLE = 'whitegrid'
+PLOT_RC: Dict[str, float] = {
+    'figure.dpi': 150,
+    'savefig.dpi': 300,
+    'font.size': 10,
+    'axes.labelsize': 11,
+    'axes.titlesize': 12,
+    'legend.fontsize': 9,
+}
+
+# Metric columns written by every multi-policy export (exportMultiPolicyCSV & co.)
+METRIC_COLUMNS: List[str] = [
+    'cacheHitRate',
+    'deliveryRate',
+    'avgFreshness',
+    'staleAccessRate',
+    'redundancyIndex',
+    'actionabilityFirstRatio',
+    'timelinessConsistency',
+    'pushesSent',
+    'pushSuppressRate',
+    'pushDuplicateRate',
+    'pushTimelyFirstRatio',
+]
+
+# Column order written by exportMultiPolicyCSV (src/sim/multiPolicyBatch.ts)
+MULTI_POLICY_COLUMNS: List[str] = [
+    'policy', 'seed', 'scenario', 'cacheSize', 'alerts', 'reliability',
+    'durationSec', 'queryRatePerMin',
+] + METRIC_COLUMNS
+COMBINED_COLUMNS: List[str] = ['device', 'network'] + MULTI_POLICY_COLUMNS
+
+# Extra column in trace_replay.py exports naming how queries chose their
+# targets; simulator exports do not have it
+QUERY_MODEL_COLUMN = 'queryModel'
+
+# Device (cacheSize) and network (reliability) profiles from multiPolicyBatch.ts
+DEVICE_PROFILES: List[Tuple[str, int]] = [
+    ('Budget Phone', 32), ('Standard Phone', 128), ('High-End Phone', 256),
+    ('Tablet/Laptop', 512), ('Desktop PC', 1024),
+]
+NETWORK_PROFILES: List[Tuple[str, float]] = [
+    ('Perfect', 1.0), ('Excellent', 0.95), ('Good', 0.9), ('Fair', 0.85),
+    ('Poor', 0.7), ('Very Poor', 0.6), ('Degraded', 0.5), ('Disaster', 0.3),
+]
+
 # Shapes and linestyles for better distinction in line plots
 POLICY_MARKERS: Dict[str, str] = {
     'LRU': 'o',
@@ -56,12 +124,15 @@ def abbreviate_policy(policy: str) -> str:
     return policy[:3].upper()
 
 
-def get_winner_label(values_dict: Dict[str, float], tolerance: float = 1e-9) -> str:
+def get_winner_label(values_dict: Dict[str, float], tolerance: float = 1e-9,
+                     ci_dict: Optional[Dict[str, float]] = None) -> str:
     """Determine winner(s) among policies, handling ties consistently.
 
     Args:
         values_dict: mapping of {policy_name: metric_value}
         tolerance: absolute difference regarded as a tie
+        ci_dict: optional {policy_name: CI half-width}; a policy whose
+            interval overlaps the leader's interval ties with it
 
     Returns:
         'ANY' when all tied, a single code like 'LRU', or multi like 'LRU/PAF'.
@@ -69,8 +140,11 @@ def get_winner_label(values_dict: Dict[str, float], tolerance: float = 1e-9) ->
     if not values_dict:
         return 'N/A'
 
-    max_value = max(values_dict.values())
-    winners = [p for p, v in values_dict.items() if abs(v - max_value) <= tolerance]
+    ci_dict = ci_dict or {}
+    leader = max(values_dict, key=values_dict.get)
+    max_value = values_dict[leader]
+    reach = max_value - ci_dict.get(leader, 0.0) - tolerance
+    winners = [p for p, v in values_dict.items() if v + ci_dict.get(p, 0.0) >= reach]
 
     if len(winners) == len(values_dict):
         return 'ANY'
@@ -82,6 +156,111 @@ def get_winner_label(values_dict: Dict[str, float], tolerance: float = 1e-9) ->
     return '/'.join(abbreviate_policy(w) for w in ordered)
 
 
+def resolve_winners(values, policies: Sequence[str], higher_is_better=True,
+                    tolerance: float = 1e-9, ci=None):
+    """Vectorized counterpart of get_winner_label for whole grids of cells.
+
+    Args:
+        values: array of shape (..., n_policies); NaN marks a policy with no
+            data for that cell (like a key missing from the values dict)
+        policies: policy names for the last axis of ``values``
+        higher_is_better: bool, or boolean array broadcastable to
+            ``values.shape[:-1]`` (e.g. one flag per metric row)
+        tolerance: absolute difference regarded as a tie
+        ci: optional CI half-widths shaped like ``values``; a policy whose
+            interval overlaps the leading policy's interval is a tie
+
+    Returns:
+        (winner_idx, tie_bits, labels), each of shape ``values.shape[:-1]``.
+        ``winner_idx`` is the column of the first winner in POLICY_ORDER, or
+        -1 when every present policy tied ('ANY') or the cell is empty
+        ('N/A'). Bit ``i`` of ``tie_bits`` is set when column ``i`` won.
+        ``labels`` holds the same strings get_winner_label would return.
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.shape[-1]
+    higher = np.asarray(higher_is_better, dtype=bool)[..., None]
+    signed = np.where(higher, values, -values)
+    present = ~np.isnan(signed)
+
+    masked = np.where(present, signed, -np.inf)
+    if ci is None:
+        best = np.max(masked, axis=-1, keepdims=True)
+        winners = present & (np.abs(signed - best) <= tolerance)
+    else:
+        ci = np.nan_to_num(np.asarray(ci, dtype=float))
+        leader = np.argmax(masked, axis=-1)[..., None]
+        reach = (np.take_along_axis(masked, leader, axis=-1)
+                 - np.take_along_axis(ci, leader, axis=-1) - tolerance)
+        winners = present & (signed + ci >= reach)
+    weights = np.left_shift(1, np.arange(n), dtype=np.int64)
+    tie_bits = np.sum(winners * weights, axis=-1)
+    present_bits = np.sum(present * weights, axis=-1)
+
+    # Labels depend only on the (winners, present) bit patterns, so build each distinct one once
+    ranked = sorted(range(n), key=lambda i: (POLICY_ORDER.index(policies[i])
+                                             if policies[i] in POLICY_ORDER else len(POLICY_ORDER), i))
+    pairs, inverse = np.unique(np.stack([tie_bits.ravel(), present_bits.ravel()], axis=1),
+                               axis=0, return_inverse=True)
+    pair_labels = []
+    pair_winner = []
+    for won, have in pairs:
+        ordered = [i for i in ranked if won >> i & 1]
+        if have == 0:
+            pair_labels.append('N/A')
+            pair_winner.append(-1)
+        elif won == have:
+            pair_labels.append('ANY')
+            pair_winner.append(-1)
+        else:
+            pair_labels.append('/'.join(abbreviate_policy(policies[i]) for i in ordered))
+            pair_winner.append(ordered[0])
+
+    inverse = inverse.reshape(tie_bits.shape)
+    labels = np.array(pair_labels, dtype=object)[inverse]
+    winner_idx = np.array(pair_winner, dtype=int)[inverse]
+    return winner_idx, tie_bits, labels
+
+
+def draw_winner_heatmap(ax, winner_idx, tie_bits, labels, policies: Sequence[str],
+                        fontsize: int = 10, tie_fontsize: int = 8, cbar_fontsize=None):
+    """Render a winner grid from resolve_winners() with policy colors and labels.
+
+    Tied cells whose winners are a subset of the policies take the first
+    winner's color; 'ANY' cells are gray. The colorbar only lists the gray
+    TIE entry when the grid contains ties.
+    """
+    from matplotlib.colors import ListedColormap, BoundaryNorm
+    import matplotlib.pyplot as plt
+
+    # Gray for "ANY" is mapped to -1 (first bin), policies to their column index
+    policy_colors_list = ['#6b7280'] + [POLICY_COLORS.get(p, '#6b7280') for p in policies]
+    cmap = ListedColormap(policy_colors_list)
+    bounds = np.arange(-1, len(policies) + 1) - 0.5
+    norm = BoundaryNorm(bounds, cmap.N)
+
+    im = ax.imshow(winner_idx, cmap=cmap, norm=norm, aspect='auto')
+
+    multi = (tie_bits & (tie_bits - 1)) != 0
+    for (i, j), label in np.ndenumerate(labels):
+        size = tie_fontsize if multi[i, j] or label == 'ANY' else fontsize
+        ax.text(j, i, label, ha="center", va="center", color="white",
+                fontweight='bold', fontsize=size)
+
+    has_ties = bool(np.any(multi) or np.any(labels == 'ANY'))
+    if has_ties:
+        cbar = plt.colorbar(im, ax=ax, ticks=list(range(-1, len(policies))),
+                            orientation='vertical', pad=0.02)
+        cbar.set_label('Winning Policy', fontweight='bold', fontsize=cbar_fontsize)
+        cbar.ax.set_yticklabels(['TIE (ALL)'] + list(policies))
+    else:
+        cbar = plt.colorbar(im, ax=ax, ticks=np.arange(len(policies)),
+                            orientation='vertical', pad=0.02)
+        cbar.set_label('Winning Policy', fontweight='bold', fontsize=cbar_fontsize)
+        cbar.ax.set_yticklabels(policies)
+    return im
+
+
 def find_policy_by_abbrev(abbrev: str, available: List[str]) -> str:
     """Return the full policy name matching a 3-letter abbreviation.
 
@@ -102,3 +281,1126 @@ def find_policy_by_abbrev(abbrev: str, available: List[str]) -> str:
         if p.lower().startswith(abbrev.lower()):
             return p
     return ''
+
+
+# ---------------------------------------------------------------------------
+# Cached CSV loading
+# ---------------------------------------------------------------------------
+
+# Sidecars live in this directory next to each CSV unless AWARE_PLOT_CACHE_DIR
+# points somewhere else. Set AWARE_PLOT_CACHE=0 to always parse the CSV.
+CACHE_DIR_NAME = '.aware-cache'
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow.feather  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _sidecar_names(csv_path: Path, stat: os.stat_result):
+    """Return (prefix, stem) identifying the sidecar for this CSV.
+
+    The prefix depends only on the file's location, so stale sidecars from
+    earlier versions of the same file can be found and pruned. The stem adds
+    the size and mtime, so any rewrite of the CSV invalidates the cache.
+    """
+    location = hashlib.sha1(str(csv_path.resolve()).encode('utf-8')).hexdigest()[:10]
+    state = hashlib.sha1(f"{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8')).hexdigest()[:10]
+    prefix = f"{csv_path.name}.{location}."
+    return prefix, prefix + state
+
+
+def _write_npz(df: pd.DataFrame, path: Path) -> None:
+    arrays = {'__columns__': np.array([str(c) for c in df.columns])}
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+            arrays[f'c{i}'] = series.to_numpy()
+        else:
+            # Strings are stored fixed-width with a null mask so no pickling is needed
+            mask = series.isna().to_numpy()
+            arrays[f'c{i}'] = series.fillna('').astype(str).to_numpy().astype(str)
+            arrays[f'm{i}'] = mask
+    with open(path, 'wb') as fh:
+        np.savez(fh, **arrays)
+
+
+def _read_npz(path: Path) -> pd.DataFrame:
+    with np.load(path, allow_pickle=False) as data:
+        columns = data['__columns__'].tolist()
+        out = {}
+        for i, col in enumerate(columns):
+            values = data[f'c{i}']
+            if f'm{i}' in data.files:
+                series = pd.Series(values.astype(object))
+                series[data[f'm{i}']] = np.nan
+                out[col] = series
+            else:
+                out[col] = values
+    return pd.DataFrame(out, columns=columns)
+
+
+def _write_sidecar(df: pd.DataFrame, path: Path) -> None:
+    # Write to a temporary name first so a crash never leaves a truncated sidecar
+    tmp = path.with_name(path.name + f'.tmp{os.getpid()}')
+    try:
+        if path.suffix == '.feather':
+            import pyarrow.feather as feather
+            feather.write_feather(df, tmp, compression='uncompressed')
+        else:
+            _write_npz(df, tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _read_sidecar(path: Path) -> pd.DataFrame:
+    if path.suffix == '.feather':
+        import pyarrow.feather as feather
+        # Uncompressed Feather is memory-mapped, so numeric columns are not parsed or copied
+        return feather.read_table(path, memory_map=True).to_pandas()
+    return _read_npz(path)
+
+
+def read_csv_cached(csv_path) -> pd.DataFrame:
+    """Read a CSV, reusing a columnar sidecar from a previous run when possible.
+
+    The first read parses the CSV and writes a sidecar (uncompressed Feather
+    when pyarrow is installed, otherwise NumPy ``.npz``) keyed on the file's
+    path, size and mtime. Later reads of an unchanged file load the sidecar
+    instead. Any problem with the cache falls back to plain ``pd.read_csv``.
+
+    Raises:
+        FileNotFoundError: if ``csv_path`` does not exist.
+    """
+    path = Path(csv_path)
+    stat = path.stat()
+    if os.environ.get('AWARE_PLOT_CACHE', '1') == '0':
+        return pd.read_csv(path)
+
+    cache_dir = Path(os.environ.get('AWARE_PLOT_CACHE_DIR') or path.parent / CACHE_DIR_NAME)
+    prefix, stem = _sidecar_names(path, stat)
+    for suffix in ('.feather', '.npz'):
+        sidecar = cache_dir / (stem + suffix)
+        if sidecar.exists():
+            try:
+                return _read_sidecar(sidecar)
+            except Exception:
+                # Corrupt or written by an incompatible version: rebuild below
+                sidecar.unlink(missing_ok=True)
+
+    df = pd.read_csv(path)
+    sidecar = cache_dir / (stem + ('.feather' if _has_pyarrow() else '.npz'))
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for stale in cache_dir.glob(glob.escape(prefix) + '*'):
+            stale.unlink(missing_ok=True)
+        _write_sidecar(df, sidecar)
+    except Exception:
+        # Read-only data directory or unsupported column types: just skip caching
+        pass
+    return df
+
+
+def read_csv_many(csv_paths: Sequence, jobs: Optional[int] = None) -> List[Union[pd.DataFrame, Exception]]:
+    """Read several CSVs concurrently with ``read_csv_cached``.
+
+    Parsing and sidecar I/O release the GIL for most of their work, so a
+    thread pool is enough to keep several cores busy.
+
+    Args:
+        csv_paths: files to read
+        jobs: worker threads; None uses one per CPU, 1 reads sequentially
+
+    Returns:
+        One entry per path, in input order. A file that failed to load is
+        represented by its exception so callers can report which file it was.
+    """
+    def _read(path):
+        try:
+            return read_csv_cached(path)
+        except Exception as e:
+            return e
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(csv_paths)))
+    if jobs == 1:
+        return [_read(p) for p in csv_paths]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        # map() yields in submission order, so row order is deterministic
+        return list(pool.map(_read, csv_paths))
+
+
+def concat_columnar(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """Stack frames row-wise by filling preallocated per-column arrays.
+
+    Equivalent to ``pd.concat(frames, ignore_index=True)`` for the flat CSV
+    exports used here, but each output column is allocated once at its final
+    size instead of being rebuilt through block consolidation. Columns missing
+    from some frames are filled with NaN.
+    """
+    columns: List[str] = []
+    for frame in frames:
+        columns.extend(c for c in frame.columns if c not in columns)
+    lengths = [len(frame) for frame in frames]
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(int)
+    total = int(offsets[-1])
+
+    out = {}
+    for col in columns:
+        parts = [frame[col] if col in frame.columns else None for frame in frames]
+        dtypes = [p.dtype for p in parts if p is not None]
+        if all(isinstance(d, np.dtype) and d.kind in 'biuf' for d in dtypes):
+            if any(p is None for p in parts):
+                dtypes.append(np.dtype(float))
+            dtype = np.result_type(*dtypes)
+        else:
+            dtype = np.dtype(object)
+        buf = np.empty(total, dtype=dtype)
+        for i, part in enumerate(parts):
+            start, end = offsets[i], offsets[i + 1]
+            if part is None:
+                buf[start:end] = np.nan
+            else:
+                buf[start:end] = part.to_numpy(dtype=dtype)
+        out[col] = buf
+    return pd.DataFrame(out, columns=columns)
+
+
+# ---------------------------------------------------------------------------
+# Replicate aggregation
+# ---------------------------------------------------------------------------
+
+DEFAULT_CONFIDENCE = 0.95
+
+
+# Integer dof up to this are refined against the exact t distribution; the
+# Cornish-Fisher expansion alone is within 1e-9 of it beyond that
+T_EXACT_MAX_DOF = 200
+
+
+def _t_central_prob(t: float, dof: int):
+    """P(|T| <= t) and its derivative for integer ``dof`` (A&S 26.7.3/26.7.4)."""
+    theta = math.atan(t / math.sqrt(dof))
+    c2 = math.cos(theta) ** 2
+    term, series = 1.0, 1.0
+    if dof % 2:
+        for k in range(1, (dof - 1) // 2):
+            term *= c2 * (2 * k) / (2 * k + 1)
+            series += term
+        prob = 2 / math.pi * (theta + (math.sin(theta) * math.cos(theta) * series if dof > 1 else 0.0))
+    else:
+        for k in range(1, dof // 2):
+            term *= c2 * (2 * k - 1) / (2 * k)
+            series += term
+        prob = math.sin(theta) * series
+    log_density = (math.lgamma((dof + 1) / 2) - math.lgamma(dof / 2) - 0.5 * math.log(dof * math.pi)
+                   - (dof + 1) / 2 * math.log1p(t * t / dof))
+    return prob, 2 * math.exp(log_density)
+
+
+def t_critical(dof, confidence: float = DEFAULT_CONFIDENCE) -> np.ndarray:
+    """Two-sided Student-t critical value for ``dof`` degrees of freedom (array-friendly).
+
+    Exact for 1 and 2 degrees of freedom. Above that, a Cornish-Fisher
+    expansion around the normal quantile is polished with Newton steps on
+    the exact t distribution for integer ``dof`` up to T_EXACT_MAX_DOF, so
+    the result matches the table value at any confidence level. NaN where
+    ``dof < 1``.
+    """
+    from statistics import NormalDist
+
+    dof = np.asarray(dof, dtype=float)
+    q = 1 - (1 - confidence) / 2
+    z = NormalDist().inv_cdf(q)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v = np.where(dof >= 1, dof, np.nan)
+        t = (z + (z**3 + z) / (4 * v)
+             + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * v**2)
+             + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * v**3)
+             + (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / (92160 * v**4))
+    t = np.array(t, dtype=float)
+    refine = (dof >= 3) & (dof <= T_EXACT_MAX_DOF) & (dof == np.round(dof))
+    for d in np.unique(dof[refine]):
+        x = float(t[dof == d].flat[0])
+        for _ in range(8):
+            prob, slope = _t_central_prob(x, int(d))
+            step = (prob - confidence) / slope
+            x -= step
+            if abs(step) < 1e-12 * x:
+                break
+        t[dof == d] = x
+    t = np.where(dof == 1, np.tan(np.pi * (q - 0.5)), t)
+    t = np.where(dof == 2, (2 * q - 1) / np.sqrt(2 * q * (1 - q)), t)
+    return t
+
+
+def aggregate_replicates(df: pd.DataFrame, keys: Sequence[str], metrics: Optional[Sequence[str]] = None,
+                         confidence: float = DEFAULT_CONFIDENCE) -> pd.DataFrame:
+    """Collapse replicate rows (e.g. seeds) to one row per grid cell.
+
+    One groupby over ``keys`` computes the mean, sample std and count of every
+    metric. Each metric column then holds the cell mean, next to
+    ``{metric}_std``, ``{metric}_n`` and ``{metric}_err``, the t-based
+    confidence-interval half-width. Single-replicate cells keep an
+    ``{metric}_err`` from the input (sampled miss-ratio curves), else 0.
+    ``replicates`` counts the rows per cell; other columns keep the cell's
+    first value. Cells appear in order of first appearance.
+    """
+    if metrics is None:
+        metrics = [m for m in METRIC_COLUMNS if m in df.columns]
+    metrics = [m for m in metrics if m not in keys]
+    keys = list(keys)
+    grouped = df.groupby(keys, sort=False, dropna=False)
+    stats = grouped[metrics].agg(['mean', 'std', 'count'])
+    stats.columns = [m if stat == 'mean' else f"{m}_{'n' if stat == 'count' else stat}"
+                     for m, stat in stats.columns]
+
+    input_err = [f'{m}_err' for m in metrics if f'{m}_err' in df.columns]
+    passthrough = [c for c in df.columns if c not in keys and c not in metrics and c not in input_err]
+    parts = [stats, grouped.size().rename('replicates')]
+    if passthrough:
+        parts.append(grouped[passthrough].first())
+    if input_err:
+        parts.append(grouped[input_err].mean().add_suffix('_in'))
+    out = pd.concat(parts, axis=1)
+
+    for m in metrics:
+        n = out[f'{m}_n'].to_numpy(dtype=float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            err = t_critical(n - 1, confidence) * out[f'{m}_std'].to_numpy(dtype=float) / np.sqrt(n)
+        fallback = out.pop(f'{m}_err_in').to_numpy(dtype=float) if f'{m}_err' in input_err else 0.0
+        out[f'{m}_err'] = np.where(n > 1, err, np.nan_to_num(fallback))
+    return out.reset_index()
+
+
+BOOTSTRAP_METHODS = ('percentile', 'bca')
+
+# Resample indices drawn per chunk (rows × observations), bounding peak memory
+_BOOTSTRAP_CHUNK = 1 << 22
+
+
+def bootstrap_mean_ci(values, n_resamples: int = 10000, confidence: float = DEFAULT_CONFIDENCE,
+                      method: str = 'percentile', seed=None) -> Tuple[np.ndarray, np.ndarray]:
+    """Bootstrap confidence interval of each column mean of ``values`` (n × metrics).
+
+    Resamples are drawn as a (resamples × n) index matrix, in row chunks, and
+    turned into per-observation counts with one bincount, so the resampled
+    means of every metric come from a single matrix product. NaNs are skipped
+    per metric, as in DataFrame.mean. ``method`` is 'percentile' or 'bca'
+    (bias-corrected and accelerated; the jackknife acceleration of a mean has
+    a closed form, so no leave-one-out pass is needed). Returns ``(lo, hi)``.
+    """
+    from statistics import NormalDist
+
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(f"Unknown bootstrap method {method!r}; choose from {', '.join(BOOTSTRAP_METHODS)}")
+    x = np.asarray(values, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    n, m = x.shape
+    lo, hi = np.full(m, np.nan), np.full(m, np.nan)
+    if n == 0 or n_resamples < 1:
+        return lo, hi
+
+    present = ~np.isnan(x)
+    # Counts are small integers, so float32 products are exact enough and twice as fast
+    columns = [np.where(present, x, 0.0)]
+    has_nan = ~present.all(axis=0)
+    if has_nan.any():
+        columns.append(present[:, has_nan])
+    design = np.hstack(columns).astype(np.float32)
+
+    rng = np.random.default_rng(seed)
+    boot = np.empty((n_resamples, m))
+    chunk = max(1, min(n_resamples, _BOOTSTRAP_CHUNK // n))
+    for start in range(0, n_resamples, chunk):
+        b = min(chunk, n_resamples - start)
+        idx = rng.integers(0, n, size=(b, n), dtype=np.int32)
+        idx += np.arange(0, b * n, n, dtype=np.int32)[:, None]
+        counts = np.bincount(idx.ravel(), minlength=b * n).reshape(b, n).astype(np.float32)
+        totals = (counts @ design).astype(float)
+        used = np.full((b, m), float(n))
+        used[:, has_nan] = totals[:, m:]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            boot[start:start + b] = totals[:, :m] / used
+
+    alpha = (1 - confidence) / 2
+    with np.errstate(invalid='ignore'):
+        theta = np.nanmean(x, axis=0) if has_nan.any() else x.mean(axis=0)
+    normal = NormalDist()
+    for j in range(m):
+        draws = boot[:, j]
+        draws = draws[~np.isnan(draws)]
+        if not len(draws) or np.isnan(theta[j]):
+            continue
+        levels = [alpha, 1 - alpha]
+        if method == 'bca' and draws.min() < draws.max():
+            # Bias correction from the share of resamples below the estimate
+            below = np.clip(np.mean(draws < theta[j]), 1 / (len(draws) + 1), len(draws) / (len(draws) + 1))
+            z0 = normal.inv_cdf(below)
+            dev = x[present[:, j], j] - theta[j]
+            spread = np.sum(dev ** 2)
+            accel = np.sum(dev ** 3) / (6 * spread ** 1.5) if spread > 0 else 0.0
+            levels = []
+            for level in (alpha, 1 - alpha):
+                z = z0 + normal.inv_cdf(level)
+                levels.append(normal.cdf(z0 + z / (1 - accel * z)))
+        lo[j], hi[j] = np.quantile(draws, levels)
+    return lo, hi
+
+
+def format_mean_ci(row, metric: str) -> str:
+    """``'61.25%'``, or ``'61.25% ± 1.40'`` when the aggregated row has a CI."""
+    err = row.get(f'{metric}_err', 0.0)
+    text = f"{row[metric] * 100:6.2f}%"
+    if err and not np.isnan(err):
+        text += f" ± {err * 100:.2f}"
+    return text
+
+
+# Observations per batch mean in MSER-5
+MSER_BATCH = 5
+
+
+def mser_truncation(values, batch: int = MSER_BATCH, weights=None) -> int:
+    """Leading observations to discard as warm-up (MSER-5 truncation rule).
+
+    ``values`` are grouped into consecutive batches of ``batch`` (a trailing
+    partial batch is ignored); the truncation point d minimizes the MSER
+    statistic of the remaining batch means Y_{d+1..k},
+
+        MSER(d) = sum (Y_i - mean)^2 / (k - d)^2,
+
+    over d <= k/2, since a minimum in the second half means the series never
+    settled. Suffix sums of Y and Y^2 give every candidate in O(n). With
+    ``weights`` (e.g. requests per sample for per-sample hit rates) each batch
+    mean is weighted; batches with no weight or only NaNs are skipped.
+    Returns the number of observations to drop (a multiple of ``batch``).
+    """
+    y = np.asarray(values, dtype=float)
+    w = np.ones_like(y) if weights is None else np.asarray(weights, dtype=float)
+    k = len(y) // batch
+    if k < 2:
+        return 0
+    valid = ~np.isnan(y) & (w > 0)
+    num = np.where(valid, w * np.where(valid, y, 0.0), 0.0)[:k * batch].reshape(k, batch).sum(axis=1)
+    den = np.where(valid, w, 0.0)[:k * batch].reshape(k, batch).sum(axis=1)
+    have = den > 0
+    means = np.divide(num, den, out=np.zeros(k), where=have)
+
+    # Suffix count, sum and sum of squares of the batch means from each d
+    count = np.cumsum(have[::-1])[::-1]
+    s1 = np.cumsum(means[::-1])[::-1]
+    s2 = np.cumsum((means ** 2)[::-1])[::-1]
+    half = k // 2 + 1
+    count, s1, s2 = count[:half], s1[:half], s2[:half]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mser = np.maximum(s2 - s1 ** 2 / count, 0.0) / count ** 2
+    mser[count < 2] = np.inf
+    return int(np.argmin(mser)) * batch
+
+
+# ---------------------------------------------------------------------------
+# Downsampling
+# ---------------------------------------------------------------------------
+
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+
+def _bucket_edges(n: int, n_buckets: int) -> np.ndarray:
+    """Edges splitting the interior points 1..n-2 into ``n_buckets`` runs."""
+    return np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+
+
+def _bucket_argmax(score: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Index of the first maximum of ``score`` in each [start, end) run."""
+    peak = np.maximum.reduceat(score, starts)
+    bucket = np.repeat(np.arange(len(starts)), ends - starts)
+    hit = np.flatnonzero(score == peak[bucket])
+    # First hit per bucket; every bucket has one since its peak is one of its own values
+    first = np.unique(bucket[hit], return_index=True)[1]
+    return hit[first]
+
+
+def lttb_indices(x, y, max_points: int) -> np.ndarray:
+    """Sorted indices of at most ``max_points`` samples that keep the shape of y(x).
+
+    Largest-Triangle-Three-Buckets: the first and last points are kept and
+    every bucket in between contributes the point spanning the largest
+    triangle with its neighbours. The neighbour on the left is the previous
+    bucket's mean rather than its selected point, which removes LTTB's
+    sequential dependency so all buckets are scored in one vectorized pass;
+    peaks and transients survive either way. NaN samples are never chosen
+    unless a whole bucket is NaN.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if max_points < 3 or n <= max_points:
+        return np.arange(n)
+
+    edges = _bucket_edges(n, max_points - 2)
+    starts, ends = edges[:-1], edges[1:]
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+
+    def bucket_means(v):
+        filled = np.where(np.isnan(v), 0.0, v)
+        csum = np.concatenate([[0.0], np.cumsum(filled)])
+        count = np.concatenate([[0], np.cumsum(~np.isnan(v))])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (csum[ends] - csum[starts]) / (count[ends] - count[starts])
+
+    mean_x, mean_y = bucket_means(x), bucket_means(y)
+    # Anchors: previous bucket's mean (the first point for bucket 0) and the
+    # next bucket's mean (the last point for the final bucket)
+    prev_x = np.concatenate([[x[0]], mean_x[:-1]])
+    prev_y = np.concatenate([[y[0]], mean_y[:-1]])
+    next_x = np.concatenate([mean_x[1:], [x[-1]]])
+    next_y = np.concatenate([mean_y[1:], [y[-1]]])
+
+    sizes = ends - starts
+    px, py = np.repeat(prev_x, sizes), np.repeat(prev_y, sizes)
+    nx, ny = np.repeat(next_x, sizes), np.repeat(next_y, sizes)
+    xs, ys = x[starts[0]:ends[-1]], y[starts[0]:ends[-1]]
+    area = np.abs((px - nx) * (ys - py) - (px - xs) * (ny - py))
+    area[np.isnan(area)] = -np.inf
+
+    local = _bucket_argmax(area, starts - starts[0], ends - starts[0])
+    return np.concatenate([[0], local + starts[0], [n - 1]])
+
+
+def minmax_indices(x, y, max_points: int) -> np.ndarray:
+    """Sorted indices keeping each bucket's minimum and maximum of y.
+
+    A min/max envelope: cheaper than LTTB and guarantees every extreme is
+    drawn, at the cost of plotting two points per bucket. ``x`` is accepted
+    for symmetry with lttb_indices; buckets are equal counts of samples.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if max_points < 4 or n <= max_points:
+        return np.arange(n)
+
+    edges = _bucket_edges(n, (max_points - 2) // 2)
+    starts, ends = edges[:-1], edges[1:]
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    offset = starts[0]
+    ys = y[offset:ends[-1]]
+    starts, ends = starts - offset, ends - offset
+    hi = _bucket_argmax(np.where(np.isnan(ys), -np.inf, ys), starts, ends)
+    lo = _bucket_argmax(np.where(np.isnan(ys), -np.inf, -ys), starts, ends)
+    return np.unique(np.concatenate([[0], lo + offset, hi + offset, [n - 1]]))
+
+
+DOWNSAMPLERS = {'lttb': lttb_indices, 'minmax': minmax_indices}
+
+
+# ---------------------------------------------------------------------------
+# Metric cube
+# ---------------------------------------------------------------------------
+
+@dataclass
+class MetricCube:
+    """Dense (policy, cacheSize, reliability, metric) view of a comparison grid.
+
+    ``values[p, c, r, m]`` holds the replicate mean for one grid cell, or NaN
+    where the export has no row for it; ``ci`` holds the matching confidence
+    interval half-widths and ``counts`` the replicates per cell. Axis labels
+    are sorted ascending for cache size and reliability; policies keep their
+    order of first appearance in the CSV, matching ``df['policy'].unique()``.
+    """
+    values: np.ndarray
+    policies: List[str]
+    cache_sizes: List
+    reliabilities: List
+    metrics: List[str]
+    ci: Optional[np.ndarray] = None
+    counts: Optional[np.ndarray] = None
+    policy_index: Dict[str, int] = field(init=False)
+    cache_index: Dict = field(init=False)
+    reliability_index: Dict = field(init=False)
+    metric_index: Dict[str, int] = field(init=False)
+
+    def __post_init__(self):
+        if self.ci is None:
+            self.ci = np.zeros_like(self.values)
+        if self.counts is None:
+            self.counts = (~np.isnan(self.values).all(axis=-1)).astype(int)
+        self.policy_index = {p: i for i, p in enumerate(self.policies)}
+        self.cache_index = {c: i for i, c in enumerate(self.cache_sizes)}
+        self.reliability_index = {r: i for i, r in enumerate(self.reliabilities)}
+        self.metric_index = {m: i for i, m in enumerate(self.metrics)}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, metrics: Optional[Sequence[str]] = None,
+                   confidence: float = DEFAULT_CONFIDENCE) -> 'MetricCube':
+        """Build the cube from one aggregate_replicates() pass over ``df``.
+
+        Replicate rows of a (policy, cacheSize, reliability) cell are averaged,
+        with a ``confidence`` CI per cell. Missing ``cacheSize``/``reliability``
+        columns collapse to a single level.
+        """
+        if metrics is None:
+            metrics = [m for m in METRIC_COLUMNS if m in df.columns]
+        metrics = list(metrics)
+        keys = ['policy', 'cacheSize', 'reliability']
+        frame = df[[k for k in keys if k in df.columns] + metrics]
+        for k in keys:
+            if k not in frame.columns:
+                frame = frame.assign(**{k: np.nan})
+
+        cells = aggregate_replicates(frame, keys, metrics, confidence)
+        policies = list(pd.unique(frame['policy']))
+        cache_sizes = sorted(pd.unique(frame['cacheSize']))
+        reliabilities = sorted(pd.unique(frame['reliability']))
+
+        p_idx = pd.Index(policies).get_indexer(cells['policy'])
+        c_idx = pd.Index(cache_sizes).get_indexer(cells['cacheSize'])
+        r_idx = pd.Index(reliabilities).get_indexer(cells['reliability'])
+        shape = (len(policies), len(cache_sizes), len(reliabilities), len(metrics))
+        values = np.full(shape, np.nan)
+        ci = np.full(shape, np.nan)
+        counts = np.zeros(shape[:-1], dtype=int)
+        values[p_idx, c_idx, r_idx, :] = cells[metrics].to_numpy(dtype=float)
+        ci[p_idx, c_idx, r_idx, :] = cells[[f'{m}_err' for m in metrics]].to_numpy(dtype=float)
+        counts[p_idx, c_idx, r_idx] = cells['replicates'].to_numpy()
+        return cls(values, policies, cache_sizes, reliabilities, metrics, ci, counts)
+
+    def metric(self, metric: str) -> np.ndarray:
+        """Return the (policy, cacheSize, reliability) array for one metric."""
+        return self.values[..., self.metric_index[metric]]
+
+    def grid(self, policy: str, metric: str) -> np.ndarray:
+        """Return a (reliability, cacheSize) matrix for one policy and metric."""
+        return self.metric(metric)[self.policy_index[policy]].T
+
+    def metric_ci(self, metric: str) -> np.ndarray:
+        """Return the (policy, cacheSize, reliability) CI half-widths for one metric."""
+        return self.ci[..., self.metric_index[metric]]
+
+    def cell(self, cache_size, reliability, metric: str) -> Dict[str, float]:
+        """Return {policy: value} for one grid cell, skipping missing policies."""
+        column = self.metric(metric)[:, self.cache_index[cache_size], self.reliability_index[reliability]]
+        return {p: float(v) for p, v in zip(self.policies, column) if not np.isnan(v)}
+
+    def cell_ci(self, cache_size, reliability, metric: str) -> Dict[str, float]:
+        """Return {policy: CI half-width} for one grid cell, matching cell()."""
+        c, r = self.cache_index[cache_size], self.reliability_index[reliability]
+        values = self.metric(metric)[:, c, r]
+        column = self.metric_ci(metric)[:, c, r]
+        return {p: float(e) for p, v, e in zip(self.policies, values, column) if not np.isnan(v)}
+
+    def max_replicates(self) -> int:
+        return int(self.counts.max()) if self.counts.size else 0
+
+    def ordered_policies(self) -> List[str]:
+        """Policies present in the cube, in POLICY_ORDER."""
+        return [p for p in POLICY_ORDER if p in self.policy_index]
+
+
+# ---------------------------------------------------------------------------
+# Stage profiling
+# ---------------------------------------------------------------------------
+
+# Stage records collected in this process; empty unless enable_profiling() ran
+_profile_enabled = False
+_profile_records: List[Dict] = []
+_profile_stack: List[Dict] = []
+
+
+def enable_profiling() -> None:
+    """Start recording profile_stage() timings and tracemalloc peaks."""
+    global _profile_enabled
+    _profile_enabled = True
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+@contextmanager
+def profile_stage(stage: str, label: str = ''):
+    """Record wall time, CPU time and peak traced memory for a block.
+
+    ``stage`` is one of load/validate/aggregate/render/save; ``label`` names
+    the file or plot function. Stages may nest (save runs inside render);
+    an outer stage's peak includes its inner stages. Does nothing unless
+    profiling is enabled.
+    """
+    if not _profile_enabled:
+        yield
+        return
+    current, peak = tracemalloc.get_traced_memory()
+    if _profile_stack:
+        _profile_stack[-1]['peak'] = max(_profile_stack[-1]['peak'], peak)
+    tracemalloc.reset_peak()
+    frame = {'peak': current, 'start': current}
+    _profile_stack.append(frame)
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        _profile_stack.pop()
+        frame['peak'] = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+        if _profile_stack:
+            _profile_stack[-1]['peak'] = max(_profile_stack[-1]['peak'], frame['peak'])
+        _profile_records.append({
+            'stage': stage,
+            'label': label,
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'peak_mb': (frame['peak'] - frame['start']) / 2**20,
+            'pid': os.getpid(),
+        })
+
+
+def report_profile(json_path=None) -> None:
+    """Print recorded stages sorted by wall time and optionally write them as JSON."""
+    if not _profile_enabled:
+        return
+    records = sorted(_profile_records, key=lambda r: r['wall_s'], reverse=True)
+    print("\nProfile (render includes its save; CPU is per process):")
+    print(f"  {'Stage':<10} {'Label':<44} {'Wall s':>8} {'CPU s':>8} {'Peak MB':>8}")
+    for r in records:
+        print(f"  {r['stage']:<10} {r['label'][:44]:<44} {r['wall_s']:>8.3f} {r['cpu_s']:>8.3f} {r['peak_mb']:>8.1f}")
+    totals: Dict[str, List[float]] = {}
+    for r in records:
+        t = totals.setdefault(r['stage'], [0.0, 0.0])
+        t[0] += r['wall_s']
+        t[1] += r['cpu_s']
+    for stage, (wall, cpu) in sorted(totals.items(), key=lambda kv: -kv[1][0]):
+        print(f"  {'total':<10} {stage:<44} {wall:>8.3f} {cpu:>8.3f}")
+    if json_path:
+        report = {
+            'argv': sys.argv,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'stages': records,
+        }
+        with open(json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Profile written: {json_path}")
+
+
+# ---------------------------------------------------------------------------
+# Figure saving and parallel rendering
+# ---------------------------------------------------------------------------
+
+# Formats accepted by --format; save_figure() writes every one the job asks for
+FIGURE_FORMATS: Tuple[str, ...] = ('png', 'pdf', 'svg')
+
+# Paths written by save_figure() in this process since the last render job started
+_saved_paths: List[str] = []
+
+# Formats save_figure() writes for the running job (see set_figure_formats())
+_figure_formats: List[str] = []
+
+# Footnote save_figure() adds to the running job's figures (see set_figure_caption())
+_figure_caption = ''
+
+# Whether setup_plotting() has configured matplotlib in this process
+_plotting_ready = False
+
+# Read-only objects handed to each render worker once, at pool start-up
+_worker_shared: List = []
+
+
+def setup_plotting() -> None:
+    """Select the non-interactive Agg backend and apply PLOT_STYLE/PLOT_RC.
+
+    matplotlib and seaborn are only imported here and inside the plot
+    functions, so ``--help``, loading, aggregation and fully cached runs never
+    pay for them. run_render_jobs() calls this before each job; it is a no-op
+    after the first call in a process.
+    """
+    global _plotting_ready
+    if _plotting_ready:
+        return
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    import seaborn as sns
+    sns.set_style(PLOT_STYLE)
+    matplotlib.rcParams.update(PLOT_RC)
+    _plotting_ready = True
+
+
+def parse_formats(spec: str) -> List[str]:
+    """Parse a --format value such as ``png`` or ``png,pdf,svg`` (argparse ``type``)."""
+    formats = list(dict.fromkeys(f.strip().lower().lstrip('.') for f in spec.split(',') if f.strip()))
+    unknown = [f for f in formats if f not in FIGURE_FORMATS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(
+            f"invalid format(s) {', '.join(unknown) or repr(spec)}; choose from {', '.join(FIGURE_FORMATS)}")
+    return formats
+
+
+class _FormatsAction(argparse.Action):
+    # Parses here rather than through ``type=``: argparse would run ``type`` on
+    # the string default and leave args.format a list when the flag is omitted
+    def __call__(self, parser, namespace, values, option_string=None):
+        try:
+            formats = parse_formats(values)
+        except argparse.ArgumentTypeError as e:
+            raise argparse.ArgumentError(self, str(e))
+        namespace.format = formats[0]
+        namespace.formats = formats
+
+
+def add_format_argument(parser, *flags: str) -> None:
+    """Add --format taking one or more comma-separated FIGURE_FORMATS.
+
+    ``args.format`` is the first one, which the plot functions build their
+    file names with; ``args.formats`` is the full list for run_render_plans().
+    """
+    parser.add_argument(*(flags or ('--format',)), dest='format', action=_FormatsAction,
+                        default='png', metavar='FMT[,FMT...]',
+                        help=f"Output format(s), comma-separated: {', '.join(FIGURE_FORMATS)}; every "
+                             "figure is rendered once and saved in each (default: png)")
+    parser.set_defaults(formats=['png'])
+
+
+def set_figure_formats(formats: Sequence[str] = ()) -> None:
+    """Make save_figure() also write each of ``formats`` next to the file it is given.
+
+    run_render_jobs() sets this for every job; scripts that call plot
+    functions directly call it themselves.
+    """
+    _figure_formats[:] = list(formats)
+
+
+def set_figure_caption(caption: str = '') -> None:
+    """Make save_figure() add ``caption`` as a footnote below each figure.
+
+    run_render_jobs() sets this for every job from its plan's caption.
+    """
+    global _figure_caption
+    _figure_caption = caption
+
+
+def query_model_caption(df: pd.DataFrame) -> str:
+    """Footnote for figures of a trace_replay.py export, or '' for simulator exports.
+
+    Replayed queries name their target alert (drawn over every live alert, or
+    taken from a recorded query trace) instead of picking among the policy's
+    resident entries as run.ts does, so hit rate, freshness and the
+    first-retrieval metrics are not comparable with simulator runs.
+    """
+    if QUERY_MODEL_COLUMN not in df.columns:
+        return ''
+    models = sorted(set(df[QUERY_MODEL_COLUMN].dropna().astype(str)))
+    if not models:
+        return ''
+    return (f"Trace replay ({', '.join(models)} queries): queries target alerts, not the policy's "
+            "resident entries; hit rate, freshness and first-retrieval metrics are not comparable "
+            "with simulator runs")
+
+
+def _freeze_layout(fig, savefig_kwargs: Dict) -> Dict:
+    """Pin the layout of a figure that has just been saved, for saving it again.
+
+    The layout engine (constrained_layout) is switched off so later draws keep
+    the current axes positions, and a ``bbox_inches='tight'`` crop is replaced
+    by the measured box so it is not recomputed per format.
+    """
+    import matplotlib.pyplot as plt
+    kwargs = dict(savefig_kwargs)
+    if kwargs.get('bbox_inches') == 'tight':
+        pad = kwargs.pop('pad_inches', None)
+        if pad is None:
+            pad = plt.rcParams['savefig.pad_inches']
+        if isinstance(pad, (int, float)):
+            bbox = fig.get_tightbbox(fig.canvas.get_renderer(),
+                                     bbox_extra_artists=kwargs.get('bbox_extra_artists'))
+            kwargs['bbox_inches'] = bbox.padded(pad)
+        else:
+            kwargs['pad_inches'] = pad
+    if fig.get_layout_engine() is not None:
+        fig.set_layout_engine('none')
+    return kwargs
+
+
+def save_figure(output_file, **savefig_kwargs):
+    """Save the current figure with ``plt.savefig`` and record the path(s).
+
+    All plot functions save through here so the render scheduler can report
+    what each job produced. ``output_file`` carries the job's first --format;
+    the figure is also written in the other formats from set_figure_formats()
+    under the same name, reusing the layout computed by the first save. A
+    caption from set_figure_caption() is added below the axes first.
+    """
+    import matplotlib.pyplot as plt
+    fig = plt.gcf()
+    if _figure_caption:
+        fig.text(0.5, 0, _figure_caption, ha='center', va='top', fontsize=8, style='italic', wrap=True)
+        # The caption sits below the figure area; a tight crop keeps it
+        savefig_kwargs.setdefault('bbox_inches', 'tight')
+    root, ext = os.path.splitext(str(output_file))
+    paths = [str(output_file)] + [f"{root}.{fmt}" for fmt in _figure_formats if f".{fmt}" != ext]
+    for i, path in enumerate(paths):
+        with profile_stage('save', os.path.basename(path)):
+            fig.savefig(path, **savefig_kwargs)
+        _saved_paths.append(path)
+        if i == 0 and len(paths) > 1:
+            savefig_kwargs = _freeze_layout(fig, savefig_kwargs)
+    return output_file
+
+
+@dataclass
+class RenderResult:
+    """Outcome of one plot function run by run_render_jobs()."""
+    name: str
+    paths: List[str]
+    error: Optional[str] = None
+    skipped: bool = False
+    profile: List[Dict] = field(default_factory=list)
+
+
+class _SharedRef:
+    """Placeholder for an argument that the worker already holds."""
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+def _init_render_worker(shared, profile=False) -> None:
+    global _worker_shared
+    _worker_shared = list(shared)
+    if profile:
+        enable_profiling()
+
+
+def _run_render_job(func, args, kwargs, formats=(), caption='') -> RenderResult:
+    setup_plotting()
+    set_figure_formats(formats)
+    set_figure_caption(caption)
+    import matplotlib.pyplot as plt
+
+    args = [_worker_shared[a.index] if isinstance(a, _SharedRef) else a for a in args]
+    kwargs = {k: _worker_shared[v.index] if isinstance(v, _SharedRef) else v for k, v in kwargs.items()}
+    del _saved_paths[:]
+    n_records = len(_profile_records)
+    error = None
+    try:
+        with profile_stage('render', func.__name__):
+            func(*args, **kwargs)
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        plt.close('all')
+    profile = _profile_records[n_records:]
+    del _profile_records[n_records:]
+    return RenderResult(func.__name__, list(_saved_paths), error, profile=profile)
+
+
+def _file_digest(path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _value_digest(value) -> str:
+    if value is None or isinstance(value, (str, bytes, bool, int, float, tuple, list, dict)):
+        return repr(value)
+    return hashlib.sha256(pickle.dumps(value, protocol=4)).hexdigest()
+
+
+class BuildCache:
+    """Content-addressed record of which figures are up to date.
+
+    A job's stamp hashes the input file contents, the plot function, its
+    parameters (including the output format), any extra options that change
+    the loaded data, and the source of the defining script and this module.
+    The manifest maps each written figure to the stamp that produced it; a
+    job is skipped when every figure recorded for its stamp still exists.
+
+    The manifest lives in ``.aware-cache/build-manifest.json`` next to the
+    output prefix.
+    """
+
+    MANIFEST_NAME = 'build-manifest.json'
+
+    def __init__(self, inputs: Sequence, output_prefix, force: bool = False, options=None):
+        self.force = force
+        self.manifest_path = Path(output_prefix).parent / CACHE_DIR_NAME / self.MANIFEST_NAME
+        h = hashlib.sha256()
+        for path in inputs:
+            h.update(_file_digest(path).encode())
+        h.update(_value_digest(options).encode())
+        self._base = h.hexdigest()
+        self._sources: Dict[str, str] = {}
+        self._entries: Dict[str, str] = self._load()
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _source_digest(self, module_name: str) -> str:
+        if module_name not in self._sources:
+            module = sys.modules.get(module_name)
+            source = getattr(module, '__file__', None)
+            self._sources[module_name] = _file_digest(source) if source else ''
+        return self._sources[module_name]
+
+    def stamp(self, func, args, kwargs, shared_ids=frozenset(), formats=(), caption='') -> str:
+        """Hash everything that determines the figures written by one job."""
+        h = hashlib.sha256(self._base.encode())
+        h.update(self._source_digest(__name__).encode())
+        h.update(self._source_digest(func.__module__).encode())
+        h.update(f"{func.__module__}.{func.__qualname__}".encode())
+        # Shared objects are derived from the inputs, which are already hashed
+        for value in list(args) + [kwargs[k] for k in sorted(kwargs)]:
+            h.update(b'<shared>' if id(value) in shared_ids else _value_digest(value).encode())
+        h.update(repr(sorted(kwargs)).encode())
+        # The first format is already in the job arguments
+        if len(formats) > 1:
+            h.update(repr(list(formats)).encode())
+        if caption:
+            h.update(caption.encode())
+        return h.hexdigest()
+
+    def up_to_date(self, stamp: str) -> Optional[List[str]]:
+        """Return the figures recorded for ``stamp`` if all still exist, else None."""
+        if self.force:
+            return None
+        paths = [p for p, s in self._entries.items() if s == stamp]
+        if paths and all(os.path.exists(p) for p in paths):
+            return paths
+        return None
+
+    def record(self, stamp: str, paths: Sequence[str]) -> None:
+        for p in paths:
+            self._entries[os.path.abspath(p)] = stamp
+
+    def save(self) -> None:
+        """Write the manifest atomically, keeping entries added by other runs."""
+        entries = self._load()
+        entries.update(self._entries)
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_name(f"{self.manifest_path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(entries, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+
+def run_render_jobs(jobs: Sequence, n_jobs: Optional[int] = None, shared: Sequence = (),
+                    cache: Union[BuildCache, Sequence[Optional[BuildCache]], None] = None,
+                    formats: Sequence[str] = (),
+                    caption: Union[str, Sequence[str]] = '') -> List[RenderResult]:
+    """Run independent plot functions, optionally across a process pool.
+
+    Args:
+        jobs: ``(func, args)`` or ``(func, args, kwargs)`` tuples; ``func``
+            must be a module-level function so it can be sent to a worker
+        n_jobs: worker processes; None uses one per CPU, 1 renders in-process
+        shared: large read-only inputs (DataFrames, metric cubes) that appear
+            in the job arguments. They are sent to each worker once when the
+            pool starts instead of once per job.
+        cache: when given, jobs whose figures are already up to date are
+            skipped and the manifest is updated with what was rebuilt; a
+            list gives each job its own cache (see run_render_plans)
+        formats: every format each figure is saved in (``args.formats``);
+            each job renders once and save_figure() writes them all
+        caption: footnote save_figure() adds to every figure (see
+            query_model_caption()); a list gives each job its own
+
+    Returns:
+        One RenderResult per job, in submission order. Exceptions are caught
+        and reported in ``error`` so one broken figure does not stop the rest.
+    """
+    jobs = [(job[0], tuple(job[1]), dict(job[2]) if len(job) > 2 else {}) for job in jobs]
+    shared = list(shared)
+    ids = {id(obj): i for i, obj in enumerate(shared)}
+    caches = list(cache) if isinstance(cache, (list, tuple)) else [cache] * len(jobs)
+    captions = list(caption) if isinstance(caption, (list, tuple)) else [caption] * len(jobs)
+
+    results: List[Optional[RenderResult]] = [None] * len(jobs)
+    stamps: List[Optional[str]] = [None] * len(jobs)
+    pending = []
+    for i, (func, args, kwargs) in enumerate(jobs):
+        if caches[i] is not None:
+            stamps[i] = caches[i].stamp(func, args, kwargs, frozenset(ids), formats, captions[i])
+            paths = caches[i].up_to_date(stamps[i])
+            if paths is not None:
+                results[i] = RenderResult(func.__name__, paths, skipped=True)
+                continue
+        pending.append(i)
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(n_jobs, len(pending)))
+    if n_jobs == 1:
+        _init_render_worker((), _profile_enabled)
+        for i in pending:
+            results[i] = _run_render_job(*jobs[i], formats, captions[i])
+    else:
+        # Swap shared objects (matched by identity) for lightweight references
+        def _ref(value):
+            return _SharedRef(ids[id(value)]) if id(value) in ids else value
+
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_render_worker,
+                                 initargs=(shared, _profile_enabled)) as pool:
+            futures = {i: pool.submit(_run_render_job, jobs[i][0], tuple(_ref(a) for a in jobs[i][1]),
+                                      {k: _ref(v) for k, v in jobs[i][2].items()}, formats, captions[i])
+                       for i in pending}
+            for i, future in futures.items():
+                results[i] = future.result()
+
+    for i in pending:
+        _profile_records.extend(results[i].profile)
+    for i in pending:
+        if caches[i] is not None and not results[i].error:
+            caches[i].record(stamps[i], results[i].paths)
+    for c in {id(c): c for c in caches if c is not None}.values():
+        c.save()
+    return results
+
+
+@dataclass
+class RenderPlan:
+    """The render jobs of one analysis, with its shared inputs and build cache.
+
+    Each plotting script's ``plan_jobs()`` returns one after loading and
+    aggregating; its own main() renders it, and aware_plots.py merges the
+    plans of several analyses into a single run_render_jobs() call.
+    ``caption`` is a footnote for every figure of the plan.
+    """
+    jobs: List
+    shared: List = field(default_factory=list)
+    cache: Optional[BuildCache] = None
+    caption: str = ''
+
+
+def run_render_plans(plans: Sequence[RenderPlan], n_jobs: Optional[int] = None,
+                     formats: Sequence[str] = ()) -> List[RenderResult]:
+    """Render several plans in one pass (one worker pool), each job with its plan's cache."""
+    jobs, caches, captions, shared = [], [], [], {}
+    for plan in plans:
+        jobs.extend(plan.jobs)
+        caches.extend([plan.cache] * len(plan.jobs))
+        captions.extend([plan.caption] * len(plan.jobs))
+        for obj in plan.shared:
+            shared.setdefault(id(obj), obj)
+    return run_render_jobs(jobs, n_jobs=n_jobs, shared=list(shared.values()), cache=caches, formats=formats,
+                           caption=captions)
+
+
+def report_render_results(results: Sequence[RenderResult]) -> int:
+    """Print failed jobs and a rebuilt/skipped summary; return how many failed."""
+    failed = [r for r in results if r.error]
+    for r in failed:
+        print(f"\nError rendering {r.name}:\n{r.error}")
+    rebuilt = sum(len(r.paths) for r in results if not r.skipped and not r.error)
+    skipped = sum(len(r.paths) for r in results if r.skipped)
+    print(f"\nFigures rebuilt: {rebuilt}, skipped (up to date): {skipped}, failed jobs: {len(failed)}")
+    return len(failed)
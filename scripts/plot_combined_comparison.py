@@ -15,28 +15,20 @@ AND reliability values for all policies.
 import argparse
 import sys
 from pathlib import Path
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
-from common import POLICY_COLORS, get_winner_label, find_policy_by_abbrev, POLICY_ORDER
+from common import (POLICY_COLORS, get_winner_label, find_policy_by_abbrev, POLICY_ORDER,
+                    read_csv_cached, MetricCube, resolve_winners, draw_winner_heatmap,
+                    save_figure, run_render_plans, report_render_results, BuildCache, RenderPlan,
+                    enable_profiling, profile_stage, report_profile, format_mean_ci,
+                    DEFAULT_CONFIDENCE, add_format_argument, query_model_caption)
 
-# Set style
-sns.set_style("whitegrid")
-plt.rcParams['figure.dpi'] = 150
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['font.size'] = 10
-plt.rcParams['axes.labelsize'] = 11
-plt.rcParams['axes.titlesize'] = 12
-plt.rcParams['legend.fontsize'] = 9
-
-# Styling and winner detection are imported from common.py
+# Styling, winner detection and the metric cube are imported from common.py
 
 
 def load_data(csv_file):
     """Load the CSV file."""
     try:
-        df = pd.read_csv(csv_file)
+        df = read_csv_cached(csv_file)
         return df
     except FileNotFoundError:
         print(f"Error: File not found: {csv_file}")
@@ -70,13 +62,22 @@ def validate_data(df):
     return True
 
 
-def plot_3d_surface(df, metric, metric_label, output_prefix, format='png'):
+def as_percent_grid(values):
+    """Scale 0-1 cells to percent (larger values are already percents/counts); missing cells become 0."""
+    values = np.nan_to_num(values, nan=0.0)
+    return np.where(values <= 1.0, values * 100, values)
+
+
+def plot_3d_surface(cube, metric, metric_label, output_prefix, format='png'):
     """Create a 3D surface plot showing metric vs cache size vs network reliability."""
+    import matplotlib.pyplot as plt
     from mpl_toolkits.mplot3d import Axes3D
     from matplotlib import cm
     
-    policies = df['policy'].unique()
+    policies = cube.policies
     n_policies = len(policies)
+    cache_sizes = cube.cache_sizes
+    reliabilities = cube.reliabilities
 
     # Dynamic grid based on number of policies
     n_cols = 2
@@ -86,21 +87,9 @@ def plot_3d_surface(df, metric, metric_label, output_prefix, format='png'):
     for idx, policy in enumerate(policies):
         ax = fig.add_subplot(n_rows, n_cols, idx + 1, projection='3d')
         
-        policy_data = df[df['policy'] == policy]
-        
         # Create meshgrid
-        cache_sizes = sorted(policy_data['cacheSize'].unique())
-        reliabilities = sorted(policy_data['reliability'].unique())
-        
         X, Y = np.meshgrid(cache_sizes, [r * 100 for r in reliabilities])
-        Z = np.zeros_like(X, dtype=float)
-        
-        for i, rel in enumerate(reliabilities):
-            for j, cache in enumerate(cache_sizes):
-                value = policy_data[(policy_data['cacheSize'] == cache) & 
-                                   (policy_data['reliability'] == rel)][metric].values
-                if len(value) > 0:
-                    Z[i, j] = value[0] * 100 if value[0] <= 1.0 else value[0]
+        Z = as_percent_grid(cube.grid(policy, metric))
         
         # Plot surface
         color = POLICY_COLORS.get(policy, '#6b7280')
@@ -120,16 +109,18 @@ def plot_3d_surface(df, metric, metric_label, output_prefix, format='png'):
     
     plt.tight_layout(rect=[0, 0, 1, 0.97])
     output_file = f"{output_prefix}_3d_surface_{metric}.{format}"
-    plt.savefig(output_file, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, bbox_inches='tight', facecolor='white')
     print(f"✓ Saved: {output_file}")
     plt.close()
 
 
-def plot_heatmap_matrix(df, metric, metric_label, output_prefix, format='png'):
+def plot_heatmap_matrix(cube, metric, metric_label, output_prefix, format='png'):
     """Create heatmap matrices showing metric for each policy across device × network grid."""
-    policies = df['policy'].unique()
-    cache_sizes = sorted(df['cacheSize'].unique())
-    reliabilities = sorted(df['reliability'].unique())
+    import matplotlib.pyplot as plt
+    
+    policies = cube.policies
+    cache_sizes = cube.cache_sizes
+    reliabilities = cube.reliabilities
 
     # Dynamic grid based on number of policies
     n_cols = 2
@@ -141,16 +132,9 @@ def plot_heatmap_matrix(df, metric, metric_label, output_prefix, format='png'):
     
     for idx, policy in enumerate(policies):
         ax = axes[idx]
-        policy_data = df[df['policy'] == policy]
         
         # Create matrix
-        matrix = np.zeros((len(reliabilities), len(cache_sizes)))
-        for i, rel in enumerate(reliabilities):
-            for j, cache in enumerate(cache_sizes):
-                value = policy_data[(policy_data['cacheSize'] == cache) & 
-                                   (policy_data['reliability'] == rel)][metric].values
-                if len(value) > 0:
-                    matrix[i, j] = value[0] * 100 if value[0] <= 1.0 else value[0]
+        matrix = as_percent_grid(cube.grid(policy, metric))
         
         # Plot heatmap
         im = ax.imshow(matrix, cmap='RdYlGn', aspect='auto', vmin=0, vmax=100)
@@ -180,74 +164,31 @@ def plot_heatmap_matrix(df, metric, metric_label, output_prefix, format='png'):
     
     plt.tight_layout(rect=[0, 0, 1, 0.99])
     output_file = f"{output_prefix}_heatmap_matrix_{metric}.{format}"
-    plt.savefig(output_file, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, bbox_inches='tight', facecolor='white')
     print(f"✓ Saved: {output_file}")
     plt.close()
 
 
-def plot_winner_cube(df, metric, metric_label, output_prefix, format='png'):
+def plot_winner_cube(cube, metric, metric_label, output_prefix, format='png'):
     """Create a heatmap showing which policy wins at each (cache, reliability) combination."""
-    cache_sizes = sorted(df['cacheSize'].unique())
-    reliabilities = sorted(df['reliability'].unique())
+    import matplotlib.pyplot as plt
+    
+    cache_sizes = cube.cache_sizes
+    reliabilities = cube.reliabilities
     
     # Use consistent policy order matching POLICY_COLORS definition
-    policy_order = ['LRU', 'TTLOnly', 'PriorityFresh', 'PAFTinyLFU']
-    policies = [p for p in policy_order if p in df['policy'].unique()]
+    policies = cube.ordered_policies()
     
     fig, ax = plt.subplots(figsize=(14, 10))
     
-    # Create winner matrix and labels
-    winner_matrix = np.zeros((len(reliabilities), len(cache_sizes)))
-    winner_labels = []
-    tie_cells = []  # Track cells with ties
-    
-    for i, rel in enumerate(reliabilities):
-        row_labels = []
-        for j, cache in enumerate(cache_sizes):
-            combo_data = df[(df['cacheSize'] == cache) & (df['reliability'] == rel)]
-            
-            # Get values for all policies
-            policy_values = {}
-            for policy in policies:
-                policy_data = combo_data[combo_data['policy'] == policy]
-                if len(policy_data) > 0:
-                    policy_values[policy] = policy_data[metric].values[0]
-            
-            # Determine winner label (handles ties)
-            winner_label = get_winner_label(policy_values)
-            row_labels.append(winner_label)
-            
-            # For coloring, use first winner or gray for "ANY"
-            if winner_label == "ANY":
-                winner_matrix[i, j] = -1  # Special value for ties
-                tie_cells.append((i, j))
-            elif "/" in winner_label:
-                # Multiple winners but not all - use first winner's color
-                first_winner = winner_label.split("/")[0]
-                full = find_policy_by_abbrev(first_winner, policies)
-                if full:
-                    winner_matrix[i, j] = list(policies).index(full)
-                tie_cells.append((i, j))
-            else:
-                # Single winner - find the full policy name
-                full = find_policy_by_abbrev(winner_label, policies)
-                if full:
-                    winner_matrix[i, j] = list(policies).index(full)
-        
-        winner_labels.append(row_labels)
-    
-    # Custom colormap (add gray for "ANY")
-    # Build color list in the same order as policies to ensure correct mapping
-    policy_colors_list = []
-    for p in policies:
-        policy_colors_list.append(POLICY_COLORS.get(p, '#6b7280'))
-    policy_colors_list.append('#6b7280')  # Gray for "ANY"
-    from matplotlib.colors import ListedColormap, BoundaryNorm
-    cmap = ListedColormap(policy_colors_list)
-    bounds = list(range(-1, len(policies))) + [len(policies)]
-    norm = BoundaryNorm(bounds, cmap.N)
-    
-    im = ax.imshow(winner_matrix, cmap=cmap, norm=norm, aspect='auto')
+    # (reliability, cacheSize, policy) values in POLICY_ORDER columns
+    order = [cube.policy_index[p] for p in policies]
+    values = cube.metric(metric)[order].transpose(2, 1, 0)
+    # Policies whose confidence intervals overlap the leader's count as tied
+    ci = cube.metric_ci(metric)[order].transpose(2, 1, 0)
+    winner_idx, tie_bits, winner_labels = resolve_winners(values, policies, ci=ci)
+    draw_winner_heatmap(ax, winner_idx, tie_bits, winner_labels, policies,
+                        fontsize=11, tie_fontsize=9, cbar_fontsize=11)
     
     # Set ticks
     ax.set_xticks(np.arange(len(cache_sizes)))
@@ -255,32 +196,11 @@ def plot_winner_cube(df, metric, metric_label, output_prefix, format='png'):
     ax.set_xticklabels(cache_sizes)
     ax.set_yticklabels([f'{r*100:.0f}%' for r in reliabilities])
     
-    # Add text annotations
-    for i in range(len(reliabilities)):
-        for j in range(len(cache_sizes)):
-            label = winner_labels[i][j]
-            # Use smaller font for tie labels
-            fontsize = 9 if "/" in label or label == "ANY" else 11
-            text = ax.text(j, i, label,
-                         ha="center", va="center", color="white", 
-                         fontweight='bold', fontsize=fontsize)
-    
     ax.set_xlabel('Cache Size (Device Capability)', fontweight='bold', fontsize=12)
     ax.set_ylabel('Network Reliability', fontweight='bold', fontsize=12)
     ax.set_title(f'Policy Winner Matrix: {metric_label}\n(Shows optimal policy for each Device × Network combination)',
                 fontsize=14, fontweight='bold', pad=15)
     
-    # Add colorbar (exclude gray "ANY" from legend if not used)
-    if tie_cells:
-        cbar = plt.colorbar(im, ax=ax, ticks=list(range(-1, len(policies))), orientation='vertical', pad=0.02)
-        cbar.set_label('Winning Policy', fontweight='bold', fontsize=11)
-        labels = ['TIE (ALL)'] + list(policies)
-        cbar.ax.set_yticklabels(labels)
-    else:
-        cbar = plt.colorbar(im, ax=ax, ticks=np.arange(len(policies)), orientation='vertical', pad=0.02)
-        cbar.set_label('Winning Policy', fontweight='bold', fontsize=11)
-        cbar.ax.set_yticklabels(policies)
-    
     # Add scenario annotations
     ax.text(-0.5, len(reliabilities) - 0.5, 'High-end\nPerfect Net', 
            ha='right', va='center', fontsize=9, alpha=0.6, style='italic')
@@ -293,15 +213,17 @@ def plot_winner_cube(df, metric, metric_label, output_prefix, format='png'):
     
     plt.tight_layout()
     output_file = f"{output_prefix}_winner_cube_{metric}.{format}"
-    plt.savefig(output_file, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, bbox_inches='tight', facecolor='white')
     print(f"✓ Saved: {output_file}")
     plt.close()
 
 
-def plot_extreme_scenarios(df, output_prefix, format='png'):
+def plot_extreme_scenarios(cube, output_prefix, format='png'):
     """Compare performance in extreme scenarios: best case vs worst case."""
-    cache_sizes = sorted(df['cacheSize'].unique())
-    reliabilities = sorted(df['reliability'].unique())
+    import matplotlib.pyplot as plt
+    
+    cache_sizes = cube.cache_sizes
+    reliabilities = cube.reliabilities
     
     best_cache = cache_sizes[-1]
     worst_cache = cache_sizes[0]
@@ -323,15 +245,14 @@ def plot_extreme_scenarios(df, output_prefix, format='png'):
     ]
     
     # Filter to existing metrics
-    metrics = [(k, l) for k, l in metrics if k in df.columns]
+    metrics = [(k, l) for k, l in metrics if k in cube.metric_index]
     
     fig, axes = plt.subplots(1, len(metrics), figsize=(6*len(metrics), 7))
     if len(metrics) == 1:
         axes = [axes]
     
     # Use consistent policy order matching POLICY_COLORS definition
-    policy_order = ['LRU', 'TTLOnly', 'PriorityFresh', 'PAFTinyLFU']
-    policies = [p for p in policy_order if p in df['policy'].unique()]
+    policies = cube.ordered_policies()
     x = np.arange(len(scenarios))
     width = 0.2
     
@@ -340,19 +261,21 @@ def plot_extreme_scenarios(df, output_prefix, format='png'):
         
         for p_idx, policy in enumerate(policies):
             values = []
+            errors = []
             for scenario_name, (cache, net) in scenarios.items():
-                value = df[(df['policy'] == policy) & 
-                          (df['cacheSize'] == cache) & 
-                          (df['reliability'] == net)][metric_key].values
-                if len(value) > 0:
-                    val = value[0] * 100 if value[0] <= 1.0 else value[0]
-                    values.append(val)
+                value = cube.cell(cache, net, metric_key).get(policy)
+                if value is not None:
+                    scale = 100 if value <= 1.0 else 1
+                    values.append(value * scale)
+                    errors.append(cube.cell_ci(cache, net, metric_key)[policy] * scale)
                 else:
                     values.append(0)
+                    errors.append(0)
             
             color = POLICY_COLORS.get(policy, '#6b7280')
             offset = (p_idx - len(policies)/2 + 0.5) * width
-            bars = ax.bar(x + offset, values, width, label=policy, color=color, alpha=0.8, edgecolor='black', linewidth=0.5)
+            bars = ax.bar(x + offset, values, width, label=policy, color=color, alpha=0.8, edgecolor='black', linewidth=0.5,
+                          yerr=errors if any(errors) else None, capsize=2)
             
             # Add value labels
             for bar in bars:
@@ -364,15 +287,9 @@ def plot_extreme_scenarios(df, output_prefix, format='png'):
         scenario_names = list(scenarios.keys())
         for s_idx, (scenario_name, (cache, net)) in enumerate(scenarios.items()):
             # Get values for all policies in this scenario
-            policy_values = {}
-            for policy in policies:
-                value = df[(df['policy'] == policy) & 
-                          (df['cacheSize'] == cache) & 
-                          (df['reliability'] == net)][metric_key].values
-                if len(value) > 0:
-                    policy_values[policy] = value[0]
+            policy_values = {p: v for p, v in cube.cell(cache, net, metric_key).items() if p in policies}
             
-            winner_label = get_winner_label(policy_values)
+            winner_label = get_winner_label(policy_values, ci_dict=cube.cell_ci(cache, net, metric_key))
             
             # Place winner label at top of chart
             ax.text(s_idx, 102, f'► {winner_label}', ha='center', va='bottom', 
@@ -392,15 +309,17 @@ def plot_extreme_scenarios(df, output_prefix, format='png'):
     
     plt.tight_layout(rect=[0, 0, 1, 0.96])
     output_file = f"{output_prefix}_extreme_scenarios.{format}"
-    plt.savefig(output_file, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, bbox_inches='tight', facecolor='white')
     print(f"✓ Saved: {output_file}")
     plt.close()
 
 
-def plot_policy_recommendation_tree(df, output_prefix, format='png'):
+def plot_policy_recommendation_tree(cube, output_prefix, format='png'):
     """Create a decision tree showing which policy to use in each scenario."""
-    cache_sizes = sorted(df['cacheSize'].unique())
-    reliabilities = sorted(df['reliability'].unique())
+    import matplotlib.pyplot as plt
+    
+    cache_sizes = cube.cache_sizes
+    reliabilities = cube.reliabilities
     
     # Divide into regions
     mid_cache = cache_sizes[len(cache_sizes)//2]
@@ -413,24 +332,25 @@ def plot_policy_recommendation_tree(df, output_prefix, format='png'):
         'Low Cache\nPoor Network': (lambda c, r: c < mid_cache and r < mid_reliability, []),
     }
     
+    # Per-cell score for every policy: shape (policy, cacheSize, reliability)
+    scores = (cube.metric('deliveryRate') + cube.metric('actionabilityFirstRatio')) / 2
+    # Conservative CI of the score: the two metrics' half-widths are not independent
+    score_ci = (cube.metric_ci('deliveryRate') + cube.metric_ci('actionabilityFirstRatio')) / 2
+    
     # Find best policy for each region
     for region_name, (condition, winners) in regions.items():
-        region_winners = {}
-        for cache in cache_sizes:
-            for rel in reliabilities:
-                if condition(cache, rel):
-                    combo_data = df[(df['cacheSize'] == cache) & (df['reliability'] == rel)]
-                    for policy in combo_data['policy'].unique():
-                        policy_data = combo_data[combo_data['policy'] == policy]
-                        score = (policy_data['deliveryRate'].values[0] + 
-                                policy_data['actionabilityFirstRatio'].values[0]) / 2
-                        if policy not in region_winners:
-                            region_winners[policy] = []
-                        region_winners[policy].append(score)
+        in_region = np.array([[condition(c, r) for r in reliabilities] for c in cache_sizes], dtype=bool)
+        region_scores = np.where(in_region, scores, np.nan).reshape(len(cube.policies), -1)
+        counts = np.sum(~np.isnan(region_scores), axis=1)
+        sums = np.nansum(region_scores, axis=1)
+        # CI of the region mean, treating cells as independent replicates' estimates
+        region_ci = np.where(in_region, score_ci, np.nan).reshape(len(cube.policies), -1)
+        ci_sums = np.sqrt(np.nansum(region_ci ** 2, axis=1))
         
-        # Average scores and check for ties
-        avg_winners = {p: np.mean(scores) for p, scores in region_winners.items()}
-        winner_label = get_winner_label(avg_winners)
+        # Average scores and check for ties (overlapping CIs tie)
+        avg_winners = {p: sums[i] / counts[i] for i, p in enumerate(cube.policies) if counts[i] > 0}
+        avg_ci = {p: ci_sums[i] / counts[i] for i, p in enumerate(cube.policies) if counts[i] > 0}
+        winner_label = get_winner_label(avg_winners, ci_dict=avg_ci)
         best_score = max(avg_winners.values())
         regions[region_name] = (condition, winner_label, best_score)
     
@@ -482,11 +402,11 @@ def plot_policy_recommendation_tree(df, output_prefix, format='png'):
         elif "/" in winner_label:
             # Use color of first winner
             abbrev = winner_label.split("/")[0]
-            first_policy = find_policy_by_abbrev(abbrev, list(df['policy'].unique()))
+            first_policy = find_policy_by_abbrev(abbrev, cube.policies)
             color = POLICY_COLORS.get(first_policy, '#6b7280')
         else:
             # Single winner - find full policy name
-            full_policy = find_policy_by_abbrev(winner_label, list(df['policy'].unique()))
+            full_policy = find_policy_by_abbrev(winner_label, cube.policies)
             color = POLICY_COLORS.get(full_policy, '#6b7280')
         
         ax.add_patch(plt.Rectangle((x_pos, 3.5), 2, 1, facecolor=color, edgecolor='black', linewidth=2, alpha=0.9))
@@ -510,20 +430,20 @@ def plot_policy_recommendation_tree(df, output_prefix, format='png'):
     
     plt.tight_layout()
     output_file = f"{output_prefix}_recommendation_tree.{format}"
-    plt.savefig(output_file, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, bbox_inches='tight', facecolor='white')
     print(f"✓ Saved: {output_file}")
     plt.close()
 
 
-def print_summary_stats(df):
+def print_summary_stats(df, cube):
     """Print summary statistics."""
     print("\n" + "="*70)
     print("COMBINED DEVICE × NETWORK ANALYSIS")
     print("="*70)
     
-    cache_sizes = sorted(df['cacheSize'].unique())
-    reliabilities = sorted(df['reliability'].unique())
-    policies = df['policy'].unique()
+    cache_sizes = cube.cache_sizes
+    reliabilities = cube.reliabilities
+    policies = cube.policies
     
     print(f"\nCache sizes: {cache_sizes}")
     print(f"Network reliabilities: {[f'{r*100:.0f}%' for r in reliabilities]}")
@@ -534,6 +454,9 @@ def print_summary_stats(df):
         print(f"Scenario: {df['scenario'].iloc[0]}")
     if 'seed' in df.columns:
         print(f"Seed: {df['seed'].iloc[0]}")
+    if cube.max_replicates() > 1:
+        present = cube.counts[cube.counts > 0]
+        print(f"Replicates per cell: {present.min()}-{present.max()} (values are means ± CI half-width)")
     
     # Best and worst case
     best_cache = cache_sizes[-1]
@@ -545,41 +468,104 @@ def print_summary_stats(df):
     print(f"BEST CASE (Cache={best_cache}, Network={best_network*100:.0f}%):")
     print("-"*70)
     
-    best_case = df[(df['cacheSize'] == best_cache) & (df['reliability'] == best_network)]
+    c, r = cube.cache_index[best_cache], cube.reliability_index[best_network]
     for policy in policies:
-        p_data = best_case[best_case['policy'] == policy].iloc[0]
+        p_data = dict(zip(cube.metrics, cube.values[cube.policy_index[policy], c, r]))
+        p_data.update({f'{m}_err': e for m, e in zip(cube.metrics, cube.ci[cube.policy_index[policy], c, r])})
         print(f"\n{policy}:")
-        print(f"  Delivery:         {p_data['deliveryRate']*100:6.2f}%")
-        print(f"  Actionability:    {p_data['actionabilityFirstRatio']*100:6.2f}%")
-        print(f"  Hit Rate:         {p_data['cacheHitRate']*100:6.2f}%")
+        print(f"  Delivery:         {format_mean_ci(p_data, 'deliveryRate')}")
+        print(f"  Actionability:    {format_mean_ci(p_data, 'actionabilityFirstRatio')}")
+        print(f"  Hit Rate:         {format_mean_ci(p_data, 'cacheHitRate')}")
     
     print("\n" + "-"*70)
     print(f"WORST CASE (Cache={worst_cache}, Network={worst_network*100:.0f}%):")
     print("-"*70)
     
-    worst_case = df[(df['cacheSize'] == worst_cache) & (df['reliability'] == worst_network)]
+    c, r = cube.cache_index[worst_cache], cube.reliability_index[worst_network]
     for policy in policies:
-        p_data = worst_case[worst_case['policy'] == policy].iloc[0]
+        p_data = dict(zip(cube.metrics, cube.values[cube.policy_index[policy], c, r]))
+        p_data.update({f'{m}_err': e for m, e in zip(cube.metrics, cube.ci[cube.policy_index[policy], c, r])})
         print(f"\n{policy}:")
-        print(f"  Delivery:         {p_data['deliveryRate']*100:6.2f}%")
-        print(f"  Actionability:    {p_data['actionabilityFirstRatio']*100:6.2f}%")
-        print(f"  Hit Rate:         {p_data['cacheHitRate']*100:6.2f}%")
+        print(f"  Delivery:         {format_mean_ci(p_data, 'deliveryRate')}")
+        print(f"  Actionability:    {format_mean_ci(p_data, 'actionabilityFirstRatio')}")
+        print(f"  Hit Rate:         {format_mean_ci(p_data, 'cacheHitRate')}")
     
     # Performance spread
     print("\n" + "-"*70)
     print("PERFORMANCE RANGE ACROSS ALL CONDITIONS:")
     print("-"*70)
     
-    for policy in policies:
-        p_data = df[df['policy'] == policy]
-        min_delivery = p_data['deliveryRate'].min() * 100
-        max_delivery = p_data['deliveryRate'].max() * 100
+    delivery = cube.metric('deliveryRate').reshape(len(policies), -1)
+    for i, policy in enumerate(policies):
+        min_delivery = np.nanmin(delivery[i]) * 100
+        max_delivery = np.nanmax(delivery[i]) * 100
         spread = max_delivery - min_delivery
         print(f"\n{policy}: {min_delivery:.1f}% to {max_delivery:.1f}% (spread: {spread:.1f}%)")
     
     print("\n" + "="*70)
 
 
+def load_inputs(csv_file, args):
+    """Load and validate the export for plan_jobs()."""
+    print(f"Loading {csv_file}...")
+    with profile_stage('load', csv_file):
+        df = load_data(csv_file)
+    with profile_stage('validate'):
+        validate_data(df)
+    return df
+
+
+def add_arguments(parser):
+    """Options specific to this analysis (also used by aware_plots.py)."""
+    parser.add_argument('--stats', '-s', action='store_true',
+                       help='Print summary statistics')
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE,
+                       help='Confidence level for replicate CIs; overlapping CIs count as ties '
+                            f'(default: {DEFAULT_CONFIDENCE})')
+
+
+def plan_jobs(df, args, output_prefix, inputs):
+    """Build the MetricCube, print the summary and list the figure jobs; returns a RenderPlan."""
+    # Index every (policy, cacheSize, reliability) cell once, averaging seed
+    # replicates with their confidence intervals; all plots read from it
+    with profile_stage('aggregate', 'MetricCube.from_frame'):
+        cube = MetricCube.from_frame(df, confidence=args.confidence)
+    cache_sizes = cube.cache_sizes
+    reliabilities = cube.reliabilities
+    policies = cube.policies
+    
+    print(f"Found {len(cache_sizes)} cache sizes: {cache_sizes}")
+    print(f"Found {len(reliabilities)} reliability levels: {[f'{r*100:.0f}%' for r in reliabilities]}")
+    print(f"Found {len(policies)} policies: {', '.join(policies)}")
+    print(f"Total scenarios: {len(cache_sizes) * len(reliabilities)} per policy")
+    if cube.max_replicates() > 1:
+        print(f"Replicates per cell: up to {cube.max_replicates()} "
+              f"({args.confidence:.0%} CIs; overlapping CIs are ties)")
+    
+    # Print stats if requested
+    if args.stats:
+        with profile_stage('aggregate', 'print_summary_stats'):
+            print_summary_stats(df, cube)
+    
+    jobs = [
+        # 3D surface plots for key metrics
+        (plot_3d_surface, (cube, 'deliveryRate', 'Delivery Rate', output_prefix, args.format)),
+        (plot_3d_surface, (cube, 'actionabilityFirstRatio', 'Actionability', output_prefix, args.format)),
+        # Heatmap matrices
+        (plot_heatmap_matrix, (cube, 'deliveryRate', 'Delivery Rate', output_prefix, args.format)),
+        (plot_heatmap_matrix, (cube, 'actionabilityFirstRatio', 'Actionability', output_prefix, args.format)),
+        (plot_heatmap_matrix, (cube, 'cacheHitRate', 'Cache Hit Rate', output_prefix, args.format)),
+        # Winner cubes
+        (plot_winner_cube, (cube, 'deliveryRate', 'Delivery Rate', output_prefix, args.format)),
+        (plot_winner_cube, (cube, 'actionabilityFirstRatio', 'Actionability', output_prefix, args.format)),
+        # Extreme scenarios and recommendations
+        (plot_extreme_scenarios, (cube, output_prefix, args.format)),
+        (plot_policy_recommendation_tree, (cube, output_prefix, args.format)),
+    ]
+    cache = BuildCache(inputs, output_prefix, force=args.force, options={'confidence': args.confidence})
+    return RenderPlan(jobs, [cube], cache, caption=query_model_caption(df))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Analyze policy performance across device capabilities AND network conditions',
@@ -596,53 +582,34 @@ Examples:
     parser.add_argument('--file', '-f', required=True,
                        help='Path to combined comparison CSV file')
     parser.add_argument('--output', '-o', help='Output file prefix (default: combined_comparison)')
-    parser.add_argument('--format', choices=['png', 'pdf', 'svg'], default='png',
-                       help='Output format (default: png)')
-    parser.add_argument('--stats', '-s', action='store_true',
-                       help='Print summary statistics')
+    add_format_argument(parser)
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help='Number of worker processes for rendering plots (default: one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                       help='Re-render every figure even if its inputs are unchanged')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print wall/CPU time and peak memory for each load/validate/aggregate/render/save stage')
+    parser.add_argument('--profile-json', metavar='FILE',
+                       help='Also write the --profile report to FILE as JSON (implies --profile)')
+    add_arguments(parser)
     
     args = parser.parse_args()
+    if args.profile or args.profile_json:
+        enable_profiling()
     
     # Determine output prefix
     output_prefix = args.output if args.output else 'combined_comparison'
     
     # Load data
-    print(f"Loading {args.file}...")
-    df = load_data(args.file)
-    validate_data(df)
-    
-    cache_sizes = sorted(df['cacheSize'].unique())
-    reliabilities = sorted(df['reliability'].unique())
-    policies = df['policy'].unique()
-    
-    print(f"Found {len(cache_sizes)} cache sizes: {cache_sizes}")
-    print(f"Found {len(reliabilities)} reliability levels: {[f'{r*100:.0f}%' for r in reliabilities]}")
-    print(f"Found {len(policies)} policies: {', '.join(policies)}")
-    print(f"Total scenarios: {len(cache_sizes) * len(reliabilities)} per policy")
-    
-    # Print stats if requested
-    if args.stats:
-        print_summary_stats(df)
+    df = load_inputs(args.file, args)
+    plan = plan_jobs(df, args, output_prefix, [args.file])
     
     # Generate plots
     print("\nGenerating plots...")
-    
-    # 3D surface plots for key metrics
-    plot_3d_surface(df, 'deliveryRate', 'Delivery Rate', output_prefix, args.format)
-    plot_3d_surface(df, 'actionabilityFirstRatio', 'Actionability', output_prefix, args.format)
-    
-    # Heatmap matrices
-    plot_heatmap_matrix(df, 'deliveryRate', 'Delivery Rate', output_prefix, args.format)
-    plot_heatmap_matrix(df, 'actionabilityFirstRatio', 'Actionability', output_prefix, args.format)
-    plot_heatmap_matrix(df, 'cacheHitRate', 'Cache Hit Rate', output_prefix, args.format)
-    
-    # Winner cubes
-    plot_winner_cube(df, 'deliveryRate', 'Delivery Rate', output_prefix, args.format)
-    plot_winner_cube(df, 'actionabilityFirstRatio', 'Actionability', output_prefix, args.format)
-    
-    # Extreme scenarios and recommendations
-    plot_extreme_scenarios(df, output_prefix, args.format)
-    plot_policy_recommendation_tree(df, output_prefix, args.format)
+    results = run_render_plans([plan], n_jobs=args.jobs, formats=args.formats)
+    report_profile(args.profile_json)
+    if report_render_results(results):
+        sys.exit(1)
     
     print(f"\n✓ All plots generated successfully!")
     print(f"Output prefix: {output_prefix}")
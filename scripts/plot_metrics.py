@@ -2,7 +2,7 @@
 Plot multi-policy comparison metrics from CSV file.
 
 Usage:
-    python plot_metrics.py data/multi-policy-comparison-TIMESTAMP.csv [--output OUTPUT_FILE] [--format png|pdf|svg]
+    python plot_metrics.py data/multi-policy-comparison-TIMESTAMP.csv [--output OUTPUT_FILE] [--format png,pdf,svg]
 
 This script generates:
 1. Grouped bar chart comparing all metrics across policies
@@ -13,21 +13,10 @@ This script generates:
 import argparse
 import sys
 from pathlib import Path
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.patches import Rectangle
-import seaborn as sns
-from common import POLICY_COLORS
-
-# Set style
-sns.set_style("whitegrid")
-plt.rcParams['figure.dpi'] = 150
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['font.size'] = 10
-plt.rcParams['axes.labelsize'] = 11
-plt.rcParams['axes.titlesize'] = 12
-plt.rcParams['legend.fontsize'] = 9
+from common import (POLICY_COLORS, read_csv_cached, save_figure, run_render_plans,
+                    report_render_results, BuildCache, RenderPlan, enable_profiling, profile_stage,
+                    report_profile, add_format_argument, query_model_caption)
 
 # Define metric groups and properties
 METRIC_GROUPS = {
@@ -58,7 +47,7 @@ METRIC_GROUPS = {
 def load_data(csv_path):
     """Load and validate the CSV data."""
     try:
-        df = pd.read_csv(csv_path)
+        df = read_csv_cached(csv_path)
         required_cols = ['policy', 'cacheSize', 'cacheHitRate', 'deliveryRate']
         missing = [col for col in required_cols if col not in df.columns]
         if missing:
@@ -75,6 +64,8 @@ def load_data(csv_path):
 
 def plot_grouped_comparison(df, output_prefix, format='png'):
     """Create grouped bar chart comparing all key metrics."""
+    import matplotlib.pyplot as plt
+    
     # Select metrics to plot (exclude push metrics if all zero)
     metrics_to_plot = []
     for group, metrics in METRIC_GROUPS.items():
@@ -163,13 +154,15 @@ def plot_grouped_comparison(df, output_prefix, format='png'):
     
     plt.tight_layout(rect=[0, 0, 1, 0.98])
     output_file = f"{output_prefix}_grouped_comparison.{format}"
-    plt.savefig(output_file, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, bbox_inches='tight', facecolor='white')
     print(f"Saved: {output_file}")
     plt.close()
 
 
 def plot_radar_chart(df, output_prefix, format='png'):
     """Create radar/spider chart for normalized metrics comparison."""
+    import matplotlib.pyplot as plt
+    
     # Select key metrics for radar chart (exclude counts)
     radar_metrics = [
         ('cacheHitRate', 'Cache Hit'),
@@ -250,13 +243,15 @@ def plot_radar_chart(df, output_prefix, format='png'):
               size=14, fontweight='bold', pad=20)
     
     output_file = f"{output_prefix}_radar_comparison.{format}"
-    plt.savefig(output_file, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, bbox_inches='tight', facecolor='white')
     print(f"Saved: {output_file}")
     plt.close()
 
 
 def plot_summary_table(df, output_prefix, format='png'):
     """Create a summary table with key metrics."""
+    import matplotlib.pyplot as plt
+    
     # Select key metrics
     key_metrics = [
         ('cacheHitRate', 'Hit Rate'),
@@ -325,11 +320,35 @@ def plot_summary_table(df, output_prefix, format='png'):
               fontsize=12, fontweight='bold', pad=20)
     
     output_file = f"{output_prefix}_summary_table.{format}"
-    plt.savefig(output_file, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, bbox_inches='tight', facecolor='white')
     print(f"Saved: {output_file}")
     plt.close()
 
 
+def load_inputs(csv_file, args):
+    """Load the export for plan_jobs()."""
+    print(f"Loading data from: {csv_file}")
+    with profile_stage('load', csv_file):
+        df = load_data(csv_file)
+    print(f"Found {len(df)} policies: {', '.join(df['policy'].tolist())}")
+    return df
+
+
+def add_arguments(parser):
+    """Options specific to this analysis (none beyond the shared ones)."""
+
+
+def plan_jobs(df, args, output_prefix, inputs):
+    """List the figure jobs for ``df``; returns a RenderPlan."""
+    jobs = [
+        (plot_grouped_comparison, (df, output_prefix, args.format)),
+        (plot_radar_chart, (df, output_prefix, args.format)),
+        (plot_summary_table, (df, output_prefix, args.format)),
+    ]
+    return RenderPlan(jobs, [df], BuildCache(inputs, output_prefix, force=args.force),
+                      caption=query_model_caption(df))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Generate comparison plots from multi-policy metrics CSV',
@@ -339,14 +358,27 @@ Examples:
   python plot_metrics.py data/multi-policy-comparison-1234.csv
   python plot_metrics.py data/multi-policy-comparison-1234.csv --output figures/comparison
   python plot_metrics.py data/multi-policy-comparison-1234.csv --format pdf
+
+  # PNG for dashboards and PDF for the paper from one render pass
+  python plot_metrics.py data/multi-policy-comparison-1234.csv --format png,pdf
         """
     )
     parser.add_argument('csv_file', help='Path to multi-policy comparison CSV file')
     parser.add_argument('--output', '-o', help='Output file prefix (default: same as input without extension)')
-    parser.add_argument('--format', '-f', choices=['png', 'pdf', 'svg'], default='png',
-                       help='Output format (default: png)')
+    add_format_argument(parser, '--format', '-f')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help='Number of worker processes for rendering plots (default: one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                       help='Re-render every figure even if its inputs are unchanged')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print wall/CPU time and peak memory for each load/validate/aggregate/render/save stage')
+    parser.add_argument('--profile-json', metavar='FILE',
+                       help='Also write the --profile report to FILE as JSON (implies --profile)')
+    add_arguments(parser)
     
     args = parser.parse_args()
+    if args.profile or args.profile_json:
+        enable_profiling()
     
     # Determine output prefix
     if args.output:
@@ -355,15 +387,15 @@ Examples:
         output_prefix = Path(args.csv_file).stem
     
     # Load data
-    print(f"Loading data from: {args.csv_file}")
-    df = load_data(args.csv_file)
-    print(f"Found {len(df)} policies: {', '.join(df['policy'].tolist())}")
+    df = load_inputs(args.csv_file, args)
+    plan = plan_jobs(df, args, output_prefix, [args.csv_file])
     
     # Generate plots
     print("\nGenerating plots...")
-    plot_grouped_comparison(df, output_prefix, args.format)
-    plot_radar_chart(df, output_prefix, args.format)
-    plot_summary_table(df, output_prefix, args.format)
+    results = run_render_plans([plan], n_jobs=args.jobs, formats=args.formats)
+    report_profile(args.profile_json)
+    if report_render_results(results):
+        sys.exit(1)
     
     print(f"\nAll plots generated successfully!")
     print(f"Output prefix: {output_prefix}")
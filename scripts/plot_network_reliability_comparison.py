@@ -15,20 +15,12 @@ but the same seed, scenario, cache size, and other parameters.
 import argparse
 import sys
 from pathlib import Path
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
-from common import POLICY_COLORS, POLICY_MARKERS, get_winner_label
-
-# Set style
-sns.set_style("whitegrid")
-plt.rcParams['figure.dpi'] = 150
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['font.size'] = 10
-plt.rcParams['axes.labelsize'] = 11
-plt.rcParams['axes.titlesize'] = 12
-plt.rcParams['legend.fontsize'] = 9
+from common import (POLICY_COLORS, POLICY_MARKERS, POLICY_ORDER, read_csv_many, concat_columnar,
+                    resolve_winners, draw_winner_heatmap, save_figure, run_render_plans,
+                    report_render_results, BuildCache, RenderPlan, enable_profiling, profile_stage, report_profile,
+                    aggregate_replicates, format_mean_ci, DEFAULT_CONFIDENCE, add_format_argument,
+                    query_model_caption)
 
 # Unified colors/markers and tie-labeling are imported from common.py
 
@@ -48,21 +40,18 @@ NETWORK_CONDITIONS = {
 }
 
 
-def load_and_combine_data(csv_files):
-    """Load multiple CSV files and combine them."""
-    dfs = []
-    for csv_file in csv_files:
-        try:
-            df = pd.read_csv(csv_file)
-            dfs.append(df)
-        except FileNotFoundError:
+def load_and_combine_data(csv_files, jobs=None):
+    """Load multiple CSV files concurrently and combine them in input order."""
+    dfs = read_csv_many(csv_files, jobs=jobs)
+    for csv_file, df in zip(csv_files, dfs):
+        if isinstance(df, FileNotFoundError):
             print(f"Error: File not found: {csv_file}")
             sys.exit(1)
-        except Exception as e:
-            print(f"Error loading {csv_file}: {e}")
+        if isinstance(df, Exception):
+            print(f"Error loading {csv_file}: {df}")
             sys.exit(1)
     
-    combined = pd.concat(dfs, ignore_index=True)
+    combined = concat_columnar(dfs)
     return combined
 
 
@@ -94,6 +83,8 @@ def get_network_label(reliability):
 
 def plot_reliability_curves(df, metric, metric_label, output_prefix, format='png', higher_is_better=True):
     """Plot how each policy handles different network reliability levels."""
+    import matplotlib.pyplot as plt
+    
     # Use explicit spacing control here to avoid rare constrained_layout quirks
     fig, ax = plt.subplots(figsize=(13, 7.5))
     
@@ -106,13 +97,21 @@ def plot_reliability_curves(df, metric, metric_label, output_prefix, format='png
         marker = POLICY_MARKERS.get(policy, 'o')
         
         values = policy_data[metric].values
+        scale = 1
         # Convert to percentage if values are 0-1
         if values.max() <= 1.0 and metric not in ['avgFreshness', 'redundancyIndex']:
-            values = values * 100
+            scale = 100
+            values = values * scale
         
         ax.plot(policy_data['reliability'] * 100, values,
                label=policy, color=color, marker=marker, 
                linewidth=2.5, markersize=8, alpha=0.8)
+        # Replicate confidence band
+        if f'{metric}_err' in policy_data.columns and policy_data[f'{metric}_err'].notna().any():
+            err = policy_data[f'{metric}_err'].fillna(0).values * scale
+            upper = 100 if scale == 100 else np.inf
+            ax.fill_between(policy_data['reliability'] * 100, np.clip(values - err, 0, upper),
+                           np.clip(values + err, 0, upper), color=color, alpha=0.15, linewidth=0)
     
     ax.set_xlabel('Network Reliability (%)', fontweight='bold', fontsize=12)
     
@@ -143,13 +142,15 @@ def plot_reliability_curves(df, metric, metric_label, output_prefix, format='png
     # Adjust layout with extra headroom for top annotations
     fig.subplots_adjust(top=0.9, bottom=0.12, left=0.09, right=0.98)
     output_file = f"{output_prefix}_reliability_{metric}.{format}"
-    plt.savefig(output_file, facecolor='white')
+    save_figure(output_file, facecolor='white')
     print(f"✓ Saved: {output_file}")
     plt.close()
 
 
 def plot_all_metrics_grid(df, output_prefix, format='png'):
     """Create a grid showing all key metrics vs network reliability."""
+    import matplotlib.pyplot as plt
+    
     metrics = [
         ('deliveryRate', 'Delivery Rate', True),
         ('cacheHitRate', 'Cache Hit Rate', True),
@@ -182,13 +183,20 @@ def plot_all_metrics_grid(df, output_prefix, format='png'):
             marker = POLICY_MARKERS.get(policy, 'o')
             
             values = policy_data[metric_key].values
+            scale = 1
             # Convert to percentage if values are 0-1
             if values.max() <= 1.0 and metric_key not in ['avgFreshness', 'redundancyIndex']:
-                values = values * 100
+                scale = 100
+                values = values * scale
             
             ax.plot(policy_data['reliability'] * 100, values,
                    label=policy, color=color, marker=marker,
                    linewidth=2, markersize=6, alpha=0.8)
+            if f'{metric_key}_err' in policy_data.columns and policy_data[f'{metric_key}_err'].notna().any():
+                err = policy_data[f'{metric_key}_err'].fillna(0).values * scale
+                upper = 100 if scale == 100 else np.inf
+                ax.fill_between(policy_data['reliability'] * 100, np.clip(values - err, 0, upper),
+                               np.clip(values + err, 0, upper), color=color, alpha=0.15, linewidth=0)
         
         ax.set_xlabel('Network Reliability (%)', fontweight='bold')
         ylabel = f'{metric_label} (%)' if df[metric_key].max() <= 1.1 else metric_label
@@ -212,13 +220,15 @@ def plot_all_metrics_grid(df, output_prefix, format='png'):
     
     # Layout automatically handled by constrained_layout
     output_file = f"{output_prefix}_all_metrics_grid.{format}"
-    plt.savefig(output_file, facecolor='white')
+    save_figure(output_file, facecolor='white')
     print(f"✓ Saved: {output_file}")
     plt.close()
 
 
 def plot_resilience_analysis(df, output_prefix, format='png'):
     """Analyze which policy is most resilient to network degradation."""
+    import matplotlib.pyplot as plt
+    
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6), constrained_layout=True)
     
     reliabilities = sorted(df['reliability'].unique())
@@ -274,13 +284,15 @@ def plot_resilience_analysis(df, output_prefix, format='png'):
     
     # Layout automatically handled by constrained_layout
     output_file = f"{output_prefix}_resilience_analysis.{format}"
-    plt.savefig(output_file, facecolor='white')
+    save_figure(output_file, facecolor='white')
     print(f"✓ Saved: {output_file}")
     plt.close()
 
 
 def plot_condition_comparison(df, output_prefix, format='png'):
     """Create a comparison showing good vs poor vs disaster network conditions."""
+    import matplotlib.pyplot as plt
+    
     reliabilities = sorted(df['reliability'].unique())
     
     if len(reliabilities) < 3:
@@ -321,24 +333,34 @@ def plot_condition_comparison(df, output_prefix, format='png'):
     for idx, (metric_key, metric_label) in enumerate(metrics):
         ax = axes[idx]
         
-        good_values = [good_data[good_data['policy'] == p][metric_key].values[0] for p in policies]
-        poor_values = [poor_data[poor_data['policy'] == p][metric_key].values[0] for p in policies]
-        disaster_values = [disaster_data[disaster_data['policy'] == p][metric_key].values[0] for p in policies]
+        good = good_data.set_index('policy').reindex(policies)
+        poor = poor_data.set_index('policy').reindex(policies)
+        disaster = disaster_data.set_index('policy').reindex(policies)
+        good_values = good[metric_key].tolist()
+        poor_values = poor[metric_key].tolist()
+        disaster_values = disaster[metric_key].tolist()
+        good_err = good[f'{metric_key}_err'].to_numpy()
+        poor_err = poor[f'{metric_key}_err'].to_numpy()
+        disaster_err = disaster[f'{metric_key}_err'].to_numpy()
         
         # Convert to percentage
         if max(good_values + poor_values + disaster_values) <= 1.0:
             good_values = [v * 100 for v in good_values]
             poor_values = [v * 100 for v in poor_values]
             disaster_values = [v * 100 for v in disaster_values]
+            good_err, poor_err, disaster_err = good_err * 100, poor_err * 100, disaster_err * 100
         
         bars1 = ax.bar(x - width, good_values, width, 
                       label=f'Good ({good_rel*100:.0f}%)',
+                      yerr=good_err if good_err.any() else None, capsize=2,
                       color='#10b981', alpha=0.8, edgecolor='black', linewidth=0.5)
         bars2 = ax.bar(x, poor_values, width,
                       label=f'Poor ({poor_rel*100:.0f}%)',
+                      yerr=poor_err if poor_err.any() else None, capsize=2,
                       color='#f59e0b', alpha=0.8, edgecolor='black', linewidth=0.5)
         bars3 = ax.bar(x + width, disaster_values, width,
                       label=f'Disaster ({disaster_rel*100:.0f}%)',
+                      yerr=disaster_err if disaster_err.any() else None, capsize=2,
                       color='#ef4444', alpha=0.8, edgecolor='black', linewidth=0.5)
         
         ax.set_ylabel(f'{metric_label} (%)', fontweight='bold')
@@ -360,13 +382,15 @@ def plot_condition_comparison(df, output_prefix, format='png'):
     
     # Layout automatically handled by constrained_layout
     output_file = f"{output_prefix}_condition_comparison.{format}"
-    plt.savefig(output_file, facecolor='white')
+    save_figure(output_file, facecolor='white')
     print(f"✓ Saved: {output_file}")
     plt.close()
 
 
 def plot_winner_heatmap(df, output_prefix, format='png'):
     """Create a heatmap showing which policy wins at each reliability level for each metric."""
+    import matplotlib.pyplot as plt
+    
     metrics = [
         ('deliveryRate', 'Delivery', True),
         ('actionabilityFirstRatio', 'Actionability', True),
@@ -381,68 +405,21 @@ def plot_winner_heatmap(df, output_prefix, format='png'):
     reliabilities = sorted(df['reliability'].unique())
     
     # Use consistent policy order matching POLICY_COLORS definition
-    policy_order = ['LRU', 'TTLOnly', 'PriorityFresh', 'PAFTinyLFU']
-    policies = [p for p in policy_order if p in df['policy'].unique()]
-    
-    # Create winner matrix and labels
-    winner_matrix = np.zeros((len(metrics), len(reliabilities)))
-    winner_labels = []
-    tie_cells = []  # Track cells with ties
-    
-    for i, (metric_key, _, higher_better) in enumerate(metrics):
-        row_labels = []
-        for j, reliability in enumerate(reliabilities):
-            rel_data = df[df['reliability'] == reliability]
-            
-            # Get values for all policies
-            policy_values = {}
-            for policy in policies:
-                policy_data = rel_data[rel_data['policy'] == policy]
-                if len(policy_data) > 0:
-                    value = policy_data[metric_key].values[0]
-                    # Invert if lower is better
-                    policy_values[policy] = value if higher_better else -value
-            
-            # Determine winner label (handles ties)
-            winner_label = get_winner_label(policy_values)
-            row_labels.append(winner_label)
-            
-            # For coloring, use first winner or gray for "ANY"
-            if winner_label == "ANY":
-                winner_matrix[i, j] = -1  # Special value for ties
-                tie_cells.append((i, j))
-            elif "/" in winner_label:
-                # Multiple winners but not all - use first winner's color
-                first_winner = winner_label.split("/")[0]
-                from common import find_policy_by_abbrev
-                full = find_policy_by_abbrev(first_winner, list(policies))
-                if full:
-                    winner_matrix[i, j] = list(policies).index(full)
-                tie_cells.append((i, j))
-            else:
-                # Single winner - find the full policy name
-                from common import find_policy_by_abbrev
-                full = find_policy_by_abbrev(winner_label, list(policies))
-                if full:
-                    winner_matrix[i, j] = list(policies).index(full)
-        
-        winner_labels.append(row_labels)
+    policies = [p for p in POLICY_ORDER if p in df['policy'].unique()]
+    
+    # (metric, reliability, policy) replicate means and CI half-widths, NaN where missing
+    cells = df.set_index(['reliability', 'policy'])
+    def grid(column):
+        return cells[column].unstack('policy').reindex(index=reliabilities, columns=policies).to_numpy(dtype=float)
+    values = np.stack([grid(metric_key) for metric_key, _, _ in metrics])
+    ci = np.stack([grid(f'{metric_key}_err') for metric_key, _, _ in metrics])
+    higher_better = np.array([h for _, _, h in metrics])
+    # Policies whose confidence intervals overlap the leader's count as tied
+    winner_idx, tie_bits, winner_labels = resolve_winners(values, policies, higher_better[:, None], ci=ci)
     
     # Create heatmap
     fig, ax = plt.subplots(figsize=(14, 8), constrained_layout=True)
-    
-    # Custom colormap (add gray for "ANY")
-    # Build color list in the same order as policies to ensure correct mapping
-    policy_colors_list = []
-    for p in policies:
-        policy_colors_list.append(POLICY_COLORS.get(p, '#6b7280'))
-    policy_colors_list.append('#6b7280')  # Gray for "ANY"
-    from matplotlib.colors import ListedColormap, BoundaryNorm
-    cmap = ListedColormap(policy_colors_list)
-    bounds = list(range(-1, len(policies))) + [len(policies)]
-    norm = BoundaryNorm(bounds, cmap.N)
-    
-    im = ax.imshow(winner_matrix, cmap=cmap, norm=norm, aspect='auto')
+    draw_winner_heatmap(ax, winner_idx, tie_bits, winner_labels, policies)
     
     # Set ticks
     ax.set_xticks(np.arange(len(reliabilities)))
@@ -450,37 +427,14 @@ def plot_winner_heatmap(df, output_prefix, format='png'):
     ax.set_xticklabels([f'{r*100:.0f}%' for r in reliabilities])
     ax.set_yticklabels([label for _, label, _ in metrics])
     
-    # Add text annotations
-    for i in range(len(metrics)):
-        for j in range(len(reliabilities)):
-            label = winner_labels[i][j]
-            # Use smaller font for tie labels
-            fontsize = 8 if "/" in label or label == "ANY" else 10
-            text = ax.text(j, i, label,
-                         ha="center", va="center", color="white", 
-                         fontweight='bold', fontsize=fontsize)
-    
     ax.set_xlabel('Network Reliability (%)', fontweight='bold', fontsize=12)
     ax.set_ylabel('Metric', fontweight='bold', fontsize=12)
     ax.set_title('Policy Winner by Network Condition and Metric\n(Shows which policy wins at each reliability level)',
                 fontsize=14, fontweight='bold', pad=15)
     
-    # Add colorbar (exclude gray "ANY" from legend if not used)
-    if tie_cells:
-        cbar = plt.colorbar(im, ax=ax, ticks=list(range(-1, len(policies))), 
-                           orientation='vertical', pad=0.02)
-        cbar.set_label('Winning Policy', fontweight='bold')
-        labels = ['TIE (ALL)'] + list(policies)
-        cbar.ax.set_yticklabels(labels)
-    else:
-        cbar = plt.colorbar(im, ax=ax, ticks=np.arange(len(policies)), 
-                           orientation='vertical', pad=0.02)
-        cbar.set_label('Winning Policy', fontweight='bold')
-        cbar.ax.set_yticklabels(policies)
-    
     # Layout automatically handled by constrained_layout
     output_file = f"{output_prefix}_winner_heatmap.{format}"
-    plt.savefig(output_file, facecolor='white')
+    save_figure(output_file, facecolor='white')
     print(f"✓ Saved: {output_file}")
     plt.close()
 
@@ -501,6 +455,9 @@ def print_summary_stats(df):
         print(f"Scenario: {df['scenario'].iloc[0]}")
     if 'seed' in df.columns:
         print(f"Seed: {df['seed'].iloc[0]}")
+    if 'replicates' in df.columns and df['replicates'].max() > 1:
+        print(f"Replicates per cell: {df['replicates'].min()}-{df['replicates'].max()} "
+              f"(values are means ± CI half-width)")
     
     print("\n" + "-"*70)
     print("Performance at Best Network Condition ({:.0f}%):".format(reliabilities[-1]*100))
@@ -510,9 +467,9 @@ def print_summary_stats(df):
     for policy in policies:
         policy_data = best_df[best_df['policy'] == policy].iloc[0]
         print(f"\n{policy}:")
-        print(f"  Delivery Rate:    {policy_data['deliveryRate']*100:6.2f}%")
-        print(f"  Actionability:    {policy_data['actionabilityFirstRatio']*100:6.2f}%")
-        print(f"  Hit Rate:         {policy_data['cacheHitRate']*100:6.2f}%")
+        print(f"  Delivery Rate:    {format_mean_ci(policy_data, 'deliveryRate')}")
+        print(f"  Actionability:    {format_mean_ci(policy_data, 'actionabilityFirstRatio')}")
+        print(f"  Hit Rate:         {format_mean_ci(policy_data, 'cacheHitRate')}")
     
     print("\n" + "-"*70)
     print("Performance at Worst Network Condition ({:.0f}%):".format(reliabilities[0]*100))
@@ -522,9 +479,9 @@ def print_summary_stats(df):
     for policy in policies:
         policy_data = worst_df[worst_df['policy'] == policy].iloc[0]
         print(f"\n{policy}:")
-        print(f"  Delivery Rate:    {policy_data['deliveryRate']*100:6.2f}%")
-        print(f"  Actionability:    {policy_data['actionabilityFirstRatio']*100:6.2f}%")
-        print(f"  Hit Rate:         {policy_data['cacheHitRate']*100:6.2f}%")
+        print(f"  Delivery Rate:    {format_mean_ci(policy_data, 'deliveryRate')}")
+        print(f"  Actionability:    {format_mean_ci(policy_data, 'actionabilityFirstRatio')}")
+        print(f"  Hit Rate:         {format_mean_ci(policy_data, 'cacheHitRate')}")
     
     # Calculate resilience (how well performance is maintained)
     print("\n" + "-"*70)
@@ -541,6 +498,63 @@ def print_summary_stats(df):
     print("\n" + "="*70)
 
 
+def load_inputs(csv_files, args):
+    """Load, combine and validate the exports for plan_jobs()."""
+    print(f"Loading {len(csv_files)} CSV files...")
+    with profile_stage('load', f"{len(csv_files)} files"):
+        df = load_and_combine_data(csv_files, jobs=args.jobs)
+    with profile_stage('validate'):
+        validate_data(df)
+    return df
+
+
+def add_arguments(parser):
+    """Options specific to this analysis (also used by aware_plots.py)."""
+    parser.add_argument('--stats', '-s', action='store_true',
+                       help='Print summary statistics')
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE,
+                       help='Confidence level for replicate CIs; overlapping CIs count as ties '
+                            f'(default: {DEFAULT_CONFIDENCE})')
+
+
+def plan_jobs(df, args, output_prefix, inputs):
+    """Aggregate replicates, print the summary and list the figure jobs; returns a RenderPlan."""
+    # One row per (policy, reliability): replicate mean, std, count and CI; all plots read it
+    with profile_stage('aggregate', 'aggregate_replicates'):
+        df = aggregate_replicates(df, ['policy', 'reliability'], confidence=args.confidence)
+    
+    reliabilities = sorted(df['reliability'].unique())
+    policies = df['policy'].unique()
+    print(f"Found {len(reliabilities)} reliability levels: {[f'{r*100:.0f}%' for r in reliabilities]}")
+    print(f"Found {len(policies)} policies: {', '.join(policies)}")
+    if df['replicates'].max() > 1:
+        print(f"Replicates per cell: {df['replicates'].min()}-{df['replicates'].max()} "
+              f"({args.confidence:.0%} CIs; overlapping CIs are ties)")
+    
+    # Print stats if requested
+    if args.stats:
+        with profile_stage('aggregate', 'print_summary_stats'):
+            print_summary_stats(df)
+    
+    # Individual reliability curves for key metrics, then composite views
+    jobs = [
+        (plot_reliability_curves, (df, 'deliveryRate', 'Delivery Rate',
+                                   output_prefix, args.format), {'higher_is_better': True}),
+        (plot_reliability_curves, (df, 'actionabilityFirstRatio', 'Actionability-First Ratio',
+                                   output_prefix, args.format), {'higher_is_better': True}),
+        (plot_reliability_curves, (df, 'timelinessConsistency', 'Timeliness Consistency',
+                                   output_prefix, args.format), {'higher_is_better': True}),
+        (plot_reliability_curves, (df, 'cacheHitRate', 'Cache Hit Rate',
+                                   output_prefix, args.format), {'higher_is_better': True}),
+        (plot_all_metrics_grid, (df, output_prefix, args.format)),
+        (plot_resilience_analysis, (df, output_prefix, args.format)),
+        (plot_condition_comparison, (df, output_prefix, args.format)),
+        (plot_winner_heatmap, (df, output_prefix, args.format)),
+    ]
+    cache = BuildCache(inputs, output_prefix, force=args.force, options={'confidence': args.confidence})
+    return RenderPlan(jobs, [df], cache, caption=query_model_caption(df))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Compare policy performance across different network reliability conditions',
@@ -557,48 +571,34 @@ Examples:
     parser.add_argument('--files', '-f', nargs='+', required=True,
                        help='Paths to multi-policy comparison CSV files (different reliability values)')
     parser.add_argument('--output', '-o', help='Output file prefix (default: network_reliability_comparison)')
-    parser.add_argument('--format', choices=['png', 'pdf', 'svg'], default='png',
-                       help='Output format (default: png)')
-    parser.add_argument('--stats', '-s', action='store_true',
-                       help='Print summary statistics')
+    add_format_argument(parser)
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help='Number of worker processes for reading files and rendering plots (default: one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                       help='Re-render every figure even if its inputs are unchanged')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print wall/CPU time and peak memory for each load/validate/aggregate/render/save stage')
+    parser.add_argument('--profile-json', metavar='FILE',
+                       help='Also write the --profile report to FILE as JSON (implies --profile)')
+    add_arguments(parser)
     
     args = parser.parse_args()
+    if args.profile or args.profile_json:
+        enable_profiling()
     
     # Determine output prefix
     output_prefix = args.output if args.output else 'network_reliability_comparison'
     
     # Load and combine data
-    print(f"Loading {len(args.files)} CSV files...")
-    df = load_and_combine_data(args.files)
-    validate_data(df)
-    
-    reliabilities = sorted(df['reliability'].unique())
-    policies = df['policy'].unique()
-    print(f"Found {len(reliabilities)} reliability levels: {[f'{r*100:.0f}%' for r in reliabilities]}")
-    print(f"Found {len(policies)} policies: {', '.join(policies)}")
-    
-    # Print stats if requested
-    if args.stats:
-        print_summary_stats(df)
+    df = load_inputs(args.files, args)
+    plan = plan_jobs(df, args, output_prefix, args.files)
     
     # Generate plots
     print("\nGenerating plots...")
-    
-    # Individual reliability curves for key metrics
-    plot_reliability_curves(df, 'deliveryRate', 'Delivery Rate', 
-                           output_prefix, args.format, higher_is_better=True)
-    plot_reliability_curves(df, 'actionabilityFirstRatio', 'Actionability-First Ratio', 
-                           output_prefix, args.format, higher_is_better=True)
-    plot_reliability_curves(df, 'timelinessConsistency', 'Timeliness Consistency', 
-                           output_prefix, args.format, higher_is_better=True)
-    plot_reliability_curves(df, 'cacheHitRate', 'Cache Hit Rate', 
-                           output_prefix, args.format, higher_is_better=True)
-    
-    # Composite views
-    plot_all_metrics_grid(df, output_prefix, args.format)
-    plot_resilience_analysis(df, output_prefix, args.format)
-    plot_condition_comparison(df, output_prefix, args.format)
-    plot_winner_heatmap(df, output_prefix, args.format)
+    results = run_render_plans([plan], n_jobs=args.jobs, formats=args.formats)
+    report_profile(args.profile_json)
+    if report_render_results(results):
+        sys.exit(1)
     
     print(f"\n✓ All plots generated successfully!")
     print(f"Output prefix: {output_prefix}")
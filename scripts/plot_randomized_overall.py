@@ -2,29 +2,34 @@
 Summarize randomized multi-policy runs into average performance figures per policy.
 
 Usage:
-    python plot_randomized_overall.py data/randomized-comparison-*.csv [--output OUTPUT_PREFIX] [--format png|pdf|svg]
+    python plot_randomized_overall.py data/randomized-comparison-*.csv [--output OUTPUT_PREFIX] [--format png,pdf,svg]
 
 This reads a randomized-comparison CSV (rows = policies × randomized runs),
 aggregates metrics by policy (mean ± std), and produces bar charts and a summary table.
+With --ci percentile|bca the bars, lines and table show bootstrap confidence
+intervals of the mean instead of ± std, which stay honest for skewed rates
+near 0 or 1.
+
+Every runIndex evaluates all policies under identical conditions, so the
+paired stage compares policies within runs: per metric, the (runs × policies)
+matrix gives every pairwise difference, summarized by a paired bootstrap CI
+of the mean difference and a Wilcoxon signed-rank test, and drawn as a
+policy-vs-policy matrix.
 """
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import os
 from pathlib import Path
 import sys
+from typing import Optional
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from common import POLICY_COLORS, POLICY_ORDER
-
-# Style
-sns.set_style("whitegrid")
-plt.rcParams['figure.dpi'] = 150
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['font.size'] = 10
-plt.rcParams['axes.labelsize'] = 11
-plt.rcParams['axes.titlesize'] = 12
-plt.rcParams['legend.fontsize'] = 9
+from common import (POLICY_COLORS, POLICY_ORDER, read_csv_cached, save_figure, run_render_plans,
+                    report_render_results, BuildCache, RenderPlan, enable_profiling, profile_stage,
+                    report_profile, bootstrap_mean_ci, BOOTSTRAP_METHODS, DEFAULT_CONFIDENCE,
+                    add_format_argument)
 
 CORE_PERCENT_METRICS = [
     ('cacheHitRate', 'Cache Hit Rate'),
@@ -45,10 +50,14 @@ PUSH_METRICS = [
     ('pushTimelyFirstRatio', 'Push Timely First', False),
 ]
 
+# Paired tests with fewer non-zero differences than this (and no ties) use the
+# exact signed-rank distribution instead of the normal approximation
+EXACT_WILCOXON_MAX_N = 20
+
 
 def load_data(csv_path: str) -> pd.DataFrame:
     try:
-        df = pd.read_csv(csv_path)
+        df = read_csv_cached(csv_path)
     except FileNotFoundError:
         print(f"Error: file not found: {csv_path}")
         sys.exit(1)
@@ -62,7 +71,19 @@ def load_data(csv_path: str) -> pd.DataFrame:
     return df
 
 
-def aggregate_by_policy(df: pd.DataFrame) -> pd.DataFrame:
+def _bootstrap_policy(values: np.ndarray, n_resamples: int, confidence: float, method: str, seed):
+    return bootstrap_mean_ci(values, n_resamples, confidence, method, seed)
+
+
+def aggregate_by_policy(df: pd.DataFrame, ci: Optional[str] = None, n_resamples: int = 10000,
+                        confidence: float = DEFAULT_CONFIDENCE, seed: int = 0,
+                        jobs: Optional[int] = None) -> pd.DataFrame:
+    """Per-policy mean and std of every metric, plus bootstrap CIs when ``ci`` is set.
+
+    ``ci`` is 'percentile' or 'bca'; it adds ``{metric}_ci_lo``/``{metric}_ci_hi``.
+    Each policy gets its own child seed, so the intervals do not depend on
+    ``jobs``, the number of processes the policies are spread over.
+    """
     # Determine which metrics exist in the CSV
     metric_keys = [k for k, _ in CORE_PERCENT_METRICS]
     metric_keys += [k for k, _, _ in ADDITIONAL_METRICS]
@@ -72,7 +93,24 @@ def aggregate_by_policy(df: pd.DataFrame) -> pd.DataFrame:
     grouped = df.groupby('policy')[metric_keys]
     mean = grouped.mean().add_suffix('_mean')
     std = grouped.std(ddof=1).fillna(0).add_suffix('_std')
-    out = pd.concat([mean, std], axis=1).reset_index()
+    parts = [mean, std]
+
+    if ci:
+        policies = list(mean.index)
+        values = [grouped.get_group(p).to_numpy(dtype=float) for p in policies]
+        seeds = np.random.SeedSequence(seed).spawn(len(policies))
+        tasks = [(v, n_resamples, confidence, ci, s) for v, s in zip(values, seeds)]
+        n_jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+        if n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                bounds = list(pool.map(_bootstrap_policy, *zip(*tasks)))
+        else:
+            bounds = [_bootstrap_policy(*task) for task in tasks]
+        parts.append(pd.DataFrame([lo for lo, _ in bounds], index=mean.index,
+                                  columns=[f'{k}_ci_lo' for k in metric_keys]))
+        parts.append(pd.DataFrame([hi for _, hi in bounds], index=mean.index,
+                                  columns=[f'{k}_ci_hi' for k in metric_keys]))
+    out = pd.concat(parts, axis=1).reset_index()
 
     # Ensure policy order is consistent
     out['__order'] = out['policy'].apply(lambda p: POLICY_ORDER.index(p) if p in POLICY_ORDER else 999)
@@ -80,7 +118,122 @@ def aggregate_by_policy(df: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
-def plot_core_bars(agg: pd.DataFrame, output_prefix: str, file_format: str = 'png'):
+def error_bars(agg: pd.DataFrame, key: str, scale: float = 1.0) -> np.ndarray:
+    """(2, policies) lower/upper error bar lengths: the bootstrap CI if present, else ± std."""
+    means = agg[f'{key}_mean'].to_numpy(dtype=float)
+    if f'{key}_ci_lo' in agg.columns:
+        lower = means - agg[f'{key}_ci_lo'].to_numpy(dtype=float)
+        upper = agg[f'{key}_ci_hi'].to_numpy(dtype=float) - means
+    else:
+        lower = upper = agg[f'{key}_std'].to_numpy(dtype=float) if f'{key}_std' in agg.columns else np.zeros_like(means)
+    return np.vstack([lower, upper]) * scale
+
+
+def paired_differences(df: pd.DataFrame, policies, n_resamples: int = 10000,
+                       confidence: float = DEFAULT_CONFIDENCE, method: str = 'percentile',
+                       seed: int = 0) -> pd.DataFrame:
+    """Within-run policy differences for every metric and ordered policy pair.
+
+    Pivots each metric to a (runIndex × policy) matrix and takes all pairwise
+    column differences at once; a pair uses the runs where both policies have
+    a value. Returns one row per (metric, policyA, policyB) with the mean of
+    A − B, its paired bootstrap CI (runs are resampled jointly, so the pairing
+    is kept), and the Wilcoxon signed-rank statistic and two-sided p-value.
+    """
+    metric_keys = [k for k, _ in CORE_PERCENT_METRICS] + [k for k, _, _ in ADDITIONAL_METRICS]
+    metric_keys = [m for m in metric_keys if m in df.columns]
+    wide = df.groupby(['runIndex', 'policy'])[metric_keys].mean().unstack('policy')
+    policies = [p for p in policies if p in wide.columns.get_level_values('policy')]
+    first, second = np.triu_indices(len(policies), k=1)
+
+    rows = []
+    seeds = np.random.SeedSequence(seed).spawn(len(metric_keys))
+    for metric, metric_seed in zip(metric_keys, seeds):
+        matrix = wide[metric].reindex(columns=policies).to_numpy(dtype=float)
+        diffs = matrix[:, first] - matrix[:, second]
+        runs = np.sum(~np.isnan(diffs), axis=0)
+        with np.errstate(invalid='ignore'):
+            means = np.nanmean(diffs, axis=0) if len(diffs) else np.full(len(first), np.nan)
+        lo, hi = bootstrap_mean_ci(diffs, n_resamples, confidence, method, metric_seed)
+        stat, p_value = wilcoxon_signed_rank(diffs)
+        for k, (a, b) in enumerate(zip(first, second)):
+            rows.append((metric, policies[a], policies[b], runs[k], means[k], lo[k], hi[k], stat[k], p_value[k]))
+            rows.append((metric, policies[b], policies[a], runs[k], -means[k], -hi[k], -lo[k], stat[k], p_value[k]))
+    return pd.DataFrame(rows, columns=['metric', 'policyA', 'policyB', 'runs', 'meanDiff',
+                                       'ciLo', 'ciHi', 'wilcoxonW', 'pValue'])
+
+
+@lru_cache(maxsize=None)
+def _signed_rank_cdf(n: int) -> np.ndarray:
+    """P(W+ <= w) for w = 0..n(n+1)/2 under H0, with untied ranks 1..n.
+
+    Counts the sign patterns giving each rank sum by dynamic programming
+    (one pass per rank) instead of enumerating all 2^n of them.
+    """
+    counts = np.zeros(n * (n + 1) // 2 + 1)
+    counts[0] = 1
+    for r in range(1, n + 1):
+        counts[r:] = counts[r:] + counts[:-r].copy()
+    return np.cumsum(counts) / 2.0 ** n
+
+
+def wilcoxon_signed_rank(diffs: np.ndarray):
+    """Two-sided Wilcoxon signed-rank test for each column of paired differences.
+
+    Zero differences are dropped and tied |differences| get average ranks.
+    Below EXACT_WILCOXON_MAX_N non-zero differences without ties the p-value
+    comes from the exact null distribution of W+; otherwise it uses the
+    tie-corrected normal approximation with continuity correction, which
+    understates p at small n. Returns (W+, p) arrays; NaN where a column has
+    no non-zero difference.
+    """
+    from statistics import NormalDist
+
+    d = np.where(diffs == 0, np.nan, diffs)
+    if d.ndim == 1:
+        d = d[:, None]
+    n = np.sum(~np.isnan(d), axis=0).astype(float)
+    ranks = pd.DataFrame(np.abs(d)).rank(method='average').to_numpy()
+    w_plus = np.nansum(np.where(d > 0, ranks, 0.0), axis=0)
+
+    ties = np.zeros(d.shape[1])
+    for j in range(d.shape[1]):
+        _, counts = np.unique(np.abs(d[~np.isnan(d[:, j]), j]), return_counts=True)
+        ties[j] = np.sum(counts ** 3 - counts)
+    mean = n * (n + 1) / 4
+    var = n * (n + 1) * (2 * n + 1) / 24 - ties / 48
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = np.maximum(np.abs(w_plus - mean) - 0.5, 0) / np.sqrt(var)
+    normal = NormalDist()
+    p_value = np.array([2 * (1 - normal.cdf(v)) if np.isfinite(v) else np.nan for v in z])
+    for j in np.flatnonzero((n > 0) & (n < EXACT_WILCOXON_MAX_N) & (ties == 0)):
+        cdf = _signed_rank_cdf(int(n[j]))
+        w = int(round(w_plus[j]))
+        # The null distribution is symmetric, so P(W+ >= w) = P(W+ <= max - w)
+        tail = min(cdf[w], cdf[len(cdf) - 1 - w])
+        p_value[j] = min(1.0, 2 * tail)
+    return np.where(n > 0, w_plus, np.nan), np.where(n > 0, p_value, np.nan)
+
+
+def significance_stars(p_value: float) -> str:
+    if np.isnan(p_value):
+        return ''
+    return '***' if p_value < 0.001 else '**' if p_value < 0.01 else '*' if p_value < 0.05 else ''
+
+
+def format_estimate(agg_row, key: str, scale: float = 1.0, digits: int = 1, unit: str = '') -> str:
+    """``'61.2±3.4%'``, or ``'61.2% [59.9, 62.5]'`` with a bootstrap CI."""
+    mean = agg_row[f'{key}_mean'] * scale
+    if f'{key}_ci_lo' in agg_row.index:
+        lo, hi = agg_row[f'{key}_ci_lo'] * scale, agg_row[f'{key}_ci_hi'] * scale
+        return f"{mean:.{digits}f}{unit} [{lo:.{digits}f}, {hi:.{digits}f}]"
+    std = agg_row.get(f'{key}_std', 0) * scale
+    return f"{mean:.{digits}f}±{std:.{digits}f}{unit}"
+
+
+def plot_core_bars(agg: pd.DataFrame, output_prefix: str, file_format: str = 'png', ci_label: Optional[str] = None):
+    import matplotlib.pyplot as plt
+
     # Prepare 2x2 grid for core percentage metrics
     fig, axes = plt.subplots(2, 2, figsize=(13, 8))
     axes = axes.flatten()
@@ -95,9 +248,9 @@ def plot_core_bars(agg: pd.DataFrame, output_prefix: str, file_format: str = 'pn
             axes[idx].axis('off')
             continue
         means = (agg[f'{key}_mean'].values * 100.0).astype(float)
-        stds = (agg[f'{key}_std'].values * 100.0).astype(float)
+        errors = error_bars(agg, key, 100.0)
         ax = axes[idx]
-        bars = ax.bar(x, means, yerr=stds, color=colors, edgecolor='black', linewidth=0.5,
+        bars = ax.bar(x, means, yerr=errors, color=colors, edgecolor='black', linewidth=0.5,
                       alpha=0.85, width=width, capsize=4)
         ax.set_xticks(x)
         ax.set_xticklabels(policies, rotation=0)
@@ -107,23 +260,27 @@ def plot_core_bars(agg: pd.DataFrame, output_prefix: str, file_format: str = 'pn
 
         # Labels on bars
         for i, bar in enumerate(bars):
-            h = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2, h, f"{h:.1f}±{stds[i]:.1f}",
-                    ha='center', va='bottom', fontsize=8)
+            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + errors[1, i],
+                    format_estimate(agg.iloc[i], key, 100.0), ha='center', va='bottom', fontsize=8)
 
-    fig.suptitle('Average Policy Performance Across Randomized Conditions', fontsize=14, fontweight='bold', y=0.995)
+    title = 'Average Policy Performance Across Randomized Conditions'
+    if ci_label:
+        title += f' (error bars: {ci_label})'
+    fig.suptitle(title, fontsize=14, fontweight='bold', y=0.995)
     plt.tight_layout(rect=[0, 0, 1, 0.98])
     out = f"{output_prefix}_randomized_core_metrics.{file_format}"
-    plt.savefig(out, bbox_inches='tight', facecolor='white')
+    save_figure(out, bbox_inches='tight', facecolor='white')
     print(f"Saved: {out}")
     plt.close()
 
 
-def plot_core_lines(agg: pd.DataFrame, output_prefix: str, file_format: str = 'png'):
+def plot_core_lines(agg: pd.DataFrame, output_prefix: str, file_format: str = 'png', ci_label: Optional[str] = None):
     """Line chart of core metrics (means with error bars) across policies.
 
     X-axis: metric name; Y-axis: value (%). One line per policy.
     """
+    import matplotlib.pyplot as plt
+
     # Determine which core metrics exist
     metrics = [(k, l) for (k, l) in CORE_PERCENT_METRICS if f'{k}_mean' in agg.columns]
     if len(metrics) == 0:
@@ -138,25 +295,26 @@ def plot_core_lines(agg: pd.DataFrame, output_prefix: str, file_format: str = 'p
     for idx, policy in enumerate(policies):
         row = agg[agg['policy'] == policy].iloc[0]
         means = np.array([row[f'{k}_mean'] for k, _ in metrics]) * 100.0
-        stds = np.array([row.get(f'{k}_std', 0.0) for k, _ in metrics]) * 100.0
-        ax.errorbar(x, means, yerr=stds, label=policy, color=colors[idx], marker='o', linewidth=2, capsize=4)
+        errors = np.hstack([error_bars(agg.iloc[[idx]], k, 100.0) for k, _ in metrics])
+        ax.errorbar(x, means, yerr=errors, label=policy, color=colors[idx], marker='o', linewidth=2, capsize=4)
 
     ax.set_xticks(x)
     ax.set_xticklabels([l for _, l in metrics], rotation=0)
     ax.set_ylabel('Value (%)')
-    ax.set_title('Core Metrics (Mean ± Std) — Line View', fontweight='bold')
+    ax.set_title(f"Core Metrics (Mean, {ci_label or '± Std'}) — Line View", fontweight='bold')
     ax.grid(True, alpha=0.3, linestyle='--')
     ax.legend(loc='best')
 
     plt.tight_layout()
     out = f"{output_prefix}_randomized_core_lines.{file_format}"
-    plt.savefig(out, bbox_inches='tight', facecolor='white')
+    save_figure(out, bbox_inches='tight', facecolor='white')
     print(f"Saved: {out}")
     plt.close()
 
 
 def plot_violins(df: pd.DataFrame, output_prefix: str, file_format: str = 'png'):
     """Violin+box plots per metric showing distribution across randomized runs per policy."""
+    import matplotlib.pyplot as plt
     import seaborn as sns
     palette = {p: POLICY_COLORS.get(p, '#6b7280') for p in df['policy'].unique()}
 
@@ -195,13 +353,14 @@ def plot_violins(df: pd.DataFrame, output_prefix: str, file_format: str = 'png')
 
         plt.tight_layout()
         out = f"{output_prefix}_randomized_violin_{key}.{file_format}"
-        plt.savefig(out, bbox_inches='tight', facecolor='white')
+        save_figure(out, bbox_inches='tight', facecolor='white')
         print(f"Saved: {out}")
         plt.close()
 
 
 def plot_ecdf_grid(df: pd.DataFrame, output_prefix: str, file_format: str = 'png'):
     """ECDF (CDF) plots per metric to compare policy robustness across distributions."""
+    import matplotlib.pyplot as plt
     import seaborn as sns
     palette = {p: POLICY_COLORS.get(p, '#6b7280') for p in df['policy'].unique()}
 
@@ -234,12 +393,15 @@ def plot_ecdf_grid(df: pd.DataFrame, output_prefix: str, file_format: str = 'png
 
     plt.tight_layout(rect=[0, 0, 1, 0.92])
     out = f"{output_prefix}_randomized_ecdf.{file_format}"
-    plt.savefig(out, bbox_inches='tight', facecolor='white')
+    save_figure(out, bbox_inches='tight', facecolor='white')
     print(f"Saved: {out}")
     plt.close()
 
 
-def plot_summary_table(agg: pd.DataFrame, output_prefix: str, file_format: str = 'png'):
+def plot_summary_table(agg: pd.DataFrame, output_prefix: str, file_format: str = 'png',
+                       ci_label: Optional[str] = None):
+    import matplotlib.pyplot as plt
+
     # Select subset of metrics for table
     table_metrics = [
         ('cacheHitRate', 'Hit Rate'),
@@ -256,11 +418,10 @@ def plot_summary_table(agg: pd.DataFrame, output_prefix: str, file_format: str =
         cells = [row['policy']]
         for key, _ in table_metrics:
             mean = row[f'{key}_mean']
-            std = row.get(f'{key}_std', 0)
             if mean <= 1.1 and key != 'avgFreshness':
-                cells.append(f"{mean*100:.1f}±{std*100:.1f}%")
+                cells.append(format_estimate(row, key, 100.0, unit='%'))
             else:
-                cells.append(f"{mean:.3f}±{std:.3f}")
+                cells.append(format_estimate(row, key, digits=3))
         rows.append(cells)
 
     fig, ax = plt.subplots(figsize=(12, 2 + 0.4*len(rows)))
@@ -270,37 +431,205 @@ def plot_summary_table(agg: pd.DataFrame, output_prefix: str, file_format: str =
     table.auto_set_font_size(False)
     table.set_fontsize(10)
     table.scale(1, 1.3)
-    plt.title('Randomized Overall Performance (Mean ± Std)', fontsize=12, fontweight='bold', pad=14)
+    plt.title(f"Randomized Overall Performance (Mean {f'[{ci_label}]' if ci_label else '± Std'})",
+              fontsize=12, fontweight='bold', pad=14)
     out = f"{output_prefix}_randomized_summary_table.{file_format}"
-    plt.savefig(out, bbox_inches='tight', facecolor='white')
+    save_figure(out, bbox_inches='tight', facecolor='white')
+    print(f"Saved: {out}")
+    plt.close()
+
+
+def plot_paired_matrix(paired: pd.DataFrame, output_prefix: str, file_format: str = 'png',
+                       ci_label: Optional[str] = None):
+    """Policy-vs-policy matrices of mean within-run differences (row − column), one per metric.
+
+    Cells are colored so blue always means the row policy is better (sign
+    flipped for lower-is-better metrics); stars mark Wilcoxon p < 0.05/0.01/0.001
+    and the bracket is the paired bootstrap CI.
+    """
+    import matplotlib.pyplot as plt
+
+    if paired.empty:
+        return
+    labels = dict(CORE_PERCENT_METRICS + [(k, l) for k, l, _ in ADDITIONAL_METRICS])
+    lower_better = {k for k, _, lower in ADDITIONAL_METRICS if lower}
+    metrics = list(dict.fromkeys(paired['metric']))
+    policies = list(dict.fromkeys(paired['policyA']))
+    policies = [p for p in POLICY_ORDER if p in policies] + [p for p in policies if p not in POLICY_ORDER]
+    n_pol = len(policies)
+
+    n_cols = min(3, len(metrics))
+    n_rows = (len(metrics) + n_cols - 1) // n_cols
+    fig, axes = plt.subplots(n_rows, n_cols, figsize=(5.5 * n_cols, 4.8 * n_rows), squeeze=False)
+    axes = axes.flatten()
+
+    for ax, metric in zip(axes, metrics):
+        cells = paired[paired['metric'] == metric].set_index(['policyA', 'policyB'])
+        scale = 1.0 if metric == 'avgFreshness' else 100.0
+        grid = np.full((n_pol, n_pol), np.nan)
+        text = [['' for _ in policies] for _ in policies]
+        for i, a in enumerate(policies):
+            for j, b in enumerate(policies):
+                if (a, b) not in cells.index:
+                    continue
+                row = cells.loc[(a, b)]
+                grid[i, j] = row['meanDiff'] * scale
+                fmt = '.3f' if scale == 1.0 else '+.1f'
+                text[i][j] = (f"{row['meanDiff'] * scale:{fmt}}{significance_stars(row['pValue'])}\n"
+                              f"[{row['ciLo'] * scale:{fmt}}, {row['ciHi'] * scale:{fmt}}]")
+        better = -grid if metric in lower_better else grid
+        limit = np.nanmax(np.abs(better)) if np.isfinite(better).any() else 1.0
+        im = ax.imshow(better, cmap='RdBu', vmin=-limit, vmax=limit)
+        for i in range(n_pol):
+            for j in range(n_pol):
+                if text[i][j]:
+                    ax.text(j, i, text[i][j], ha='center', va='center', fontsize=7,
+                            color='white' if abs(better[i, j]) > 0.6 * limit else 'black',
+                            fontweight='bold' if '*' in text[i][j] else 'normal')
+        ax.set_xticks(np.arange(n_pol))
+        ax.set_yticks(np.arange(n_pol))
+        ax.set_xticklabels(policies, rotation=20, ha='right')
+        ax.set_yticklabels(policies)
+        ax.grid(False)
+        unit = '' if scale == 1.0 else ' (pp)'
+        ax.set_title(f"{labels.get(metric, metric)}: row − column{unit}", fontweight='bold', fontsize=11)
+        plt.colorbar(im, ax=ax, fraction=0.046, pad=0.04, label='row better →')
+
+    for ax in axes[len(metrics):]:
+        ax.axis('off')
+
+    runs = int(paired['runs'].max())
+    fig.suptitle(f"Paired Policy Differences Within Randomized Runs (n={runs} runs; "
+                 f"{ci_label or 'bootstrap CI'}; Wilcoxon * p<.05 ** p<.01 *** p<.001)",
+                 fontsize=13, fontweight='bold', y=0.995)
+    plt.tight_layout(rect=[0, 0, 1, 0.97])
+    out = f"{output_prefix}_randomized_paired_matrix.{file_format}"
+    save_figure(out, bbox_inches='tight', facecolor='white')
     print(f"Saved: {out}")
     plt.close()
 
 
+def print_paired_summary(paired: pd.DataFrame):
+    """Print each policy pair once (A listed before B in POLICY_ORDER)."""
+    order = {p: i for i, p in enumerate(POLICY_ORDER)}
+    once = paired[[order.get(a, 999) < order.get(b, 999) or (a not in order and b not in order and a < b)
+                   for a, b in zip(paired['policyA'], paired['policyB'])]]
+    print("\nPaired differences (A − B, within runIndex):")
+    for metric, rows in once.groupby('metric', sort=False):
+        scale = 1.0 if metric == 'avgFreshness' else 100.0
+        print(f"  {metric}:")
+        for _, row in rows.iterrows():
+            p_text = 'p<0.001' if row['pValue'] < 0.001 else f"p={row['pValue']:.2g}"
+            print(f"    {row['policyA']:>13} − {row['policyB']:<13} {row['meanDiff'] * scale:+8.3f} "
+                  f"[{row['ciLo'] * scale:+.3f}, {row['ciHi'] * scale:+.3f}]  "
+                  f"{p_text}{significance_stars(row['pValue'])}  (n={row['runs']})")
+
+
+def load_inputs(csv_file: str, args) -> pd.DataFrame:
+    """Load the export for plan_jobs()."""
+    print(f"Loading: {csv_file}")
+    with profile_stage('load', csv_file):
+        df = load_data(csv_file)
+    print(f"Rows: {len(df)} | Policies: {', '.join(sorted(df['policy'].unique()))}")
+    return df
+
+
+def add_arguments(parser):
+    """Options specific to this analysis (also used by aware_plots.py)."""
+    parser.add_argument('--ci', choices=BOOTSTRAP_METHODS,
+                        help='Show bootstrap confidence intervals of the mean instead of ± std')
+    parser.add_argument('--resamples', type=int, default=10000,
+                        help='Bootstrap resamples per policy for --ci (default: 10000)')
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE,
+                        help=f'Confidence level for --ci (default: {DEFAULT_CONFIDENCE})')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Bootstrap seed for --ci (default: 0)')
+    parser.add_argument('--no-paired', dest='paired', action='store_false',
+                        help='Skip the paired policy-difference analysis keyed on runIndex')
+
+
+def plan_jobs(df: pd.DataFrame, args, output_prefix: str, inputs) -> RenderPlan:
+    """Aggregate per policy (and paired by runIndex) and list the figure jobs."""
+    if args.resamples < 1 or not 0 < args.confidence < 1:
+        print("Error: --resamples must be positive and --confidence between 0 and 1")
+        sys.exit(1)
+
+    with profile_stage('aggregate', 'aggregate_by_policy'):
+        agg = aggregate_by_policy(df, ci=args.ci, n_resamples=args.resamples, confidence=args.confidence,
+                                  seed=args.seed, jobs=args.jobs)
+    ci_label = None
+    if args.ci:
+        ci_label = f"{args.confidence:.0%} {'BCa' if args.ci == 'bca' else 'percentile'} bootstrap CI"
+        print(f"Computed per-policy means/std and {ci_label}s ({args.resamples} resamples).")
+    else:
+        print("Computed per-policy means/std.")
+
+    paired = None
+    if args.paired and 'runIndex' in df.columns:
+        with profile_stage('aggregate', 'paired_differences'):
+            paired = paired_differences(df, agg['policy'].tolist(), n_resamples=args.resamples,
+                                        confidence=args.confidence, method=args.ci or 'percentile',
+                                        seed=args.seed)
+        print_paired_summary(paired)
+    elif args.paired:
+        print("Note: no runIndex column; skipping paired analysis")
+
+    ci_kwargs = {'ci_label': ci_label}
+    jobs = [
+        (plot_core_bars, (agg, output_prefix, args.format), ci_kwargs),
+        (plot_core_lines, (agg, output_prefix, args.format), ci_kwargs),
+        (plot_violins, (df, output_prefix, args.format)),
+        (plot_ecdf_grid, (df, output_prefix, args.format)),
+        (plot_summary_table, (agg, output_prefix, args.format), ci_kwargs),
+    ]
+    if paired is not None:
+        paired_label = f"{args.confidence:.0%} {'BCa' if args.ci == 'bca' else 'percentile'} paired bootstrap CI"
+        jobs.append((plot_paired_matrix, (paired, output_prefix, args.format), {'ci_label': paired_label}))
+    cache = BuildCache(inputs, output_prefix, force=args.force,
+                       options={'ci': args.ci, 'resamples': args.resamples,
+                                'confidence': args.confidence, 'seed': args.seed})
+    shared = [df, agg] if paired is None else [df, agg, paired]
+    return RenderPlan(jobs, shared, cache)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Summarize randomized comparisons into average policy performance figures',
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog='Example: python plot_randomized_overall.py data/randomized-comparison-123.csv --output figures/randomized --format png'
+        epilog="""
+Examples:
+  python plot_randomized_overall.py data/randomized-comparison-123.csv --output figures/randomized --format png
+
+  # 95% BCa bootstrap confidence intervals instead of ± std
+  python plot_randomized_overall.py data/randomized-comparison-123.csv --ci bca --resamples 10000
+
+  # Skip the paired (within-runIndex) policy comparison
+  python plot_randomized_overall.py data/randomized-comparison-123.csv --no-paired
+        """
     )
     parser.add_argument('csv_file', help='Path to a randomized-comparison CSV file')
     parser.add_argument('--output', '-o', help='Output file prefix (default: based on input)')
-    parser.add_argument('--format', '-f', choices=['png', 'pdf', 'svg'], default='png')
+    add_format_argument(parser, '--format', '-f')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='Number of worker processes for bootstrapping and rendering figures (default: one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render every figure even if its inputs are unchanged')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print wall/CPU time and peak memory for each load/validate/aggregate/render/save stage')
+    parser.add_argument('--profile-json', metavar='FILE',
+                        help='Also write the --profile report to FILE as JSON (implies --profile)')
+    add_arguments(parser)
     args = parser.parse_args()
+    if args.profile or args.profile_json:
+        enable_profiling()
 
     output_prefix = args.output if args.output else Path(args.csv_file).stem
-    print(f"Loading: {args.csv_file}")
-    df = load_data(args.csv_file)
-    print(f"Rows: {len(df)} | Policies: {', '.join(sorted(df['policy'].unique()))}")
-
-    agg = aggregate_by_policy(df)
-    print("Computed per-policy means/std.")
-
-    plot_core_bars(agg, output_prefix, args.format)
-    plot_core_lines(agg, output_prefix, args.format)
-    plot_violins(df, output_prefix, args.format)
-    plot_ecdf_grid(df, output_prefix, args.format)
-    plot_summary_table(agg, output_prefix, args.format)
+    df = load_inputs(args.csv_file, args)
+    plan = plan_jobs(df, args, output_prefix, [args.csv_file])
+    results = run_render_plans([plan], n_jobs=args.jobs, formats=args.formats)
+    report_profile(args.profile_json)
+    if report_render_results(results):
+        sys.exit(1)
 
     print("\nAll randomized overall figures generated.")
 
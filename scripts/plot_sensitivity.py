@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Hyperparameter sensitivity of randomized multi-policy runs.
+
+The randomized-comparison export (exportRandomizedMultiPolicyCSV) draws the
+PAFTinyLFU knobs (pfExplorationEpsilon, pfHashBuckets, pfTemperature, pfDecay,
+pfLearningRate, pfRegularization) and the scoring weights (wS, wU, wF)
+independently per run. Because the knobs are drawn independently, binned
+marginal means of a metric over one knob estimate its partial dependence,
+and three summaries per (policy, metric, knob) show which knobs matter:
+
+- partial dependence: metric mean ± CI per knob bin (quantile bins for
+  continuous knobs, one bin per value for discrete ones like pfHashBuckets)
+- Spearman rank correlation between knob and metric (monotone effects)
+- variance-based importance: the share of metric variance explained by the
+  binned knob (one-way ANOVA epsilon², the bias-adjusted correlation ratio,
+  i.e. a first-order Sobol index estimate), which also catches non-monotone
+  effects that rank correlation misses
+
+All three come from one bincount over (policy, bin) codes per knob, and the
+rank correlations from one ranking pass, so 10^6-row exports take seconds.
+
+Usage:
+    python plot_sensitivity.py data/randomized-comparison-123.csv [--policies PAFTinyLFU]
+    python plot_sensitivity.py data/randomized-comparison-123.csv --policies all \\
+        --metrics cacheHitRate,deliveryRate,actionabilityFirstRatio --bins 12
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+from common import (POLICY_COLORS, POLICY_MARKERS, POLICY_ORDER, read_csv_cached, save_figure,
+                    run_render_plans, report_render_results, BuildCache, RenderPlan, enable_profiling,
+                    profile_stage, report_profile, t_critical, DEFAULT_CONFIDENCE,
+                    add_format_argument)
+
+PF_KNOBS = ['pfExplorationEpsilon', 'pfHashBuckets', 'pfTemperature', 'pfDecay',
+            'pfLearningRate', 'pfRegularization']
+WEIGHT_KNOBS = ['wS', 'wU', 'wF']
+DEFAULT_KNOBS = PF_KNOBS + WEIGHT_KNOBS
+
+DEFAULT_METRICS = ['cacheHitRate', 'deliveryRate']
+DEFAULT_POLICIES = ['PAFTinyLFU']
+DEFAULT_BINS = 10
+
+METRIC_LABELS = {
+    'cacheHitRate': 'Cache Hit Rate',
+    'deliveryRate': 'Delivery Rate',
+    'actionabilityFirstRatio': 'Actionability-First',
+    'timelinessConsistency': 'Timeliness Consistency',
+    'avgFreshness': 'Avg Freshness',
+    'staleAccessRate': 'Stale Access Rate',
+}
+
+
+def load_data(csv_path: str) -> pd.DataFrame:
+    try:
+        df = read_csv_cached(csv_path)
+    except FileNotFoundError:
+        print(f"Error: file not found: {csv_path}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error loading CSV: {e}")
+        sys.exit(1)
+
+    if 'policy' not in df.columns:
+        print("Error: CSV missing required 'policy' column")
+        sys.exit(1)
+    return df
+
+
+def knob_bins(values: np.ndarray, n_bins: int):
+    """Bin codes (-1 for NaN), bin centers and edges for one knob.
+
+    Knobs with at most ``n_bins`` distinct values get one bin per value;
+    continuous knobs get quantile bins, so every bin holds about the same
+    number of runs and skewed draws (e.g. log-uniform rates) stay resolved.
+    """
+    finite = values[~np.isnan(values)]
+    distinct = np.unique(finite)
+    if len(distinct) <= n_bins:
+        codes = np.searchsorted(distinct, values)
+        codes[np.isnan(values)] = -1
+        return codes, distinct.astype(float), np.column_stack([distinct, distinct]).astype(float)
+
+    edges = np.unique(np.quantile(finite, np.linspace(0, 1, n_bins + 1)))
+    codes = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 2)
+    codes[np.isnan(values)] = -1
+    sums = np.bincount(codes[codes >= 0], weights=values[codes >= 0], minlength=len(edges) - 1)
+    counts = np.bincount(codes[codes >= 0], minlength=len(edges) - 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        centers = np.where(counts > 0, sums / counts, (edges[:-1] + edges[1:]) / 2)
+    return codes, centers, np.column_stack([edges[:-1], edges[1:]])
+
+
+def sensitivity_analysis(df: pd.DataFrame, policies: Sequence[str], knobs: Sequence[str],
+                         metrics: Sequence[str], n_bins: int = DEFAULT_BINS,
+                         confidence: float = DEFAULT_CONFIDENCE):
+    """Partial-dependence bins and per-knob summaries for every (policy, metric, knob).
+
+    Returns ``(curves, summary)``. ``curves`` has one row per (policy,
+    metric, knob, bin) with the bin's center, edges, run count, metric mean
+    and CI half-width. ``summary`` has one row per (policy, metric, knob)
+    with the Spearman correlation, the variance-based importance (share of
+    metric variance explained by the binned knob, bias-adjusted and clipped
+    at 0) and the partial-dependence range (max − min bin mean).
+    """
+    data = df[df['policy'].isin(policies)]
+    policy_codes = pd.Categorical(data['policy'], categories=list(policies)).codes.astype(np.int64)
+    n_pol = len(policies)
+    y_all = data[list(metrics)].to_numpy(dtype=float)
+
+    # Spearman: Pearson correlation of average ranks, one ranking pass per policy
+    ranked = data[list(knobs) + list(metrics)].groupby(data['policy'].to_numpy()).rank()
+    spearman = {}
+    for policy, rows in ranked.groupby(data['policy'].to_numpy()):
+        corr = rows.corr()
+        for metric in metrics:
+            for knob in knobs:
+                spearman[(policy, metric, knob)] = corr.at[knob, metric]
+
+    curve_parts, summary_rows = [], []
+    for knob in knobs:
+        codes, centers, edges = knob_bins(data[knob].to_numpy(dtype=float), n_bins)
+        n_bin = len(centers)
+        for m_idx, metric in enumerate(metrics):
+            y = y_all[:, m_idx]
+            valid = (codes >= 0) & ~np.isnan(y)
+            cell = policy_codes[valid] * n_bin + codes[valid]
+            yv = y[valid]
+            size = n_pol * n_bin
+            count = np.bincount(cell, minlength=size).reshape(n_pol, n_bin).astype(float)
+            total = np.bincount(cell, weights=yv, minlength=size).reshape(n_pol, n_bin)
+            square = np.bincount(cell, weights=yv * yv, minlength=size).reshape(n_pol, n_bin)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = total / count
+                var = np.maximum(square - count * mean ** 2, 0) / (count - 1)
+                err = t_critical(count - 1, confidence) * np.sqrt(var / count)
+
+                # One-way ANOVA per policy: between-bin vs total sum of squares
+                n = count.sum(axis=1)
+                grand = total.sum(axis=1) / n
+                sst = square.sum(axis=1) - n * grand ** 2
+                ssb = np.nansum(count * (mean - grand[:, None]) ** 2, axis=1)
+                groups = np.sum(count > 0, axis=1)
+                msw = (sst - ssb) / (n - groups)
+                importance = np.clip((ssb - (groups - 1) * msw) / sst, 0, 1)
+                pd_range = np.nanmax(mean, axis=1, initial=-np.inf) - np.nanmin(mean, axis=1, initial=np.inf)
+            pd_range = np.where(np.isfinite(pd_range), pd_range, np.nan)
+
+            curve_parts.append(pd.DataFrame({
+                'policy': np.repeat(list(policies), n_bin),
+                'metric': metric,
+                'knob': knob,
+                'bin': np.tile(np.arange(n_bin), n_pol),
+                'center': np.tile(centers, n_pol),
+                'lo': np.tile(edges[:, 0], n_pol),
+                'hi': np.tile(edges[:, 1], n_pol),
+                'runs': count.ravel().astype(int),
+                'mean': mean.ravel(),
+                'err': np.nan_to_num(err.ravel()),
+            }))
+            for p_idx, policy in enumerate(policies):
+                summary_rows.append((policy, metric, knob, int(n[p_idx]), spearman.get((policy, metric, knob), np.nan),
+                                     importance[p_idx], pd_range[p_idx]))
+
+    curves = pd.concat(curve_parts, ignore_index=True) if curve_parts else pd.DataFrame()
+    curves = curves[curves['runs'] > 0].reset_index(drop=True) if len(curves) else curves
+    summary = pd.DataFrame(summary_rows, columns=['policy', 'metric', 'knob', 'runs', 'spearman',
+                                                  'importance', 'pdRange'])
+    return curves, summary
+
+
+def is_percent_metric(metric: str) -> bool:
+    return metric != 'avgFreshness'
+
+
+def plot_partial_dependence(curves: pd.DataFrame, summary: pd.DataFrame, metric: str,
+                            output_prefix: str, file_format: str = 'png'):
+    """Grid of binned partial-dependence curves, one panel per knob, one line per policy."""
+    import matplotlib.pyplot as plt
+
+    data = curves[curves['metric'] == metric]
+    if data.empty:
+        return
+    knobs = list(dict.fromkeys(data['knob']))
+    policies = list(dict.fromkeys(data['policy']))
+    scale = 100.0 if is_percent_metric(metric) else 1.0
+    label = METRIC_LABELS.get(metric, metric)
+
+    n_cols = min(3, len(knobs))
+    n_rows = (len(knobs) + n_cols - 1) // n_cols
+    fig, axes = plt.subplots(n_rows, n_cols, figsize=(5.2 * n_cols, 3.8 * n_rows), squeeze=False, sharey=True)
+    axes = axes.flatten()
+    stats = summary[summary['metric'] == metric].set_index(['policy', 'knob'])
+
+    for ax, knob in zip(axes, knobs):
+        for policy in policies:
+            rows = data[(data['knob'] == knob) & (data['policy'] == policy)]
+            if rows.empty:
+                continue
+            color = POLICY_COLORS.get(policy, '#6b7280')
+            x = rows['center'].to_numpy()
+            y = rows['mean'].to_numpy() * scale
+            e = rows['err'].to_numpy() * scale
+            ax.plot(x, y, color=color, marker=POLICY_MARKERS.get(policy, 'o'), markersize=4,
+                    linewidth=2, label=policy)
+            ax.fill_between(x, y - e, y + e, color=color, alpha=0.15, linewidth=0)
+        bins = data[data['knob'] == knob].drop_duplicates('bin')
+        if (bins['lo'] == bins['hi']).all():
+            # Discrete knob: tick every value, log-spaced when it spans a decade (pfHashBuckets)
+            values = bins['center'].to_numpy()
+            if (values > 0).all() and values.max() / values.min() >= 10:
+                ax.set_xscale('log', base=2)
+            ax.set_xticks(values)
+            ax.set_xticklabels([f'{v:g}' for v in values])
+            ax.minorticks_off()
+        if len(policies) == 1:
+            s = stats.loc[(policies[0], knob)]
+            ax.set_title(f"{knob}\nimportance {s['importance']:.1%} · ρ={s['spearman']:+.2f}",
+                         fontsize=10, fontweight='bold')
+        else:
+            ax.set_title(knob, fontsize=10, fontweight='bold')
+        ax.set_xlabel(knob)
+        ax.grid(True, alpha=0.3, linestyle='--')
+    for ax in axes[::n_cols]:
+        ax.set_ylabel(f"{label}{' (%)' if scale == 100.0 else ''}")
+    for ax in axes[len(knobs):]:
+        ax.axis('off')
+    if len(policies) > 1:
+        axes[0].legend(loc='best', fontsize=8)
+
+    runs = int(summary.loc[summary['metric'] == metric, 'runs'].max())
+    fig.suptitle(f"Partial Dependence of {label} on Policy Knobs ({', '.join(policies)}; "
+                 f"binned means ± CI, n={runs} runs)", fontsize=13, fontweight='bold', y=0.995)
+    plt.tight_layout(rect=[0, 0, 1, 0.97])
+    out = f"{output_prefix}_sensitivity_pd_{metric}.{file_format}"
+    save_figure(out, bbox_inches='tight', facecolor='white')
+    print(f"Saved: {out}")
+    plt.close()
+
+
+def plot_importance(summary: pd.DataFrame, output_prefix: str, file_format: str = 'png'):
+    """Variance-based importance (bars) and Spearman correlation (heatmap) per knob and metric."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    if summary.empty:
+        return
+    metrics = list(dict.fromkeys(summary['metric']))
+    policies = list(dict.fromkeys(summary['policy']))
+    knobs = list(dict.fromkeys(summary['knob']))
+
+    fig, axes = plt.subplots(len(policies), 2, figsize=(15, 0.45 * len(knobs) * len(policies) + 2.5),
+                             squeeze=False, gridspec_kw={'width_ratios': [3, 2]})
+    for p_idx, policy in enumerate(policies):
+        ax_bar, ax_heat = axes[p_idx]
+        rows = summary[summary['policy'] == policy]
+        importance = rows.pivot(index='knob', columns='metric', values='importance').reindex(index=knobs,
+                                                                                                columns=metrics)
+        # Most important knobs (by their largest effect on any metric) on top
+        order = importance.max(axis=1).sort_values().index
+        importance = importance.loc[order]
+        y = np.arange(len(order))
+        height = 0.8 / len(metrics)
+        palette = sns.color_palette('Set2', len(metrics))
+        for m_idx, metric in enumerate(metrics):
+            ax_bar.barh(y + (m_idx - (len(metrics) - 1) / 2) * height, importance[metric] * 100, height,
+                        label=METRIC_LABELS.get(metric, metric), color=palette[m_idx], edgecolor='black',
+                        linewidth=0.4)
+        ax_bar.set_yticks(y)
+        ax_bar.set_yticklabels(order)
+        ax_bar.set_xlabel('Variance explained (%)')
+        ax_bar.set_title(f'{policy}: variance-based importance', fontweight='bold')
+        ax_bar.grid(axis='x', alpha=0.3, linestyle='--')
+        ax_bar.legend(loc='lower right', fontsize=8)
+
+        rho = rows.pivot(index='knob', columns='metric', values='spearman').reindex(index=order[::-1],
+                                                                                    columns=metrics)
+        im = ax_heat.imshow(rho.to_numpy(dtype=float), cmap='RdBu', vmin=-1, vmax=1, aspect='auto')
+        for i in range(rho.shape[0]):
+            for j in range(rho.shape[1]):
+                value = rho.iat[i, j]
+                if not np.isnan(value):
+                    ax_heat.text(j, i, f'{value:+.2f}', ha='center', va='center', fontsize=8,
+                                 color='white' if abs(value) > 0.6 else 'black')
+        ax_heat.set_xticks(np.arange(len(metrics)))
+        ax_heat.set_xticklabels([METRIC_LABELS.get(m, m) for m in metrics], rotation=15, ha='right')
+        ax_heat.set_yticks(np.arange(len(order)))
+        ax_heat.set_yticklabels(order[::-1])
+        ax_heat.grid(False)
+        ax_heat.set_title(f'{policy}: Spearman ρ', fontweight='bold')
+        plt.colorbar(im, ax=ax_heat, fraction=0.046, pad=0.04)
+
+    fig.suptitle('Which Knobs Move the Metrics? (randomized runs)', fontsize=14, fontweight='bold', y=0.995)
+    plt.tight_layout(rect=[0, 0, 1, 0.97])
+    out = f"{output_prefix}_sensitivity_importance.{file_format}"
+    save_figure(out, bbox_inches='tight', facecolor='white')
+    print(f"Saved: {out}")
+    plt.close()
+
+
+def print_summary(summary: pd.DataFrame):
+    print("\n" + "=" * 70)
+    print("HYPERPARAMETER SENSITIVITY")
+    print("=" * 70)
+    for (policy, metric), rows in summary.groupby(['policy', 'metric'], sort=False):
+        scale = 100.0 if is_percent_metric(metric) else 1.0
+        unit = 'pp' if scale == 100.0 else ''
+        print(f"\n{policy} — {metric} (n={rows['runs'].max()} runs):")
+        print(f"  {'knob':<22}{'importance':>11}{'spearman':>10}{'PD range':>12}")
+        for _, row in rows.sort_values('importance', ascending=False).iterrows():
+            print(f"  {row['knob']:<22}{row['importance']:>10.2%}{row['spearman']:>+10.3f}"
+                  f"{row['pdRange'] * scale:>10.2f}{unit}")
+    print("\n" + "=" * 70)
+
+
+def parse_list(spec: str) -> List[str]:
+    return [part.strip() for part in spec.split(',') if part.strip()]
+
+
+def load_inputs(csv_file: str, args) -> pd.DataFrame:
+    """Load the export for plan_jobs()."""
+    print(f"Loading: {csv_file}")
+    with profile_stage('load', csv_file):
+        return load_data(csv_file)
+
+
+def add_arguments(parser):
+    """Options specific to this analysis (also used by aware_plots.py)."""
+    parser.add_argument('--policies', default=','.join(DEFAULT_POLICIES),
+                        help=f"Comma-separated policies, or 'all' (default: {','.join(DEFAULT_POLICIES)})")
+    parser.add_argument('--metrics', default=','.join(DEFAULT_METRICS),
+                        help=f"Comma-separated metrics (default: {','.join(DEFAULT_METRICS)})")
+    parser.add_argument('--knobs', default=','.join(DEFAULT_KNOBS),
+                        help='Comma-separated knob columns (default: the pf* knobs and wS,wU,wF)')
+    parser.add_argument('--bins', type=int, default=DEFAULT_BINS,
+                        help=f'Quantile bins per continuous knob (default: {DEFAULT_BINS})')
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE,
+                        help=f'Confidence level of the partial-dependence bands (default: {DEFAULT_CONFIDENCE})')
+
+
+def plan_jobs(df: pd.DataFrame, args, output_prefix: str, inputs) -> RenderPlan:
+    """Validate the selection, run the sensitivity analysis and list the figure jobs."""
+    with profile_stage('validate'):
+        available = list(pd.unique(df['policy']))
+        if args.policies.strip().lower() == 'all':
+            policies = [p for p in POLICY_ORDER if p in available] + [p for p in available if p not in POLICY_ORDER]
+        else:
+            policies = parse_list(args.policies)
+        missing_policies = [p for p in policies if p not in available]
+        if missing_policies:
+            print(f"Error: Policies not in CSV: {missing_policies}. Available: {', '.join(available)}")
+            sys.exit(1)
+        metrics = parse_list(args.metrics)
+        knobs = parse_list(args.knobs)
+        missing = [c for c in metrics + knobs if c not in df.columns]
+        if missing:
+            print(f"Error: Missing columns: {missing} (is this a randomized-comparison export?)")
+            sys.exit(1)
+        if args.bins < 2:
+            print("Error: --bins must be at least 2")
+            sys.exit(1)
+    print(f"Rows: {len(df)} | Policies: {', '.join(policies)} | Knobs: {len(knobs)} | Metrics: {', '.join(metrics)}")
+
+    with profile_stage('aggregate', 'sensitivity_analysis'):
+        curves, summary = sensitivity_analysis(df, policies, knobs, metrics, args.bins, args.confidence)
+    print_summary(summary)
+
+    jobs = [(plot_partial_dependence, (curves, summary, metric, output_prefix, args.format)) for metric in metrics]
+    jobs.append((plot_importance, (summary, output_prefix, args.format)))
+    cache = BuildCache(inputs, output_prefix, force=args.force,
+                       options={'policies': policies, 'metrics': metrics, 'knobs': knobs,
+                                'bins': args.bins, 'confidence': args.confidence})
+    return RenderPlan(jobs, [curves, summary], cache)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Hyperparameter sensitivity (partial dependence, rank correlation, importance) '
+                    'of randomized multi-policy runs',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Which pf*/w* knobs move PAFTinyLFU's hit rate and delivery rate
+  python plot_sensitivity.py data/randomized-comparison-123.csv
+
+  # All policies, more metrics, finer bins, PDF output
+  python plot_sensitivity.py data/randomized-comparison-123.csv --policies all \\
+      --metrics cacheHitRate,deliveryRate,actionabilityFirstRatio --bins 12 --format pdf
+        """
+    )
+    parser.add_argument('csv_file', help='Path to a randomized-comparison CSV file')
+    parser.add_argument('--output', '-o', help='Output file prefix (default: based on input)')
+    add_format_argument(parser, '--format', '-f')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='Number of worker processes for rendering figures (default: one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render every figure even if its inputs are unchanged')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print wall/CPU time and peak memory for each load/validate/aggregate/render/save stage')
+    parser.add_argument('--profile-json', metavar='FILE',
+                        help='Also write the --profile report to FILE as JSON (implies --profile)')
+    add_arguments(parser)
+    args = parser.parse_args()
+    if args.profile or args.profile_json:
+        enable_profiling()
+
+    output_prefix = args.output if args.output else Path(args.csv_file).stem
+    df = load_inputs(args.csv_file, args)
+    plan = plan_jobs(df, args, output_prefix, [args.csv_file])
+    results = run_render_plans([plan], n_jobs=args.jobs, formats=args.formats)
+    report_profile(args.profile_json)
+    if report_render_results(results):
+        sys.exit(1)
+
+    print("\nAll sensitivity figures generated.")
+
+
+if __name__ == '__main__':
+    main()
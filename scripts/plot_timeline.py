@@ -3,42 +3,66 @@
 Plot multi-policy timeline comparison from CSV file.
 
 Usage:
-    python plot_timeline.py data/multi-policy-timeline-TIMESTAMP.csv [--output OUTPUT_FILE] [--format png|pdf|svg]
+    python plot_timeline.py data/multi-policy-timeline-TIMESTAMP.csv [--output OUTPUT_FILE] [--format png,pdf,svg] [--stream]
+                            [--max-points N] [--downsample lttb|minmax]
+    python plot_timeline.py run-*.csv [--band 10,90]
+    python plot_timeline.py data/multi-policy-timeline-TIMESTAMP.csv [--window 500|600s] [--ewma]
+
+Several CSVs (or one CSV with a 'seed' column) are treated as replicate runs:
+each run is interpolated onto a shared time grid and the plots show the
+per-policy median with a percentile band.
 
 This script generates:
 1. Hit rate over time comparison
 2. Cache size evolution
 3. Hits vs Misses over time
 4. Combined performance metrics
+5. Windowed hit rate (from differences of the cumulative hits/misses counters)
 """
 
 import argparse
 import sys
 from pathlib import Path
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
-from common import POLICY_COLORS, POLICY_LINESTYLES
-
-# Set style
-sns.set_style("whitegrid")
-plt.rcParams['figure.dpi'] = 150
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['font.size'] = 10
-plt.rcParams['axes.labelsize'] = 11
-plt.rcParams['axes.titlesize'] = 12
-plt.rcParams['legend.fontsize'] = 9
+from common import (POLICY_COLORS, POLICY_LINESTYLES, read_csv_cached, save_figure,
+                    run_render_plans, report_render_results, BuildCache, RenderPlan, enable_profiling,
+                    profile_stage, report_profile, DOWNSAMPLE_METHODS, DOWNSAMPLERS, MSER_BATCH,
+                    mser_truncation, add_format_argument)
 
 # Unified colors and linestyles are imported from common.py
 
+# --stream settings: rows parsed per chunk and samples kept per policy for plotting
+STREAM_CHUNKSIZE = 250_000
+STREAM_MAX_POINTS = 5000
+
+REQUIRED_COLUMNS = ['policy', 'time', 'cacheSize', 'hits', 'misses', 'hitRate']
+
+# Points drawn per policy line by default (--max-points)
+PLOT_MAX_POINTS = 4000
+
+# Series whose shape the downsampled frame must preserve
+DOWNSAMPLE_COLUMNS = ['hitRate', 'hitRateSmooth', 'hitRateWindow', 'requestRate', 'cacheSize', 'hits', 'misses']
+
+# Multi-run input: column identifying the run within one CSV, the default
+# percentile band, and the cap on shared time grid points
+RUN_COLUMN = 'seed'
+DEFAULT_BAND = (10.0, 90.0)
+GRID_MAX_POINTS = 20_000
+VALUE_COLUMNS = ['hitRate', 'cacheSize', 'hits', 'misses']
+BAND_COLUMNS = ['hitRate_lo', 'hitRate_hi', 'hitRateSmooth_lo', 'hitRateSmooth_hi',
+                'hitRateWindow_lo', 'hitRateWindow_hi']
+
+# Windowed rates from the cumulative counters (--window/--ewma); without
+# --window the window is 1% of each series' samples, like the smoothing
+WINDOW_COLUMNS = ['hitRateWindow', 'requestRate']
+
 
 def load_data(csv_path):
     """Load and validate the CSV data."""
     try:
-        df = pd.read_csv(csv_path)
-        required_cols = ['policy', 'time', 'cacheSize', 'hits', 'misses', 'hitRate']
-        missing = [col for col in required_cols if col not in df.columns]
+        df = read_csv_cached(csv_path)
+        missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
         if missing:
             print(f"Error: Missing required columns: {missing}")
             sys.exit(1)
@@ -51,8 +75,405 @@ def load_data(csv_path):
         sys.exit(1)
 
 
-def plot_hit_rate_over_time(df, output_prefix, format='png'):
-    """Plot hit rate evolution over time for all policies."""
+def load_runs(csv_paths):
+    """Load one or more timeline CSVs as replicate runs.
+
+    Each file is a run, unless a single file has a 'seed' column with several
+    values, in which case each seed is a run. With more than one run the frame
+    gets a 'run' column; a single run loads exactly like load_data().
+    """
+    frames = [load_data(path) for path in csv_paths]
+    if len(frames) == 1:
+        df = frames[0]
+        if RUN_COLUMN in df.columns and df[RUN_COLUMN].nunique() > 1:
+            return df.assign(run=df[RUN_COLUMN].astype(str))
+        return df
+    return pd.concat([frame.assign(run=str(i)) for i, frame in enumerate(frames)], ignore_index=True)
+
+
+def interp_runs(run, t, y, grid):
+    """Linear interpolation of every run onto ``grid`` in one pass.
+
+    ``run`` holds integer codes 0..R-1 and rows are sorted by (run, t); ``y``
+    is (n,) or (n, k). Returns (R, len(grid)[, k]), equal to np.interp per run
+    (constant beyond a run's ends). Offsetting each run's times by run * span
+    makes one searchsorted over the concatenated series locate every
+    bracketing pair, so the cost does not grow with a Python loop over runs.
+    """
+    t0 = min(t.min(), grid.min())
+    span = max(t.max(), grid.max()) - t0 + 1.0
+    runs = np.arange(run.max() + 1)
+    starts = np.searchsorted(run, runs)[:, None]
+    ends = np.searchsorted(run, runs, side='right')[:, None]
+
+    key = run * span + (t - t0)
+    query = runs[:, None] * span + (grid - t0)[None, :]
+    hi = np.minimum(np.maximum(np.searchsorted(key, query, side='right'), starts + 1), ends - 1)
+    lo = np.maximum(hi - 1, starts)
+    gap = t[hi] - t[lo]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        w = np.clip(np.where(gap > 0, (grid[None, :] - t[lo]) / gap, 0.0), 0.0, 1.0)
+    if y.ndim == 2:
+        w = w[..., None]
+    return y[lo] + w * (y[hi] - y[lo])
+
+
+def run_quantiles(values, levels):
+    """Quantiles over the run axis (axis 0), ignoring NaNs.
+
+    np.nanquantile works slice by slice and is orders of magnitude slower than
+    np.quantile on the (runs × grid) arrays, so it is only used on the grid
+    points that have NaNs; points that are NaN in every run stay NaN.
+    """
+    flat = values.reshape(len(values), -1)
+    out = np.full((len(levels), flat.shape[1]), np.nan)
+    nan = np.isnan(flat)
+    clean = ~nan.any(axis=0)
+    out[:, clean] = np.quantile(flat[:, clean], levels, axis=0)
+    partial = nan.any(axis=0) & ~nan.all(axis=0)
+    if partial.any():
+        out[:, partial] = np.nanquantile(flat[:, partial], levels, axis=0)
+    return out.reshape((len(levels),) + values.shape[1:])
+
+
+def aggregate_runs(df, band=DEFAULT_BAND, grid_points=None):
+    """Per-policy median and percentile band across runs on a shared time grid.
+
+    The grid spans the time range every run covers, with as many points as
+    the median run has samples (capped at GRID_MAX_POINTS). The smoothed hit
+    rate is taken per run on the grid before the quantiles, so its band
+    reflects run-to-run spread rather than smoothing of the median.
+
+    Returns a frame with the load_data() columns holding medians, plus
+    'hitRateSmooth', the BAND_COLUMNS and 'runs'. WINDOW_COLUMNS present in
+    ``df`` (computed per run by add_window_columns) are carried the same way.
+    """
+    columns = VALUE_COLUMNS + [col for col in WINDOW_COLUMNS if col in df.columns]
+    # Keep policies in file order while grouping each policy's runs together
+    order = pd.factorize(df['policy'])[0]
+    df = df.assign(_order=order).sort_values(['_order', 'run', 'time'], kind='stable')
+    bounds = df.groupby(['policy', 'run'], sort=False)['time'].agg(['min', 'max', 'size'])
+    start, end = bounds['min'].max(), bounds['max'].min()
+    if end <= start:
+        print("Error: Runs do not share a common time range")
+        sys.exit(1)
+    n_grid = grid_points or int(min(GRID_MAX_POINTS, max(2, bounds['size'].median())))
+    grid = np.linspace(start, end, n_grid)
+    levels = [band[0] / 100, 0.5, band[1] / 100]
+
+    parts = []
+    for policy, policy_data in df.groupby('policy', sort=False):
+        run = pd.factorize(policy_data['run'])[0]
+        values = interp_runs(run, policy_data['time'].to_numpy(dtype=float),
+                             policy_data[columns].to_numpy(dtype=float), grid)
+        hit_rate = values[..., 0]
+        window = max(1, n_grid // 100)
+        smooth = pd.DataFrame(hit_rate.T).rolling(window=window, center=True).mean().to_numpy().T
+        q = run_quantiles(values, levels)
+        q_smooth = run_quantiles(smooth, levels)
+        frame = pd.DataFrame(q[1], columns=columns)
+        frame.insert(0, 'time', grid)
+        frame.insert(0, 'policy', policy)
+        frame['hitRateSmooth'] = q_smooth[1]
+        frame['hitRate_lo'], frame['hitRate_hi'] = q[0][:, 0], q[2][:, 0]
+        frame['hitRateSmooth_lo'], frame['hitRateSmooth_hi'] = q_smooth[0], q_smooth[2]
+        if 'hitRateWindow' in columns:
+            at = columns.index('hitRateWindow')
+            frame['hitRateWindow_lo'], frame['hitRateWindow_hi'] = q[0][:, at], q[2][:, at]
+        frame['runs'] = run.max() + 1
+        parts.append(frame)
+    return pd.concat(parts, ignore_index=True)
+
+
+def parse_band(spec):
+    """``'10,90'`` -> (10.0, 90.0)."""
+    lo, hi = (float(v) for v in spec.split(','))
+    if not 0 <= lo < 50 < hi <= 100:
+        raise ValueError(spec)
+    return lo, hi
+
+
+def parse_window(spec):
+    """``'500'`` -> (500.0, 'samples'); ``'600s'`` -> (600.0, 'seconds')."""
+    unit = 'samples'
+    if spec.endswith('s'):
+        spec, unit = spec[:-1], 'seconds'
+    value = float(spec)
+    if value <= 0:
+        raise ValueError(spec)
+    return value, unit
+
+
+def window_label(window, ewma=False):
+    """Human-readable description of a parse_window() result for titles."""
+    if window is None:
+        text = '1% of samples'
+    else:
+        value, unit = window
+        text = f"{value:g} s" if unit == 'seconds' else f"{value:g} samples"
+    return f"EWMA, half-life {text}" if ewma else f"sliding {text}"
+
+
+def windowed_rates(t, hits, misses, window=None, ewma=False):
+    """Windowed hit rate and request rate of one run of one policy.
+
+    ``t``, ``hits`` and ``misses`` are the run's time and cumulative counter
+    arrays, in time order.
+
+    The cumulative hits/misses counters are differenced, so every window
+    costs O(1): a sliding window over the last N samples, or over the last
+    T seconds (the window start is found with one searchsorted, so irregular
+    time spacing is handled), is H[i] - H[start]. With ``ewma`` the per-sample
+    increments are exponentially weighted instead, with ``window`` as the
+    half-life (in seconds, weights follow the actual sample times). The hit
+    rate is the ratio of windowed hits to windowed requests, i.e. weighted by
+    traffic; it is NaN where a window saw no requests.
+
+    Returns:
+        (hit_rate, request_rate) arrays; request_rate is requests per second.
+    """
+    requests = hits + misses
+    n = len(t)
+    if window is None:
+        window = (max(1, n // 100), 'samples')
+    value, unit = window
+
+    if ewma:
+        steps = pd.DataFrame({
+            'hits': np.diff(hits, prepend=0.0),
+            'requests': np.diff(requests, prepend=0.0),
+            'dt': np.diff(t, prepend=t[0] if n else 0.0),
+        })
+        if unit == 'seconds':
+            times = pd.to_datetime(t - t[0], unit='s')
+            smooth = steps.ewm(halflife=pd.Timedelta(seconds=value), times=times).mean()
+        else:
+            smooth = steps.ewm(halflife=value).mean()
+        window_hits, window_requests, span = (smooth[col].to_numpy() for col in ('hits', 'requests', 'dt'))
+    else:
+        if unit == 'seconds':
+            # Last sample at or before t - T; -1 means the window reaches the start
+            start = np.searchsorted(t, t - value, side='right') - 1
+        else:
+            start = np.arange(n) - int(value)
+        before = start >= 0
+        start = np.maximum(start, 0)
+        window_hits = hits - np.where(before, hits[start], 0.0)
+        window_requests = requests - np.where(before, requests[start], 0.0)
+        span = t - np.where(before, t[start], t[0] if n else 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        hit_rate = np.where(window_requests > 0, window_hits / window_requests, np.nan)
+        request_rate = np.where(span > 0, window_requests / span, np.nan)
+    return hit_rate, request_rate
+
+
+def add_window_columns(df, window=None, ewma=False):
+    """Add 'hitRateWindow' and 'requestRate' per policy (and per run)."""
+    keys = ['policy', 'run'] if 'run' in df.columns else ['policy']
+    t = df['time'].to_numpy(dtype=float)
+    hits = df['hits'].to_numpy(dtype=float)
+    misses = df['misses'].to_numpy(dtype=float)
+    hit_rate = np.full(len(df), np.nan)
+    request_rate = np.full(len(df), np.nan)
+    for rows in df.groupby(keys, sort=False).indices.values():
+        hit_rate[rows], request_rate[rows] = windowed_rates(t[rows], hits[rows], misses[rows], window, ewma)
+    return df.assign(hitRateWindow=hit_rate, requestRate=request_rate)
+
+
+def load_data_streaming(csv_path, max_points=STREAM_MAX_POINTS, chunksize=STREAM_CHUNKSIZE):
+    """Reduce a timeline CSV of any length in bounded memory.
+
+    The file is read twice in chunks: a cheap first pass over the 'policy'
+    column counts samples per policy (and rejects a file holding several
+    runs, see load_runs()), and the second pass keeps an evenly
+    strided subset of at most ``max_points`` samples per policy (always
+    including the last, which carries the final cumulative hits/misses).
+    Kept sample i starts block i of ``stride`` rows; the count, mean and M2
+    of the hit rate in every block are accumulated exactly with Chan updates,
+    so once the warm-up is detected on the subsample, stream_moments() gives
+    post-warm-up statistics that do not depend on the subsampling.
+
+    Returns:
+        (df, blocks) where df has the same columns as load_data() and blocks
+        maps policy -> {'count', 'mean', 'm2'} arrays, one entry per block.
+    """
+    try:
+        header = pd.read_csv(csv_path, nrows=0)
+        missing = [col for col in REQUIRED_COLUMNS if col not in header.columns]
+        if missing:
+            print(f"Error: Missing required columns: {missing}")
+            sys.exit(1)
+
+        # The runs of a multi-seed export would be streamed as one series per
+        # policy, so the same pass checks there is only one
+        run_col = [RUN_COLUMN] if RUN_COLUMN in header.columns else []
+        totals = {}
+        runs = set()
+        for chunk in pd.read_csv(csv_path, usecols=['policy'] + run_col, chunksize=chunksize):
+            for policy, n in chunk['policy'].value_counts(sort=False).items():
+                totals[policy] = totals.get(policy, 0) + int(n)
+            if run_col:
+                runs.update(chunk[RUN_COLUMN].dropna().astype(str).unique())
+                if len(runs) > 1:
+                    print(f"Error: --stream reads a single run, but {csv_path} has several "
+                          f"'{RUN_COLUMN}' values; aggregate several runs without --stream")
+                    sys.exit(1)
+
+        strides = {p: max(1, -(-n // max_points)) for p, n in totals.items()}
+        seen = {p: 0 for p in totals}
+        buffers = {}
+        blocks = {p: {key: np.zeros(-(-n // strides[p])) for key in ('count', 'mean', 'm2')}
+                  for p, n in totals.items()}
+
+        for chunk in pd.read_csv(csv_path, usecols=REQUIRED_COLUMNS, chunksize=chunksize):
+            policy_col = chunk['policy']
+            # Position of each row within its policy's full series
+            pos = (policy_col.map(seen).to_numpy() +
+                   chunk.groupby('policy', sort=False).cumcount().to_numpy())
+            stride = policy_col.map(strides).to_numpy()
+            last = policy_col.map(totals).to_numpy() - 1
+            keep = (pos % stride == 0) | (pos == last)
+            for policy, part in chunk[keep].groupby('policy', sort=False):
+                buffers.setdefault(policy, []).append(part)
+
+            # Fold the chunk's per-block moments into the running Chan state;
+            # a block split across chunks is merged like any other pair
+            moments = (chunk[['policy', 'hitRate']].assign(block=pos // stride)
+                       .groupby(['policy', 'block'], sort=False)['hitRate'].agg(['count', 'mean', 'var']))
+            for policy, part in moments.groupby(level='policy', sort=False):
+                acc = blocks[policy]
+                idx = part.index.get_level_values('block').to_numpy()
+                n_b = part['count'].to_numpy(dtype=float)
+                mean_b = part['mean'].fillna(0.0).to_numpy()
+                m2_b = part['var'].fillna(0.0).to_numpy() * np.maximum(n_b - 1, 0)
+                n_a, mean_a = acc['count'][idx], acc['mean'][idx]
+                n = n_a + n_b
+                delta = mean_b - mean_a
+                share = np.divide(n_b, n, out=np.zeros_like(n), where=n > 0)
+                acc['mean'][idx] = mean_a + delta * share
+                acc['m2'][idx] += m2_b + delta * delta * n_a * share
+                acc['count'][idx] = n
+
+            for policy, n in policy_col.value_counts(sort=False).items():
+                seen[policy] += int(n)
+    except FileNotFoundError:
+        print(f"Error: File not found: {csv_path}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error loading CSV: {e}")
+        sys.exit(1)
+
+    df = pd.concat([pd.concat(parts) for parts in buffers.values()], ignore_index=True)
+    return df, blocks
+
+
+def stream_moments(blocks, start=0):
+    """Merge per-block moments from block ``start`` on into {'count', 'mean', 'm2'}."""
+    n = blocks['count'][start:]
+    mean_i = blocks['mean'][start:]
+    total = n.sum()
+    if total == 0:
+        return {'count': 0, 'mean': np.nan, 'm2': np.nan}
+    mean = np.dot(n, mean_i) / total
+    m2 = blocks['m2'][start:].sum() + np.dot(n, (mean_i - mean) ** 2)
+    return {'count': int(total), 'mean': float(mean), 'm2': float(m2)}
+
+
+def warm_up_samples(policy_data):
+    """MSER-5 warm-up length, in samples, of one run of one policy.
+
+    Applied to the per-sample hit rate (increments of the cumulative
+    hits/misses counters, weighted by requests) rather than the cumulative
+    hitRate column, whose running average smooths the transient into a long
+    tail and would push the cutoff far past the true steady state.
+    """
+    hits = np.diff(policy_data['hits'].to_numpy(dtype=float), prepend=0.0)
+    requests = hits + np.diff(policy_data['misses'].to_numpy(dtype=float), prepend=0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rate = hits / requests
+    return mser_truncation(rate, weights=requests)
+
+
+def detect_warm_up(df):
+    """Warm-up cutoff per policy (and per run, with a 'run' column).
+
+    Returns a frame with the group keys plus 'samples' (rows to skip) and
+    'time' (time of the first steady-state row).
+    """
+    keys = ['policy', 'run'] if 'run' in df.columns else ['policy']
+    rows = []
+    for key, group in df.groupby(keys, sort=False):
+        key = key if isinstance(key, tuple) else (key,)
+        n = min(warm_up_samples(group), len(group) - 1)
+        rows.append((*key, n, group['time'].iat[n]))
+    return pd.DataFrame(rows, columns=keys + ['samples', 'time'])
+
+
+def warm_up_times(cutoffs):
+    """policy -> warm-up end time for plots (median over runs)."""
+    return cutoffs.groupby('policy', sort=False)['time'].median().to_dict()
+
+
+def steady_state_mask(df, cutoffs):
+    """Boolean mask of ``df`` rows at or after their group's warm-up cutoff."""
+    keys = [col for col in ('policy', 'run') if col in cutoffs.columns]
+    position = df.groupby(keys, sort=False).cumcount()
+    skip = df[keys].merge(cutoffs[keys + ['samples']], on=keys, how='left')['samples'].to_numpy()
+    return (position.to_numpy() >= np.nan_to_num(skip)).astype(bool)
+
+
+def smoothed_hit_rate(policy_data):
+    """Centered rolling mean over ~1% of a policy's samples."""
+    window = max(1, len(policy_data) // 100)
+    return policy_data['hitRate'].rolling(window=window, center=True).mean()
+
+
+def downsample_timeline(df, max_points=PLOT_MAX_POINTS, method='lttb'):
+    """Reduce each policy's series to at most ~``max_points`` rows for drawing.
+
+    The smoothed hit rate is computed on the full series first and carried as
+    'hitRateSmooth', so the rolling window does not change with the sample
+    count. Each plotted column is downsampled on its own (LTTB or a min/max
+    envelope) and a policy keeps the union of the chosen rows, so the early
+    warm-up transient and every spike survive in whichever panel shows them;
+    first and last rows are always kept, and percentile band columns from
+    aggregate_runs() are kept in shape too. With ``max_points`` <= 0 only the
+    smoothing column is added (if missing).
+    """
+    pick = DOWNSAMPLERS[method]
+    columns = [col for col in DOWNSAMPLE_COLUMNS + BAND_COLUMNS if col in df.columns or col == 'hitRateSmooth']
+    parts = []
+    for _, policy_data in df.groupby('policy', sort=False):
+        if 'hitRateSmooth' not in policy_data:
+            policy_data = policy_data.assign(hitRateSmooth=smoothed_hit_rate(policy_data))
+        if max_points <= 0 or len(policy_data) <= max_points:
+            parts.append(policy_data)
+            continue
+        # Split the budget so the union stays near max_points
+        budget = max(4, max_points // len(columns))
+        t = policy_data['time'].to_numpy()
+        rows = np.unique(np.concatenate([pick(t, policy_data[col].to_numpy(), budget)
+                                         for col in columns]))
+        parts.append(policy_data.iloc[rows])
+    return pd.concat(parts, ignore_index=True)
+
+
+def plot_band(ax, policy_data, column, color):
+    """Shade the aggregate_runs() percentile band of ``column``, if present."""
+    if f'{column}_lo' in policy_data:
+        ax.fill_between(policy_data['time'], policy_data[f'{column}_lo'] * 100, policy_data[f'{column}_hi'] * 100,
+                        color=color, alpha=0.2, linewidth=0)
+
+
+def plot_hit_rate_over_time(df, output_prefix, format='png', band_label=None):
+    """Plot hit rate evolution over time for all policies.
+
+    With multi-run input the lines are medians and ``band_label`` (e.g.
+    'p10–p90 of 20 runs') describes the shaded band.
+    """
+    import matplotlib.pyplot as plt
+    
     fig, ax = plt.subplots(figsize=(12, 6))
     
     policies = df['policy'].unique()
@@ -60,12 +481,16 @@ def plot_hit_rate_over_time(df, output_prefix, format='png'):
         policy_data = df[df['policy'] == policy]
         color = POLICY_COLORS.get(policy, '#6b7280')
         linestyle = POLICY_LINESTYLES.get(policy, '-')
+        plot_band(ax, policy_data, 'hitRate', color)
         ax.plot(policy_data['time'], policy_data['hitRate'] * 100, 
                label=policy, color=color, linestyle=linestyle, linewidth=2, alpha=0.8)
     
     ax.set_xlabel('Time (seconds)', fontweight='bold')
     ax.set_ylabel('Hit Rate (%)', fontweight='bold')
-    ax.set_title('Cache Hit Rate Over Time - Policy Comparison', fontsize=14, fontweight='bold', pad=15)
+    title = 'Cache Hit Rate Over Time - Policy Comparison'
+    if band_label:
+        title += f'\n(median, band: {band_label})'
+    ax.set_title(title, fontsize=14, fontweight='bold', pad=15)
     ax.legend(loc='best', framealpha=0.9)
     ax.grid(True, alpha=0.3)
     ax.set_ylim([0, 105])
@@ -77,13 +502,15 @@ def plot_hit_rate_over_time(df, output_prefix, format='png'):
     
     plt.tight_layout()
     output_file = f"{output_prefix}_hit_rate_timeline.{format}"
-    plt.savefig(output_file, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, bbox_inches='tight', facecolor='white')
     print(f"Saved: {output_file}")
     plt.close()
 
 
 def plot_cache_size_evolution(df, output_prefix, format='png'):
     """Plot cache size growth over time."""
+    import matplotlib.pyplot as plt
+    
     fig, ax = plt.subplots(figsize=(12, 6))
     
     policies = df['policy'].unique()
@@ -102,13 +529,15 @@ def plot_cache_size_evolution(df, output_prefix, format='png'):
     
     plt.tight_layout()
     output_file = f"{output_prefix}_cache_size_timeline.{format}"
-    plt.savefig(output_file, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, bbox_inches='tight', facecolor='white')
     print(f"Saved: {output_file}")
     plt.close()
 
 
 def plot_hits_misses_over_time(df, output_prefix, format='png'):
     """Plot cumulative hits and misses over time."""
+    import matplotlib.pyplot as plt
+    
     policies = df['policy'].unique()
     
     # Create 2 subplots: hits and misses
@@ -146,15 +575,62 @@ def plot_hits_misses_over_time(df, output_prefix, format='png'):
     plt.tight_layout()
     
     output_file = f"{output_prefix}_hits_misses_timeline.{format}"
-    plt.savefig(output_file, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, bbox_inches='tight', facecolor='white')
     print(f"Saved: {output_file}")
     plt.close()
 
 
-def plot_combined_dashboard(df, output_prefix, format='png'):
-    """Create a combined dashboard with multiple metrics."""
-    fig = plt.figure(figsize=(16, 10))
-    gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
+def plot_windowed_hit_rate(df, output_prefix, format='png', window_label=None, band_label=None):
+    """Plot the windowed hit rate, which shows regime changes the cumulative rate averages away."""
+    import matplotlib.pyplot as plt
+    
+    if 'hitRateWindow' not in df:
+        df = add_window_columns(df)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    
+    policies = df['policy'].unique()
+    for policy in policies:
+        policy_data = df[df['policy'] == policy]
+        color = POLICY_COLORS.get(policy, '#6b7280')
+        linestyle = POLICY_LINESTYLES.get(policy, '-')
+        plot_band(ax, policy_data, 'hitRateWindow', color)
+        ax.plot(policy_data['time'], policy_data['hitRateWindow'] * 100,
+               label=policy, color=color, linestyle=linestyle, linewidth=1.5, alpha=0.8)
+    
+    ax.set_xlabel('Time (seconds)', fontweight='bold')
+    ax.set_ylabel('Windowed Hit Rate (%)', fontweight='bold')
+    title = f"Windowed Cache Hit Rate ({window_label or 'sliding 1% of samples'})"
+    if band_label:
+        title += f'\n(median, band: {band_label})'
+    ax.set_title(title, fontsize=14, fontweight='bold', pad=15)
+    ax.legend(loc='best', framealpha=0.9)
+    ax.grid(True, alpha=0.3)
+    ax.set_ylim([0, 105])
+    
+    plt.tight_layout()
+    output_file = f"{output_prefix}_windowed_hit_rate.{format}"
+    save_figure(output_file, bbox_inches='tight', facecolor='white')
+    print(f"Saved: {output_file}")
+    plt.close()
+
+
+def plot_combined_dashboard(df, output_prefix, format='png', full=None, warm_up=None, window_label=None):
+    """Create a combined dashboard with multiple metrics.
+
+    ``full`` is the un-downsampled frame for the hit-rate distribution panel;
+    the line panels use ``df``. ``warm_up`` maps policy -> warm-up end time
+    (detect_warm_up); the distribution panel only covers steady state. The
+    windowed hit rate and request rate panels use add_window_columns().
+    """
+    import matplotlib.pyplot as plt
+    
+    full = df if full is None else full
+    if warm_up is None:
+        warm_up = warm_up_times(detect_warm_up(full))
+    if 'hitRateWindow' not in df:
+        df = add_window_columns(df)
+    fig = plt.figure(figsize=(16, 13))
+    gs = fig.add_gridspec(4, 2, hspace=0.35, wspace=0.3)
     
     policies = df['policy'].unique()
     
@@ -172,8 +648,27 @@ def plot_combined_dashboard(df, output_prefix, format='png'):
     ax1.grid(True, alpha=0.3)
     ax1.set_ylim([0, 105])
     
-    # 2. Cache Size
-    ax2 = fig.add_subplot(gs[1, 0])
+    # 2. Windowed Hit Rate and Request Rate
+    ax_window = fig.add_subplot(gs[1, 0])
+    ax_rate = fig.add_subplot(gs[1, 1])
+    for policy in policies:
+        policy_data = df[df['policy'] == policy]
+        color = POLICY_COLORS.get(policy, '#6b7280')
+        linestyle = POLICY_LINESTYLES.get(policy, '-')
+        ax_window.plot(policy_data['time'], policy_data['hitRateWindow'] * 100,
+                      label=policy, color=color, linestyle=linestyle, linewidth=1.2, alpha=0.8)
+        ax_rate.plot(policy_data['time'], policy_data['requestRate'],
+                    label=policy, color=color, linestyle=linestyle, linewidth=1.2, alpha=0.8)
+    ax_window.set_ylabel('Hit Rate (%)', fontweight='bold')
+    ax_window.set_title(f"Windowed Hit Rate ({window_label or 'sliding 1% of samples'})", fontweight='bold')
+    ax_window.grid(True, alpha=0.3)
+    ax_window.set_ylim([0, 105])
+    ax_rate.set_ylabel('Requests / s', fontweight='bold')
+    ax_rate.set_title('Request Rate (same window)', fontweight='bold')
+    ax_rate.grid(True, alpha=0.3)
+    
+    # 3. Cache Size
+    ax2 = fig.add_subplot(gs[2, 0])
     for policy in policies:
         policy_data = df[df['policy'] == policy]
         color = POLICY_COLORS.get(policy, '#6b7280')
@@ -185,8 +680,8 @@ def plot_combined_dashboard(df, output_prefix, format='png'):
     ax2.set_title('Cache Size Evolution', fontweight='bold')
     ax2.grid(True, alpha=0.3)
     
-    # 3. Cumulative Hits
-    ax3 = fig.add_subplot(gs[1, 1])
+    # 4. Cumulative Hits
+    ax3 = fig.add_subplot(gs[2, 1])
     for policy in policies:
         policy_data = df[df['policy'] == policy]
         color = POLICY_COLORS.get(policy, '#6b7280')
@@ -198,8 +693,8 @@ def plot_combined_dashboard(df, output_prefix, format='png'):
     ax3.set_title('Cache Hits Accumulation', fontweight='bold')
     ax3.grid(True, alpha=0.3)
     
-    # 4. Cumulative Misses
-    ax4 = fig.add_subplot(gs[2, 0])
+    # 5. Cumulative Misses
+    ax4 = fig.add_subplot(gs[3, 0])
     for policy in policies:
         policy_data = df[df['policy'] == policy]
         color = POLICY_COLORS.get(policy, '#6b7280')
@@ -211,14 +706,14 @@ def plot_combined_dashboard(df, output_prefix, format='png'):
     ax4.set_title('Cache Misses Accumulation', fontweight='bold')
     ax4.grid(True, alpha=0.3)
     
-    # 5. Hit Rate Distribution (boxplot)
-    ax5 = fig.add_subplot(gs[2, 1])
+    # 6. Hit Rate Distribution (boxplot)
+    ax5 = fig.add_subplot(gs[3, 1])
     boxplot_data = []
     labels = []
     for policy in policies:
-        policy_data = df[df['policy'] == policy]
-        # Skip first few samples where hit rate might be 0
-        valid_data = policy_data[policy_data['time'] > 10]['hitRate'] * 100
+        policy_data = full[full['policy'] == policy]
+        # Skip the detected warm-up transient
+        valid_data = policy_data[policy_data['time'] >= warm_up.get(policy, -np.inf)]['hitRate'] * 100
         boxplot_data.append(valid_data)
         labels.append(policy)
     
@@ -228,20 +723,29 @@ def plot_combined_dashboard(df, output_prefix, format='png'):
         patch.set_facecolor(POLICY_COLORS.get(policy, '#6b7280'))
         patch.set_alpha(0.6)
     ax5.set_ylabel('Hit Rate (%)', fontweight='bold')
-    ax5.set_title('Hit Rate Distribution', fontweight='bold')
+    ax5.set_title('Hit Rate Distribution (after warm-up)', fontweight='bold')
     ax5.grid(True, alpha=0.3, axis='y')
     ax5.set_xticklabels(labels, rotation=15, ha='right')
     
     fig.suptitle('Multi-Policy Performance Dashboard', fontsize=16, fontweight='bold', y=0.995)
     
     output_file = f"{output_prefix}_dashboard.{format}"
-    plt.savefig(output_file, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, bbox_inches='tight', facecolor='white')
     print(f"Saved: {output_file}")
     plt.close()
 
 
-def plot_performance_comparison_final(df, output_prefix, format='png'):
-    """Create a publication-ready performance comparison figure."""
+def plot_performance_comparison_final(df, output_prefix, format='png', band_label=None, warm_up=None):
+    """Create a publication-ready performance comparison figure.
+
+    The shaded warm-up span ends at the latest per-policy cutoff in
+    ``warm_up`` (policy -> time, from detect_warm_up); each policy's own
+    cutoff is marked in its color.
+    """
+    import matplotlib.pyplot as plt
+    
+    if warm_up is None:
+        warm_up = warm_up_times(detect_warm_up(df))
     fig, ax = plt.subplots(figsize=(14, 7))
     
     policies = df['policy'].unique()
@@ -252,25 +756,38 @@ def plot_performance_comparison_final(df, output_prefix, format='png'):
         color = POLICY_COLORS.get(policy, '#6b7280')
         linestyle = POLICY_LINESTYLES.get(policy, '-')
         
-        # Apply smoothing for cleaner lines (rolling average)
-        window = max(1, len(policy_data) // 100)
-        smoothed_hitrate = policy_data['hitRate'].rolling(window=window, center=True).mean() * 100
+        # Apply smoothing for cleaner lines (rolling average, precomputed on
+        # the full series when the frame was downsampled)
+        if 'hitRateSmooth' in policy_data:
+            smoothed_hitrate = policy_data['hitRateSmooth'] * 100
+        else:
+            smoothed_hitrate = smoothed_hit_rate(policy_data) * 100
+        plot_band(ax, policy_data, 'hitRateSmooth', color)
         
         ax.plot(policy_data['time'], smoothed_hitrate, 
                label=policy, color=color, linestyle=linestyle, linewidth=2.5, alpha=0.9)
     
     ax.set_xlabel('Simulation Time (seconds)', fontweight='bold', fontsize=12)
     ax.set_ylabel('Cache Hit Rate (%)', fontweight='bold', fontsize=12)
-    ax.set_title('Cache Policy Performance Comparison', fontsize=15, fontweight='bold', pad=20)
+    title = 'Cache Policy Performance Comparison'
+    if band_label:
+        title += f'\n(median, band: {band_label})'
+    ax.set_title(title, fontsize=15, fontweight='bold', pad=20)
     ax.legend(loc='lower right', framealpha=0.95, fontsize=11, 
              frameon=True, shadow=True, ncol=2)
     ax.grid(True, alpha=0.3, linestyle='--')
     ax.set_ylim([0, 105])
     
-    # Add confidence bands or shading for better visualization
-    max_time = df['time'].max()
-    ax.axvspan(0, max_time*0.1, alpha=0.05, color='gray', label='_nolegend_')
-    ax.text(max_time*0.05, 102, 'Warm-up', fontsize=9, alpha=0.5, ha='center')
+    # Shade the detected warm-up (MSER-5) and mark each policy's cutoff
+    start_time = df['time'].min()
+    warm_up_end = max(warm_up.values(), default=start_time)
+    if warm_up_end > start_time:
+        ax.axvspan(start_time, warm_up_end, alpha=0.05, color='gray', label='_nolegend_')
+        ax.text((start_time + warm_up_end) / 2, 102, 'Warm-up', fontsize=9, alpha=0.5, ha='center')
+        for policy in policies:
+            if policy in warm_up:
+                ax.axvline(warm_up[policy], color=POLICY_COLORS.get(policy, '#6b7280'),
+                           linestyle=':', alpha=0.5, linewidth=1)
     
     # Add final performance summary text
     final_perf = []
@@ -285,40 +802,180 @@ def plot_performance_comparison_final(df, output_prefix, format='png'):
     
     plt.tight_layout()
     output_file = f"{output_prefix}_performance_comparison.{format}"
-    plt.savefig(output_file, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, bbox_inches='tight', facecolor='white')
     print(f"Saved: {output_file}")
     plt.close()
 
 
-def print_summary_stats(df):
-    """Print summary statistics for each policy."""
+def print_summary_stats(df, stream_stats=None, cutoffs=None):
+    """Print summary statistics for each policy.
+
+    Mean and std skip the warm-up in ``cutoffs`` (detect_warm_up, computed
+    here when omitted). When ``stream_stats`` (from stream_moments) is given,
+    the mean and std come from it instead of the possibly subsampled ``df``.
+    With a 'run' column (load_runs), warm-up is skipped per run, final values
+    are means over the runs' last samples and the spread of final hit rates
+    is shown.
+    """
     print("\n" + "="*60)
     print("SUMMARY STATISTICS")
     print("="*60)
     
+    if cutoffs is None:
+        cutoffs = detect_warm_up(df)
+    steady = steady_state_mask(df, cutoffs)
     policies = df['policy'].unique()
     for policy in policies:
-        policy_data = df[df['policy'] == policy]
+        in_policy = (df['policy'] == policy).to_numpy()
+        policy_data = df[in_policy]
+        policy_cutoffs = cutoffs[cutoffs['policy'] == policy]
         
-        # Calculate stats (skip early data for more accurate means)
-        warm_up_idx = len(policy_data) // 10
-        stable_data = policy_data.iloc[warm_up_idx:]
+        # Calculate stats (skip the detected warm-up for more accurate means)
+        stable_data = df[in_policy & steady]
+        if 'run' in policy_data:
+            finals = policy_data.groupby('run', sort=False)[VALUE_COLUMNS].last()
+            final = finals.mean()
+        else:
+            final = policy_data.iloc[-1]
+        
+        mean_hr = stable_data['hitRate'].mean()
+        std_hr = stable_data['hitRate'].std()
+        if stream_stats and policy in stream_stats:
+            acc = stream_stats[policy]
+            mean_hr = acc['mean']
+            std_hr = np.sqrt(acc['m2'] / (acc['count'] - 1)) if acc['count'] > 1 else np.nan
         
         print(f"\n{policy}:")
-        print(f"  Final Hit Rate:    {policy_data.iloc[-1]['hitRate']*100:6.2f}%")
-        print(f"  Mean Hit Rate:     {stable_data['hitRate'].mean()*100:6.2f}%")
-        print(f"  Std Hit Rate:      {stable_data['hitRate'].std()*100:6.2f}%")
-        print(f"  Final Cache Size:  {policy_data.iloc[-1]['cacheSize']:6.0f} entries")
-        print(f"  Total Hits:        {policy_data.iloc[-1]['hits']:6.0f}")
-        print(f"  Total Misses:      {policy_data.iloc[-1]['misses']:6.0f}")
+        if 'run' in policy_data:
+            lo, hi = np.percentile(finals['hitRate'], DEFAULT_BAND) * 100
+            print(f"  Runs:              {len(finals):6d}")
+            print(f"  Final Hit Rate:    {final['hitRate']*100:6.2f}% (p{DEFAULT_BAND[0]:g}–p{DEFAULT_BAND[1]:g}: "
+                  f"{lo:.2f}–{hi:.2f}%)")
+        else:
+            print(f"  Final Hit Rate:    {final['hitRate']*100:6.2f}%")
+        print(f"  Warm-up (MSER-{MSER_BATCH}):  {policy_cutoffs['samples'].median():6.0f} samples "
+              f"(until t={policy_cutoffs['time'].median():.1f}s{', median over runs' if 'run' in policy_data else ''})")
+        print(f"  Mean Hit Rate:     {mean_hr*100:6.2f}%")
+        print(f"  Std Hit Rate:      {std_hr*100:6.2f}%")
+        print(f"  Final Cache Size:  {final['cacheSize']:6.0f} entries")
+        print(f"  Total Hits:        {final['hits']:6.0f}")
+        print(f"  Total Misses:      {final['misses']:6.0f}")
         
-        total_requests = policy_data.iloc[-1]['hits'] + policy_data.iloc[-1]['misses']
+        total_requests = final['hits'] + final['misses']
         if total_requests > 0:
-            print(f"  Overall Hit Rate:  {policy_data.iloc[-1]['hits']/total_requests*100:6.2f}%")
+            print(f"  Overall Hit Rate:  {final['hits']/total_requests*100:6.2f}%")
     
     print("\n" + "="*60)
 
 
+def load_inputs(csv_files, args):
+    """Load the export(s) for plan_jobs(); returns ``(df, stream_blocks)``, the latter None unless --stream."""
+    if args.stream and len(csv_files) > 1:
+        print("Error: --stream reads a single CSV; aggregate several runs without --stream")
+        sys.exit(1)
+    
+    if len(csv_files) > 1:
+        print(f"Loading data from {len(csv_files)} files: {csv_files[0]} ...")
+    else:
+        print(f"Loading data from: {csv_files[0]}")
+    stream_blocks = None
+    if args.stream:
+        with profile_stage('load', csv_files[0]):
+            df, stream_blocks = load_data_streaming(csv_files[0])
+    else:
+        with profile_stage('load', ', '.join(csv_files)):
+            df = load_runs(csv_files)
+    return df, stream_blocks
+
+
+def add_arguments(parser):
+    """Options specific to this analysis (also used by aware_plots.py)."""
+    parser.add_argument('--stats', '-s', action='store_true',
+                       help='Print summary statistics')
+    parser.add_argument('--stream', action='store_true',
+                       help='Read the CSV in chunks with bounded memory (for very long timelines)')
+    parser.add_argument('--band', default=','.join(f'{p:g}' for p in DEFAULT_BAND),
+                       help='Percentiles of the band shaded across runs (default: %(default)s)')
+    parser.add_argument('--window',
+                       help="Window for the windowed hit-rate plots: N samples or Ns seconds, e.g. 500 or 600s "
+                            "(default: 1%% of each series)")
+    parser.add_argument('--ewma', action='store_true',
+                       help='Exponentially weighted windowed rates, with --window as the half-life')
+    parser.add_argument('--max-points', type=int, default=PLOT_MAX_POINTS,
+                       help=f'Points drawn per policy line; 0 draws every sample (default: {PLOT_MAX_POINTS})')
+    parser.add_argument('--downsample', choices=DOWNSAMPLE_METHODS, default='lttb',
+                       help='Downsampler for --max-points: largest-triangle-three-buckets or '
+                            'per-bucket min/max envelope (default: lttb)')
+
+
+def plan_jobs(data, args, output_prefix, inputs):
+    """Detect warm-up, add windowed rates, aggregate runs, downsample and list the figure jobs."""
+    df, stream_blocks = data
+    try:
+        band = parse_band(args.band)
+    except ValueError:
+        print(f"Error: Invalid --band: {args.band} (expected LO,HI percentiles with LO < 50 < HI)")
+        sys.exit(1)
+    try:
+        window = parse_window(args.window) if args.window else None
+    except ValueError:
+        print(f"Error: Invalid --window: {args.window} (expected N samples or Ns seconds, e.g. 500 or 600s)")
+        sys.exit(1)
+    
+    policies = df['policy'].unique()
+    print(f"Found {len(policies)} policies: {', '.join(policies)}")
+    
+    with profile_stage('aggregate', 'detect_warm_up'):
+        cutoffs = detect_warm_up(df)
+        warm_up = warm_up_times(cutoffs)
+    stream_stats = None
+    if stream_blocks is not None:
+        stream_stats = {p: stream_moments(stream_blocks[p], int(n))
+                        for p, n in cutoffs.set_index('policy')['samples'].items()}
+    print(f"Warm-up (MSER-{MSER_BATCH}): " + ", ".join(f"{p} until t={t:.1f}s" for p, t in warm_up.items()))
+    
+    with profile_stage('aggregate', 'add_window_columns'):
+        df = add_window_columns(df, window, args.ewma)
+    
+    band_label = None
+    plot_df = df
+    if 'run' in df.columns:
+        with profile_stage('aggregate', 'aggregate_runs'):
+            plot_df = aggregate_runs(df, band)
+        n_runs = df['run'].nunique()
+        band_label = f"p{band[0]:g}–p{band[1]:g} of {n_runs} runs"
+        print(f"Aggregated {n_runs} runs onto a {len(plot_df) // len(policies)}-point time grid")
+    
+    # Print stats if requested
+    if args.stats:
+        with profile_stage('aggregate', 'print_summary_stats'):
+            print_summary_stats(df, stream_stats, cutoffs)
+    
+    with profile_stage('aggregate', 'downsample_timeline'):
+        n_rows = len(plot_df)
+        plot_df = downsample_timeline(plot_df, args.max_points, args.downsample)
+    if len(plot_df) < n_rows:
+        print(f"Downsampled {n_rows} -> {len(plot_df)} points ({args.downsample}, --max-points {args.max_points})")
+    
+    label = window_label(window, args.ewma)
+    jobs = [
+        (plot_hit_rate_over_time, (plot_df, output_prefix, args.format), {'band_label': band_label}),
+        (plot_cache_size_evolution, (plot_df, output_prefix, args.format)),
+        (plot_hits_misses_over_time, (plot_df, output_prefix, args.format)),
+        (plot_combined_dashboard, (plot_df, output_prefix, args.format),
+         {'full': df, 'warm_up': warm_up, 'window_label': label}),
+        (plot_performance_comparison_final, (plot_df, output_prefix, args.format),
+         {'band_label': band_label, 'warm_up': warm_up}),
+        (plot_windowed_hit_rate, (plot_df, output_prefix, args.format),
+         {'window_label': label, 'band_label': band_label}),
+    ]
+    cache = BuildCache(inputs, output_prefix, force=args.force,
+                       options={'stream': args.stream, 'max_points': args.max_points,
+                                'downsample': args.downsample, 'band': band, 'window': window,
+                                'ewma': args.ewma})
+    return RenderPlan(jobs, [plot_df, df], cache)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Generate timeline plots from multi-policy timeline CSV',
@@ -328,40 +985,52 @@ Examples:
   python plot_timeline.py data/multi-policy-timeline-1234.csv
   python plot_timeline.py data/multi-policy-timeline-1234.csv --output figures/timeline
   python plot_timeline.py data/multi-policy-timeline-1234.csv --format pdf --stats
+  python plot_timeline.py data/multi-policy-timeline-1234.csv --stream --stats
+  python plot_timeline.py data/multi-policy-timeline-1234.csv --max-points 0   # draw every sample
+
+  # Hit rate over the last 10 minutes, or an EWMA with a 200-sample half-life
+  python plot_timeline.py data/multi-policy-timeline-1234.csv --window 600s
+  python plot_timeline.py data/multi-policy-timeline-1234.csv --window 200 --ewma
+
+  # Replicate runs: median with a p5–p95 band
+  python plot_timeline.py data/timeline-seed-*.csv --band 5,95 --output figures/timeline
         """
     )
-    parser.add_argument('csv_file', help='Path to multi-policy timeline CSV file')
+    parser.add_argument('csv_files', nargs='+', metavar='csv_file',
+                       help="Multi-policy timeline CSV file(s); several files, or one with a 'seed' column, "
+                            "are aggregated as replicate runs")
     parser.add_argument('--output', '-o', help='Output file prefix (default: same as input without extension)')
-    parser.add_argument('--format', '-f', choices=['png', 'pdf', 'svg'], default='png',
-                       help='Output format (default: png)')
-    parser.add_argument('--stats', '-s', action='store_true',
-                       help='Print summary statistics')
+    add_format_argument(parser, '--format', '-f')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help='Number of worker processes for rendering plots (default: one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                       help='Re-render every figure even if its inputs are unchanged')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print wall/CPU time and peak memory for each load/validate/aggregate/render/save stage')
+    parser.add_argument('--profile-json', metavar='FILE',
+                       help='Also write the --profile report to FILE as JSON (implies --profile)')
+    add_arguments(parser)
     
     args = parser.parse_args()
+    if args.profile or args.profile_json:
+        enable_profiling()
     
     # Determine output prefix
     if args.output:
         output_prefix = args.output
     else:
-        output_prefix = Path(args.csv_file).stem
+        output_prefix = Path(args.csv_files[0]).stem
     
     # Load data
-    print(f"Loading data from: {args.csv_file}")
-    df = load_data(args.csv_file)
-    policies = df['policy'].unique()
-    print(f"Found {len(policies)} policies: {', '.join(policies)}")
-    
-    # Print stats if requested
-    if args.stats:
-        print_summary_stats(df)
+    data = load_inputs(args.csv_files, args)
+    plan = plan_jobs(data, args, output_prefix, args.csv_files)
     
     # Generate plots
     print("\nGenerating plots...")
-    plot_hit_rate_over_time(df, output_prefix, args.format)
-    plot_cache_size_evolution(df, output_prefix, args.format)
-    plot_hits_misses_over_time(df, output_prefix, args.format)
-    plot_combined_dashboard(df, output_prefix, args.format)
-    plot_performance_comparison_final(df, output_prefix, args.format)
+    results = run_render_plans([plan], n_jobs=args.jobs, formats=args.formats)
+    report_profile(args.profile_json)
+    if report_render_results(results):
+        sys.exit(1)
     
     print(f"\nAll plots generated successfully!")
     print(f"Output prefix: {output_prefix}")
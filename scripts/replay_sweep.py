@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Sweep (policy, cacheSize, reliability, seed) cells through trace replay in parallel.
+
+Produces a dense exportCombinedComparisonCSV grid (plus trace_replay.py's
+queryModel column) for plot_combined_comparison.py without clicking through
+the UI. Each seed
+redraws the synthetic queries and the per-alert delivery draw, so seeds are
+replicates of the same trace; the ``seed`` column records
+``<run seed>#<replay seed>``.
+
+Cells fan out over a ProcessPoolExecutor. A task is one (seed, run, policy)
+with all of its pending cache sizes × reliabilities, which replay together in
+one batched pass (trace_replay.replay_batch). Every worker reads the CSVs once
+in its initializer and keeps the traces decoded for the current seed; tasks
+are submitted seed-major so each worker decodes each seed at most once.
+
+Rows are appended to the output CSV as tasks finish. Rerunning the same
+command resumes: cells already in the file are skipped, and a truncated last
+line from an interrupted run is dropped. The CSV is the incremental format;
+read_csv_cached gives later reads a columnar sidecar.
+
+Usage:
+    python replay_sweep.py aware-alerts-123.csv --seeds 0-9 --jobs 4 --output sweep.csv
+    python replay_sweep.py aware-alerts-123.csv --cache-sizes 16,32,64,128,256,512,1024 \\
+        --reliabilities 1,0.9,0.8,0.7,0.6,0.5,0.4,0.3 --output dense.csv
+    python plot_combined_comparison.py --file dense.csv
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from common import (COMBINED_COLUMNS, DEVICE_PROFILES, NETWORK_PROFILES, POLICY_ORDER, QUERY_MODEL_COLUMN,
+                    read_csv_cached)
+from trace_replay import (DEFAULT_QUERY_RATE_PER_MIN, POLICIES, RECORDED_QUERY_MODEL, REPLAY_COMBINED_COLUMNS,
+                          SYNTHETIC_QUERY_MODEL, build_traces, device_profiles_for, grid_rows, load_csv,
+                          network_profiles_for)
+
+CellKey = Tuple[str, str, int, float]
+
+# Per-worker state: the CSVs (loaded once by the initializer) and the traces
+# decoded for the most recent seed
+_worker: Dict[str, object] = {}
+
+
+def parse_seeds(spec: str) -> List[int]:
+    """``'0-4,10'`` -> [0, 1, 2, 3, 4, 10]."""
+    seeds = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            lo, hi = part.split('-', 1)
+            seeds.extend(range(int(lo), int(hi) + 1))
+        else:
+            seeds.append(int(part))
+    return list(dict.fromkeys(seeds))
+
+
+def replicate_label(run_seed: str, seed: int) -> str:
+    return f"{run_seed}#{seed}" if run_seed else str(seed)
+
+
+def cell_key(seed_label: str, policy: str, cache_size, reliability) -> CellKey:
+    return (str(seed_label), str(policy), int(cache_size), round(float(reliability), 3))
+
+
+def run_seeds(alerts: pd.DataFrame) -> List[str]:
+    """Each run's seed, in the order build_traces decodes the runs."""
+    if 'runId' not in alerts.columns:
+        return [str(alerts['seed'].iat[0]) if 'seed' in alerts.columns and len(alerts) else '']
+    if 'seed' not in alerts.columns:
+        return ['' for _ in alerts.groupby('runId', sort=False)]
+    return [str(run['seed'].iat[0]) for _, run in alerts.groupby('runId', sort=False)]
+
+
+def load_done(output: str, query_model: str) -> set:
+    """Cell keys already written; rewrites the file without a torn final row.
+
+    Files from before the queryModel column get it filled with ``query_model``,
+    the model of the resumed command, so appended rows line up with the header.
+    """
+    if not os.path.exists(output) or os.path.getsize(output) == 0:
+        return set()
+    with open(output, 'rb+') as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b'\n':
+            # An interrupted append can stop mid-number, which would still
+            # parse as a complete row; cut back to the last full line
+            f.seek(0)
+            f.truncate(f.read().rfind(b'\n') + 1)
+    try:
+        df = pd.read_csv(output, on_bad_lines='skip')
+    except pd.errors.EmptyDataError:
+        return set()
+    missing = [col for col in COMBINED_COLUMNS if col not in df.columns]
+    if missing:
+        print(f"Error: {output} is not a combined-comparison CSV (missing {missing})")
+        sys.exit(1)
+    complete = df.dropna(subset=COMBINED_COLUMNS)
+    if len(complete) < len(df):
+        print(f"Dropping {len(df) - len(complete)} incomplete row(s) from {output}")
+    if QUERY_MODEL_COLUMN not in complete.columns:
+        complete = complete.assign(**{QUERY_MODEL_COLUMN: query_model})
+    if len(complete) < len(df) or list(complete.columns) != list(df.columns):
+        tmp = f"{output}.tmp"
+        complete.to_csv(tmp, index=False)
+        os.replace(tmp, output)
+    return {cell_key(s, p, c, r) for s, p, c, r in
+            complete[['seed', 'policy', 'cacheSize', 'reliability']].itertuples(index=False)}
+
+
+def _init_sweep_worker(alerts_csv: str, queries_csv: Optional[str], query_rate: float,
+                       duration: Optional[float]) -> None:
+    alerts = read_csv_cached(alerts_csv)
+    # Delivery is redrawn per reliability level, so every alert is a potential put
+    _worker['alerts'] = alerts.drop(columns='delivered', errors='ignore')
+    _worker['queries'] = read_csv_cached(queries_csv) if queries_csv else None
+    _worker['query_rate'] = query_rate
+    _worker['duration'] = duration
+    _worker['seed'] = None
+
+
+def _run_sweep_task(seed: int, run_index: int, policies: Sequence[str], cells) -> List[dict]:
+    if _worker['seed'] != seed:
+        _worker['traces'] = build_traces(_worker['alerts'], _worker['queries'], _worker['query_rate'],
+                                         _worker['duration'], seed)
+        _worker['seed'] = seed
+    trace = _worker['traces'][run_index]
+    rows = grid_rows(trace, policies, cells, seed=seed + run_index)
+    for row in rows:
+        row['seed'] = replicate_label(trace.seed, seed)
+    return rows
+
+
+def plan_tasks(seeds, seed_labels, policies, devices, networks, done):
+    """Pending (seed, run, [policy], cells) tasks, seed-major.
+
+    One policy per task keeps enough tasks to spread over the pool; the
+    policies of one (seed, run) still share the worker's decoded traces.
+    """
+    tasks = []
+    for seed in seeds:
+        for run_index, run_seed in enumerate(seed_labels):
+            label = replicate_label(run_seed, seed)
+            for policy in policies:
+                cells = [(d, n) for d in devices for n in networks
+                         if cell_key(label, policy, d[1], n[1]) not in done]
+                if cells:
+                    tasks.append((seed, run_index, [policy], cells))
+    return tasks
+
+
+def append_rows(output: str, rows: List[dict]) -> None:
+    df = pd.DataFrame(rows, columns=REPLAY_COMBINED_COLUMNS)
+    header = not os.path.exists(output) or os.path.getsize(output) == 0
+    with open(output, 'a', newline='') as f:
+        df.to_csv(f, index=False, header=header)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Sweep policy × cache size × reliability × seed through trace replay into a combined CSV',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Device × network profiles, 10 replicate seeds, 4 worker processes
+  python replay_sweep.py data/aware-alerts-1234.csv --seeds 0-9 --jobs 4 --output sweep.csv
+
+  # Dense grid; rerun the same command to resume after an interruption
+  python replay_sweep.py data/aware-alerts-1234.csv --cache-sizes 16,32,64,128,256,512,1024 \\
+      --reliabilities 1,0.9,0.8,0.7,0.6,0.5,0.4,0.3 --output dense.csv
+  python plot_combined_comparison.py --file dense.csv
+        """
+    )
+    parser.add_argument('alerts_csv', help='Alerts export (runId,...,alertId,...,issuedAt,ttlSec,...)')
+    parser.add_argument('--queries', help='Query trace CSV with time,alertId[,runId] (default: synthesize)')
+    parser.add_argument('--query-rate', type=float, default=DEFAULT_QUERY_RATE_PER_MIN,
+                       help=f'Synthetic queries per minute (default: {DEFAULT_QUERY_RATE_PER_MIN})')
+    parser.add_argument('--duration', type=float, help='Run length in seconds (default: last issuedAt + 1)')
+    parser.add_argument('--policies', default=','.join(POLICY_ORDER),
+                       help=f"Comma-separated policies (default: {','.join(POLICY_ORDER)})")
+    parser.add_argument('--cache-sizes', help='Comma-separated cache sizes (default: the device profiles)')
+    parser.add_argument('--reliabilities', help='Comma-separated reliabilities (default: the network profiles)')
+    parser.add_argument('--seeds', default='0', help="Replay seeds, e.g. '0-9' or '1,5,7' (default: 0)")
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help='Worker processes (default: all CPUs; 1 runs in-process)')
+    parser.add_argument('--output', '-o', default='sweep.csv', help='Combined CSV to append to (default: sweep.csv)')
+
+    args = parser.parse_args()
+
+    policies = [p.strip() for p in args.policies.split(',') if p.strip()]
+    unknown = [p for p in policies if p not in POLICIES]
+    if unknown:
+        print(f"Error: Unknown policies: {unknown}. Choose from: {', '.join(POLICIES)}")
+        sys.exit(1)
+    devices = (device_profiles_for([int(float(c)) for c in args.cache_sizes.split(',')])
+               if args.cache_sizes else list(DEVICE_PROFILES))
+    networks = (network_profiles_for([float(r) for r in args.reliabilities.split(',')])
+                if args.reliabilities else list(NETWORK_PROFILES))
+    try:
+        seeds = parse_seeds(args.seeds)
+    except ValueError:
+        print(f"Error: Invalid --seeds: {args.seeds}")
+        sys.exit(1)
+
+    print(f"Loading alerts: {args.alerts_csv}")
+    alerts = load_csv(args.alerts_csv, ['alertId', 'issuedAt', 'ttlSec'])
+    if args.queries:
+        load_csv(args.queries, ['time', 'alertId'])
+    seed_labels = run_seeds(alerts)
+
+    done = load_done(args.output, RECORDED_QUERY_MODEL if args.queries else SYNTHETIC_QUERY_MODEL)
+    n_jobs = args.jobs or os.cpu_count() or 1
+    tasks = plan_tasks(seeds, seed_labels, policies, devices, networks, done)
+    total = len(seeds) * len(seed_labels) * len(policies) * len(devices) * len(networks)
+    pending = sum(len(cells) for *_, cells in tasks)
+    print(f"Cells: {total} ({len(seed_labels)} run(s) × {len(seeds)} seed(s) × {len(policies)} policies × "
+          f"{len(devices)} cache sizes × {len(networks)} reliabilities)")
+    print(f"Already done: {total - pending} | Pending: {pending} in {len(tasks)} task(s) | Jobs: {n_jobs}")
+    if not tasks:
+        print(f"✓ Nothing to do: {args.output} is complete")
+        return
+
+    init_args = (args.alerts_csv, args.queries, args.query_rate, args.duration)
+    written = 0
+    try:
+        if n_jobs <= 1:
+            _init_sweep_worker(*init_args)
+            for task in tasks:
+                rows = _run_sweep_task(*task)
+                append_rows(args.output, rows)
+                written += len(rows)
+                print(f"  seed {task[0]} run {task[1]} {task[2][0]:<14} {written}/{pending} cells")
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_sweep_worker,
+                                     initargs=init_args) as pool:
+                futures = {pool.submit(_run_sweep_task, *task): task for task in tasks}
+                for future in as_completed(futures):
+                    task = futures[future]
+                    rows = future.result()
+                    append_rows(args.output, rows)
+                    written += len(rows)
+                    print(f"  seed {task[0]} run {task[1]} {task[2][0]:<14} {written}/{pending} cells")
+    except KeyboardInterrupt:
+        print(f"\nInterrupted after {written} cell(s); rerun the same command to resume")
+        sys.exit(130)
+
+    print(f"✓ Saved: {args.output} ({written} new cell(s))")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Compute exact LRU hit-rate curves (miss-ratio curves) from an alert trace.
+
+Reads an exported access or alert trace, e.g. the "Export Alerts CSV" file
+from the Runs History panel:
+
+    runId,timestamp,scenario,policy,seed,alertId,eventType,severity,urgency,
+    issuedAt,ttlSec,regionId,geokey,threadKey,updateNo,sizeBytes,delivered
+
+and computes the LRU hit rate for every cache size in one pass using Mattson
+stack distances: the stack distance of an access is the number of distinct
+keys referenced since the previous access to the same key, and an LRU cache
+of size C hits exactly when that distance is below C. Distances are counted
+with a Fenwick tree over access positions, so a trace of N accesses costs
+O(N log N) regardless of how many cache sizes are evaluated.
+
+Each alert references its thread (``threadKey``; updates to the same thread
+re-reference it), falling back to ``alertId`` for unthreaded alerts, the
+same ``threadKey ?? id`` key PAFTinyLFU admits on. Traces
+are split by ``runId`` and the per-run histograms are pooled. The curve is
+plotted with plot_cache_size_comparison.plot_scaling_curves, replacing one
+simulator run per cache size with a single pass over the trace.
+
+For traces too large for the exact pass, ``--sample-rate`` or ``--sample-size``
+switches to SHARDS spatial sampling: only keys whose hash falls below a
+threshold are tracked and their stack distances are scaled by the sampling
+rate. Keys are hashed with the same FNV-1a function FrequencySketch uses for
+PAFTinyLFU admission keys. Fixed-size mode lowers the threshold as new keys
+arrive so at most ``--sample-size`` keys are tracked at once. The error band
+is the standard error across disjoint hash partitions of the sample.
+
+Usage:
+    python trace_mrc.py aware-alerts-123.csv [--sizes 8,16,32,64] [--output PREFIX]
+    python trace_mrc.py aware-alerts-123.csv --sample-rate 0.01 [--exact]
+"""
+
+import argparse
+import heapq
+import sys
+
+import numpy as np
+import pandas as pd
+
+from common import read_csv_cached, setup_plotting, set_figure_formats, add_format_argument
+from plot_cache_size_comparison import plot_all_metrics_grid, plot_scaling_curves
+
+# Column preferences for the alerts export; a generic trace needs only a key column
+KEY_COLUMNS = ['threadKey', 'alertId', 'key']
+TIME_COLUMNS = ['issuedAt', 'time', 'timestamp']
+GROUP_COLUMNS = ['runId']
+
+# SHARDS compares the low 24 hash bits against the threshold; the high bits
+# pick the error-estimate partition so the two choices are independent
+SHARDS_MODULUS = 1 << 24
+DEFAULT_ERROR_PARTITIONS = 4
+
+
+def stack_distances(keys) -> np.ndarray:
+    """LRU stack distance of every access in ``keys``; -1 marks a first reference.
+
+    Position ``t`` holds a mark while it is the most recent access of its key,
+    so the distance of an access whose previous reference was at ``p`` is the
+    number of marks strictly between ``p`` and ``t``.
+    """
+    codes, uniques = pd.factorize(np.asarray(keys), use_na_sentinel=False)
+    return _stack_distances_codes(codes, len(uniques))
+
+
+def _stack_distances_codes(codes: np.ndarray, n_keys: int, evictions=None) -> np.ndarray:
+    """Fenwick-tree stack distances over integer key codes.
+
+    ``evictions`` maps an access position to key codes that stop being
+    tracked just before that access (SHARDS fixed-size mode); their marks are
+    cleared so they no longer count towards other keys' distances.
+    """
+    n = len(codes)
+    last = [-1] * n_keys
+    tree = [0] * (n + 1)
+    out = np.empty(n, dtype=np.int64)
+    for t, k in enumerate(codes.tolist()):
+        if evictions and t in evictions:
+            for e in evictions[t]:
+                i = last[e] + 1
+                if i > 0:
+                    last[e] = -1
+                    while i <= n:
+                        tree[i] -= 1
+                        i += i & -i
+        p = last[k]
+        if p >= 0:
+            # marks at positions p+1 .. t-1 (tree is 1-based: index = position + 1)
+            s = 0
+            i = t
+            while i > 0:
+                s += tree[i]
+                i -= i & -i
+            i = p + 1
+            while i > 0:
+                s -= tree[i]
+                i -= i & -i
+            out[t] = s
+            i = p + 1
+            while i <= n:
+                tree[i] -= 1
+                i += i & -i
+        else:
+            out[t] = -1
+        i = t + 1
+        while i <= n:
+            tree[i] += 1
+            i += i & -i
+        last[k] = t
+    return out
+
+
+def distance_histogram(distances: np.ndarray) -> np.ndarray:
+    """Counts of finite stack distances, indexed by distance."""
+    finite = distances[distances >= 0]
+    return np.bincount(finite) if len(finite) else np.zeros(0, dtype=np.int64)
+
+
+def hit_rate_curve(histogram: np.ndarray, accesses: int, cache_sizes) -> np.ndarray:
+    """LRU hit rate at each cache size from a stack-distance histogram."""
+    cache_sizes = np.asarray(cache_sizes, dtype=np.int64)
+    cumulative = np.concatenate([[0], np.cumsum(histogram)])
+    hits = cumulative[np.minimum(cache_sizes, len(histogram))]
+    return hits / accesses if accesses else np.zeros(len(cache_sizes))
+
+
+def default_cache_sizes(max_size: int, points: int = 24) -> np.ndarray:
+    """Geometric ladder of cache sizes from 1 to ``max_size`` (the distinct key count)."""
+    if max_size <= 1:
+        return np.array([1])
+    return np.unique(np.round(np.geomspace(1, max_size, points)).astype(np.int64))
+
+
+def pick_column(df: pd.DataFrame, candidates, requested=None):
+    if requested:
+        if requested not in df.columns:
+            print(f"Error: Column not found: {requested}")
+            sys.exit(1)
+        return requested
+    return next((c for c in candidates if c in df.columns), None)
+
+
+def load_trace(csv_path, key=None, time=None, group=None, delivered_only=False):
+    """Load a trace CSV and return ``(key series, group labels)`` in access order."""
+    try:
+        df = read_csv_cached(csv_path)
+    except FileNotFoundError:
+        print(f"Error: File not found: {csv_path}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error loading CSV: {e}")
+        sys.exit(1)
+
+    key_col = pick_column(df, KEY_COLUMNS, key)
+    if key_col is None:
+        print(f"Error: Trace needs one of the columns {KEY_COLUMNS} (or --key)")
+        sys.exit(1)
+    time_col = pick_column(df, TIME_COLUMNS, time)
+    group_col = pick_column(df, GROUP_COLUMNS, group)
+
+    if delivered_only and 'delivered' in df.columns:
+        df = df[df['delivered'].astype(str).str.lower() == 'true']
+
+    keys = df[key_col].astype(object)
+    if key_col == 'threadKey' and 'alertId' in df.columns:
+        # Unthreaded alerts are referenced once, by their own id: the raw
+        # ``threadKey ?? id`` PAFTinyLFU admits on, so SHARDS hashes the same
+        # string FrequencySketch does. Only a missing threadKey falls back; an
+        # empty one is kept, as ``??`` keeps it
+        keys = keys.where(keys.notna(), df['alertId'].astype(str))
+
+    order = ['__group', '__time'] if time_col else ['__group']
+    frame = pd.DataFrame({
+        '__key': keys.values,
+        '__group': df[group_col].values if group_col else 0,
+    })
+    if time_col:
+        frame['__time'] = pd.to_numeric(df[time_col], errors='coerce').values
+    frame = frame.sort_values(order, kind='stable')
+    return frame['__key'], frame['__group']
+
+
+def lru_curve_frame(keys: pd.Series, groups: pd.Series, cache_sizes=None):
+    """Pool per-group stack-distance histograms into an LRU hit-rate curve.
+
+    Returns a DataFrame with the multi-policy CSV columns plot_scaling_curves
+    reads (``policy``, ``cacheSize``, ``cacheHitRate``) plus access counts.
+    """
+    histogram = np.zeros(0, dtype=np.int64)
+    accesses = 0
+    distinct = 0
+    for _, idx in groups.groupby(groups, sort=False).groups.items():
+        dist = stack_distances(keys.loc[idx].values)
+        h = distance_histogram(dist)
+        if len(h) > len(histogram):
+            h[:len(histogram)] += histogram
+            histogram = h
+        else:
+            histogram[:len(h)] += h
+        accesses += len(dist)
+        distinct = max(distinct, int((dist < 0).sum()))
+
+    if cache_sizes is None:
+        cache_sizes = default_cache_sizes(distinct)
+    cache_sizes = np.asarray(sorted(set(int(c) for c in cache_sizes)), dtype=np.int64)
+    hit_rate = hit_rate_curve(histogram, accesses, cache_sizes)
+    return pd.DataFrame({
+        'policy': 'LRU',
+        'cacheSize': cache_sizes,
+        'cacheHitRate': hit_rate,
+        'missRatio': 1.0 - hit_rate,
+        'accesses': accesses,
+        'distinctKeys': distinct,
+    })
+
+
+def fnv1a_hash(keys) -> np.ndarray:
+    """32-bit FNV-1a with the final mix used by FrequencySketch.hash, vectorized.
+
+    Characters are hashed by code point, which matches JavaScript's
+    ``charCodeAt`` for every key outside the astral planes.
+    """
+    arr = np.asarray(keys, dtype=str)
+    if arr.size == 0:
+        return np.zeros(0, dtype=np.uint32)
+    mask = np.uint64(0xFFFFFFFF)
+    chars = arr.view(np.uint32).reshape(len(arr), -1).astype(np.uint64)
+    lengths = np.char.str_len(arr)
+    h = np.full(len(arr), 2166136261, dtype=np.uint64)
+    for i in range(chars.shape[1]):
+        mixed = ((h ^ chars[:, i]) * np.uint64(16777619)) & mask
+        h = np.where(lengths > i, mixed, h)
+    h ^= h >> np.uint64(13)
+    h = (h * np.uint64(0x5BD1E995)) & mask
+    h ^= h >> np.uint64(15)
+    return h.astype(np.uint32)
+
+
+def shards_sample(codes: np.ndarray, key_hash: np.ndarray, rate=None, max_keys=None,
+                  key_filter=None, rate_scale: float = 1.0):
+    """Spatially sample a coded trace and return scaled stack distances.
+
+    Args:
+        codes: key code per access
+        key_hash: 32-bit hash per key code
+        rate: fixed sampling rate (fraction of keys tracked)
+        max_keys: fixed-size mode; track at most this many keys
+        key_filter: optional boolean mask over key codes restricting the sample
+            (used for the error partitions)
+        rate_scale: fraction of keys ``key_filter`` keeps, folded into the rate
+
+    Returns:
+        ``(scaled, weights, expected)``: stack distance divided by the
+        sampling rate in effect (inf for first references), the weight of each
+        sampled access, and the expected sampled-reference count for the
+        SHARDS adjustment (None in fixed-size mode).
+    """
+    spatial = (key_hash & np.uint32(SHARDS_MODULUS - 1)).astype(np.int64)
+    eligible = np.ones(len(key_hash), dtype=bool) if key_filter is None else key_filter
+
+    if max_keys is None:
+        threshold = int(rate * SHARDS_MODULUS)
+        keep = (eligible & (spatial < threshold))[codes]
+        effective = threshold / SHARDS_MODULUS * rate_scale
+        dist = _stack_distances_codes(codes[keep], len(key_hash))
+        scaled = np.where(dist >= 0, dist / max(effective, 1e-12), np.inf)
+        return scaled, np.ones(len(scaled)), len(codes) * effective
+
+    # Fixed size: walk keys in first-reference order, keeping the max_keys
+    # smallest hashes seen so far; each overflow lowers the threshold to the
+    # evicted key's hash. Only distinct keys are visited here.
+    uniq, first = np.unique(codes, return_index=True)
+    order = uniq[np.argsort(first)]
+    first_at = np.empty(len(key_hash), dtype=np.int64)
+    first_at[uniq] = first
+    threshold = SHARDS_MODULUS
+    heap = []
+    change_at, change_threshold, evict_at = [0], [threshold], {}
+    for k in order.tolist():
+        v = spatial[k]
+        if not eligible[k] or v >= threshold:
+            continue
+        heapq.heappush(heap, (-v, k))
+        if len(heap) > max_keys:
+            neg_v, evicted = heapq.heappop(heap)
+            threshold = -neg_v
+            change_at.append(int(first_at[k]))
+            change_threshold.append(threshold)
+            if evicted != k:
+                evict_at.setdefault(int(first_at[k]), []).append(evicted)
+
+    change_at = np.asarray(change_at)
+    change_threshold = np.asarray(change_threshold, dtype=np.float64)
+    access_threshold = change_threshold[np.searchsorted(change_at, np.arange(len(codes)), side='right') - 1]
+    keep = eligible[codes] & (spatial[codes] < access_threshold)
+    kept_at = np.flatnonzero(keep)
+    # Re-index evictions onto positions in the sampled sub-trace
+    evictions = {}
+    for t, keys in evict_at.items():
+        pos = int(np.searchsorted(kept_at, t, side='left'))
+        evictions.setdefault(pos, []).extend(keys)
+
+    dist = _stack_distances_codes(codes[keep], len(key_hash), evictions)
+    effective = access_threshold[keep] / SHARDS_MODULUS * rate_scale
+    scaled = np.where(dist >= 0, dist / effective, np.inf)
+    # Rescale earlier references to the final rate, as SHARDS does when it lowers R
+    weights = change_threshold[-1] / access_threshold[keep]
+    return scaled, weights, None
+
+
+def sampled_hit_rate(scaled: np.ndarray, weights: np.ndarray, cache_sizes, expected=None) -> np.ndarray:
+    """Hit rate at each cache size from scaled distances (SHARDS_adj when ``expected`` is set)."""
+    cache_sizes = np.asarray(cache_sizes, dtype=np.float64)
+    order = np.argsort(scaled, kind='stable')
+    cum = np.concatenate([[0.0], np.cumsum(weights[order])])
+    hits = cum[np.searchsorted(scaled[order], cache_sizes, side='left')]
+    total = weights.sum()
+    if expected is not None and expected > 0:
+        # Sample-size correction: the shortfall against the expected number of
+        # sampled references is credited to the smallest distance bucket
+        hits = hits + (expected - total)
+        total = expected
+    if total <= 0:
+        return np.zeros(len(cache_sizes))
+    return np.clip(hits / total, 0.0, 1.0)
+
+
+def shards_curve_frame(keys: pd.Series, groups: pd.Series, cache_sizes=None, rate=None, max_keys=None,
+                       partitions: int = DEFAULT_ERROR_PARTITIONS):
+    """Approximate LRU hit-rate curve with SHARDS sampling and a partition error estimate.
+
+    The sample is also split into ``partitions`` disjoint groups of keys by
+    the high hash bits; each group gives an independent estimate at 1/K of
+    the rate, and their spread gives ``cacheHitRate_err`` (standard error).
+    """
+    codes, uniques = pd.factorize(keys.values, use_na_sentinel=False)
+    key_hash = fnv1a_hash(uniques.astype(str))
+    part = (key_hash >> np.uint32(24)) % max(partitions, 1)
+    group_codes, _ = pd.factorize(groups.values, use_na_sentinel=False)
+
+    pooled = []
+    parts = [[] for _ in range(partitions)]
+    sampled_keys = 0
+    for g in range(group_codes.max() + 1 if len(group_codes) else 0):
+        c = codes[group_codes == g]
+        pooled.append(shards_sample(c, key_hash, rate, max_keys))
+        sampled_keys = max(sampled_keys, int(np.isinf(pooled[-1][0]).sum()))
+        if partitions > 1:
+            for k in range(partitions):
+                part_keys = None if max_keys is None else max(max_keys // partitions, 1)
+                parts[k].append(shards_sample(c, key_hash, rate, part_keys,
+                                              key_filter=(part == k), rate_scale=1.0 / partitions))
+
+    def _curve(samples, sizes):
+        scaled = np.concatenate([x[0] for x in samples])
+        weights = np.concatenate([x[1] for x in samples])
+        expected = None if max_keys is not None else sum(x[2] for x in samples)
+        return sampled_hit_rate(scaled, weights, sizes, expected)
+
+    if cache_sizes is None:
+        # The curve is flat beyond the largest scaled reuse distance
+        finite = [x[0][np.isfinite(x[0])] for x in pooled]
+        largest = max((f.max() for f in finite if len(f)), default=1.0)
+        cache_sizes = default_cache_sizes(int(np.ceil(largest)) + 1)
+    cache_sizes = np.asarray(sorted(set(int(c) for c in cache_sizes)), dtype=np.int64)
+
+    hit_rate = _curve(pooled, cache_sizes)
+    if partitions > 1:
+        estimates = np.vstack([_curve(p, cache_sizes) for p in parts])
+        err = estimates.std(axis=0, ddof=1) / np.sqrt(partitions)
+    else:
+        err = np.full(len(cache_sizes), np.nan)
+    return pd.DataFrame({
+        'policy': 'LRU',
+        'cacheSize': cache_sizes,
+        'cacheHitRate': hit_rate,
+        'cacheHitRate_err': err,
+        'missRatio': 1.0 - hit_rate,
+        'accesses': len(codes),
+        'sampledAccesses': sum(len(x[0]) for x in pooled),
+        'sampledKeys': sampled_keys,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compute the exact LRU hit-rate curve of an alert trace in one pass',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Curve over a geometric ladder of cache sizes up to the distinct thread count
+  python trace_mrc.py data/aware-alerts-1234.csv
+
+  # Specific sizes, delivered alerts only, PDF output and the curve as CSV
+  python trace_mrc.py data/aware-alerts-1234.csv --sizes 32,128,256,512,1024 \\
+      --delivered-only --format pdf --save-csv figures/lru_mrc.csv
+        """
+    )
+    parser.add_argument('csv_file', help='Alert export or access trace CSV')
+    parser.add_argument('--output', '-o', help='Output file prefix (default: trace_mrc)')
+    add_format_argument(parser, '--format', '-f')
+    parser.add_argument('--sizes', help='Comma-separated cache sizes (default: geometric ladder)')
+    parser.add_argument('--key', help='Key column (default: threadKey, falling back to alertId)')
+    parser.add_argument('--time', help='Ordering column (default: issuedAt if present)')
+    parser.add_argument('--group', help='Column splitting independent traces (default: runId if present)')
+    parser.add_argument('--delivered-only', action='store_true',
+                       help='Only count alerts with delivered=true')
+    parser.add_argument('--save-csv', metavar='FILE', help='Also write the curve to FILE')
+    parser.add_argument('--sample-rate', type=float,
+                       help='SHARDS fixed-rate sampling: fraction of keys to track (e.g. 0.01)')
+    parser.add_argument('--sample-size', type=int,
+                       help='SHARDS fixed-size sampling: maximum number of keys tracked at once')
+    parser.add_argument('--error-partitions', type=int, default=DEFAULT_ERROR_PARTITIONS,
+                       help=f'Disjoint key partitions for the sampled error estimate '
+                            f'(default: {DEFAULT_ERROR_PARTITIONS}; 1 disables)')
+    parser.add_argument('--exact', action='store_true',
+                       help='With sampling, also compute the exact curve for comparison')
+
+    args = parser.parse_args()
+    output_prefix = args.output if args.output else 'trace_mrc'
+
+    print(f"Loading trace: {args.csv_file}")
+    keys, groups = load_trace(args.csv_file, args.key, args.time, args.group, args.delivered_only)
+    if len(keys) == 0:
+        print("Error: Trace is empty")
+        sys.exit(1)
+    sizes = [int(float(s)) for s in args.sizes.split(',')] if args.sizes else None
+    sampled = args.sample_rate is not None or args.sample_size is not None
+    if args.sample_rate is not None and args.sample_size is not None:
+        print("Error: Use either --sample-rate or --sample-size, not both")
+        sys.exit(1)
+    if args.sample_rate is not None and not 0 < args.sample_rate <= 1:
+        print("Error: --sample-rate must be in (0, 1]")
+        sys.exit(1)
+
+    if sampled:
+        curve = shards_curve_frame(keys, groups, sizes, rate=args.sample_rate, max_keys=args.sample_size,
+                                   partitions=max(args.error_partitions, 1))
+        print(f"Accesses: {curve['accesses'].iat[0]} | Sampled: {curve['sampledAccesses'].iat[0]} | "
+              f"Groups: {groups.nunique()}")
+        if args.exact:
+            exact = lru_curve_frame(keys, groups, curve['cacheSize'].values)
+            exact['policy'] = 'LRU (exact)'
+            curve = pd.concat([curve, exact], ignore_index=True)
+    else:
+        curve = lru_curve_frame(keys, groups, sizes)
+        print(f"Accesses: {curve['accesses'].iat[0]} | Groups: {groups.nunique()} | "
+              f"Max distinct keys per group: {curve['distinctKeys'].iat[0]}")
+
+    print(f"\n{'Policy':<12} {'Cache Size':>10}  {'Hit Rate':>9}  {'± Err':>7}  {'Miss Ratio':>10}")
+    for row in curve.itertuples():
+        err = getattr(row, 'cacheHitRate_err', np.nan)
+        err = f"{err * 100:>6.2f}%" if pd.notna(err) else f"{'-':>7}"
+        print(f"{row.policy:<12} {row.cacheSize:>10}  {row.cacheHitRate * 100:>8.2f}%  {err}  "
+              f"{row.missRatio * 100:>9.2f}%")
+
+    if args.save_csv:
+        curve.to_csv(args.save_csv, index=False)
+        print(f"\n✓ Saved: {args.save_csv}")
+
+    print("\nGenerating plots...")
+    setup_plotting()
+    set_figure_formats(args.formats)
+    plot_scaling_curves(curve, 'cacheHitRate', 'LRU Cache Hit Rate (trace)', output_prefix, args.format)
+    if sampled:
+        plot_all_metrics_grid(curve, output_prefix, args.format)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,1086 @@
+#!/usr/bin/env python3
+"""
+Replay an alert + query trace through the simulator's cache policies offline.
+
+Ports LRU, TTLOnly, PriorityFresh and PAFTinyLFU from src/sim/policies to
+Python with compact NumPy-backed state:
+
+- alert ids and thread keys are interned to integers once per trace
+- recency/insertion order is an array-based doubly linked list
+- expiry is a heap keyed by ``issuedAt + ttlSec`` instead of a full scan
+- PriorityFresh scores the occupied slots as one vector on eviction
+- PAFTinyLFU's count-min sketch is a 4 x 4096 ``uint8`` array (saturating),
+  indexed with FrequencySketch's FNV-1a hash, precomputed per key
+
+Puts come from the alerts export (delivered alerts at ``issuedAt``); queries
+come from a ``time,alertId`` CSV (``recorded``) or are synthesized
+(``global-target``: weight = urgency × severity × freshness over every
+delivered, live alert). Results use the exportMultiPolicyCSV columns, so every
+plotting script reads them directly. Push metrics are 0, as in simulator runs
+without a push rate limit; PriorityFresh runs without the PF learning model.
+
+Query model: a replayed query names its target alert, and it is a hit only if
+the policy still holds that alert. run.ts instead draws each query from
+``policy.entries(now)``, the policy's own resident set, and misses only when
+the cache is empty. cacheHitRate, avgFreshness, staleAccessRate and the
+first-retrieval metrics (actionabilityFirstRatio, timelinessConsistency)
+therefore measure something different from simulator exports. Every row
+records its model in an extra ``queryModel`` column, and the plotting
+scripts caption figures of such exports accordingly.
+
+``--grid`` produces the exportCombinedComparisonCSV grid (cache size ×
+network reliability × policy) in a single pass: the trace is decoded once and
+each policy advances all K (cacheSize, reliability) states together, held as
+structure-of-arrays (``[alert, state]`` residency, linked lists, slot arrays
+and one sketch row per state). Delivery is drawn once per alert and thinned
+per reliability level, replacing the trace's own ``delivered`` column.
+
+Usage:
+    python trace_replay.py aware-alerts-123.csv --cache-sizes 32,128,512 --output replay.csv
+    python trace_replay.py aware-alerts-123.csv --queries queries.csv --policies LRU,PAFTinyLFU
+    python trace_replay.py aware-alerts-123.csv --grid --output combined.csv
+"""
+
+import argparse
+import heapq
+import math
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from common import (COMBINED_COLUMNS, DEVICE_PROFILES, MULTI_POLICY_COLUMNS, NETWORK_PROFILES,
+                    POLICY_ORDER, QUERY_MODEL_COLUMN, read_csv_cached)
+from trace_mrc import fnv1a_hash
+
+# Scenario SLA for timelinessConsistency (src/sim/scenarios/*.ts)
+TARGET_FIRST_DELIVERY_SEC = {'Urban': 120, 'Suburban': 180, 'Rural': 300}
+DEFAULT_QUERY_RATE_PER_MIN = 6
+SKETCH_WIDTH = 4096
+PF_DEFAULT_WEIGHTS = {'wS': 2.0, 'wU': 3.0, 'wF': 4.0}
+PF_LAMBDA = 1 / 600
+
+# PriorityFresh eviction weights and the query model's pick weights (run.ts)
+PF_SEVERITY_WEIGHT = {'Extreme': 4, 'Severe': 3, 'Moderate': 2, 'Minor': 1}
+PF_URGENCY_WEIGHT = {'Immediate': 3, 'Expected': 2, 'Future': 1.5, 'Past': 0.5}
+PICK_SEVERITY_WEIGHT = {'Extreme': 3, 'Severe': 2}
+PICK_URGENCY_WEIGHT = {'Immediate': 3, 'Expected': 2}
+
+PUT, GET = 0, 1
+
+# queryModel values: synthesized targets over all live alerts, or a query trace
+SYNTHETIC_QUERY_MODEL = 'global-target'
+RECORDED_QUERY_MODEL = 'recorded'
+
+# Export columns: the simulator's, plus how queries chose their targets
+REPLAY_COLUMNS = MULTI_POLICY_COLUMNS + [QUERY_MODEL_COLUMN]
+REPLAY_COMBINED_COLUMNS = COMBINED_COLUMNS + [QUERY_MODEL_COLUMN]
+
+
+@dataclass
+class Trace:
+    """One run's interned alerts and its time-ordered put/get events."""
+    run_id: str
+    scenario: str
+    seed: str
+    issued_at: np.ndarray        # float64 per alert
+    ttl: np.ndarray              # float64 per alert
+    pf_base_sev: np.ndarray      # PriorityFresh severity weight per alert
+    pf_base_urg: np.ndarray      # PriorityFresh urgency weight per alert
+    actionable: np.ndarray       # bool per alert
+    thread: np.ndarray           # int code per alert (threadKey, else id)
+    has_thread_key: np.ndarray   # bool per alert
+    id_slots: np.ndarray         # (n_alerts, 4) sketch columns for the alert id
+    admit_slots: np.ndarray      # (n_alerts, 4) sketch columns for threadKey ?? id
+    delivered: np.ndarray        # bool per alert
+    event_time: np.ndarray       # float64 per event
+    event_kind: np.ndarray       # PUT / GET per event
+    event_alert: np.ndarray      # alert code per event (-1: query for an unknown alert)
+    duration_sec: float
+    query_model: str             # SYNTHETIC_QUERY_MODEL or RECORDED_QUERY_MODEL
+
+    @property
+    def n_alerts(self) -> int:
+        return len(self.issued_at)
+
+    @property
+    def n_queries(self) -> int:
+        return int((self.event_kind == GET).sum())
+
+
+def sketch_slots(keys) -> np.ndarray:
+    """Sketch columns for each key, matching FrequencySketch's row indexing."""
+    h = fnv1a_hash(keys).astype(np.int64)
+    mask = SKETCH_WIDTH - 1
+    return np.stack([h & mask, (h >> 8) & mask, (h >> 16) & mask, (h >> 24) & mask], axis=1)
+
+
+def synthesize_queries(issued_at, ttl, pick_weight, duration_sec, rate_per_min, seed=0, max_rounds=64):
+    """Poisson query times with ``global-target`` targets.
+
+    Each query picks a live alert (issued, not yet expired) with probability
+    proportional to urgency × severity × freshness, by vectorized rejection
+    sampling over the alerts issued within the longest TTL. Targets are drawn
+    from all live alerts, not from a policy's resident set as in run.ts (see
+    the module docstring). Queries with no live alert target -1 and count as
+    misses.
+    """
+    rng = np.random.default_rng(seed)
+    steps = max(1, int(duration_sec))
+    counts = rng.poisson(rate_per_min / 60, steps)
+    times = np.repeat(np.arange(steps, dtype=np.float64), counts)
+    targets = np.full(len(times), -1, dtype=np.int64)
+    if len(times) == 0 or len(issued_at) == 0:
+        return times, targets
+
+    order = np.argsort(issued_at, kind='stable')
+    issued_sorted = issued_at[order]
+    hi = np.searchsorted(issued_sorted, times, side='right')
+    lo = np.searchsorted(issued_sorted, times - ttl.max(), side='left')
+    pending = np.flatnonzero(hi > lo)
+    max_weight = pick_weight.max() if len(pick_weight) else 1.0
+    for _ in range(max_rounds):
+        if len(pending) == 0:
+            break
+        pick = order[lo[pending] + (rng.random(len(pending)) * (hi[pending] - lo[pending])).astype(np.int64)]
+        age = np.maximum(0, times[pending] - issued_at[pick])
+        live = times[pending] < issued_at[pick] + ttl[pick]
+        fresh = np.exp(-age / np.maximum(1, ttl[pick]))
+        accept = live & (rng.random(len(pending)) * max_weight < pick_weight[pick] * fresh)
+        targets[pending[accept]] = pick[accept]
+        pending = pending[~accept]
+    return times, targets
+
+
+def _weight(values: pd.Series, table: Dict[str, float], default: float) -> np.ndarray:
+    return values.map(table).fillna(default).to_numpy(dtype=np.float64)
+
+
+def build_traces(alerts: pd.DataFrame, queries: Optional[pd.DataFrame] = None,
+                 query_rate_per_min: float = DEFAULT_QUERY_RATE_PER_MIN, duration_sec=None,
+                 seed: int = 0) -> List[Trace]:
+    """Intern an alerts export (plus optional ``time,alertId`` queries) into one Trace per run."""
+    if 'runId' not in alerts.columns:
+        alerts = alerts.assign(runId='run')
+    traces = []
+    for i, (run_id, run) in enumerate(alerts.groupby('runId', sort=False)):
+        run = run.reset_index(drop=True)
+        ids = run['alertId'].astype(str)
+        threads = run['threadKey'] if 'threadKey' in run.columns else pd.Series([np.nan] * len(run))
+        has_thread = threads.notna() & (threads.astype(str) != '')
+        thread_key = threads.astype(str).where(has_thread, 'alert:' + ids)
+        severity = run['severity'].astype(str) if 'severity' in run.columns else pd.Series(['Unknown'] * len(run))
+        urgency = run['urgency'].astype(str) if 'urgency' in run.columns else pd.Series(['Unknown'] * len(run))
+        if 'delivered' in run.columns:
+            delivered = run['delivered'].astype(str).str.lower().isin(['true', '1']).to_numpy()
+        else:
+            delivered = np.ones(len(run), dtype=bool)
+        issued_at = pd.to_numeric(run['issuedAt'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        ttl = pd.to_numeric(run['ttlSec'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        run_duration = float(duration_sec) if duration_sec else float(np.floor(issued_at.max()) + 1 if len(run) else 1)
+
+        if queries is not None:
+            q = queries
+            if 'runId' in q.columns:
+                q = q[q['runId'].astype(str) == str(run_id)]
+            code_of = pd.Series(np.arange(len(run)), index=ids.values)
+            code_of = code_of[~code_of.index.duplicated()]
+            q_times = pd.to_numeric(q['time'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+            q_alerts = code_of.reindex(q['alertId'].astype(str).values).fillna(-1).to_numpy(dtype=np.int64)
+        else:
+            pick_weight = _weight(urgency, PICK_URGENCY_WEIGHT, 1) * _weight(severity, PICK_SEVERITY_WEIGHT, 1)
+            q_times, q_alerts = synthesize_queries(np.where(delivered, issued_at, np.inf), ttl, pick_weight,
+                                                   run_duration, query_rate_per_min, seed + i)
+
+        put_codes = np.flatnonzero(delivered)
+        event_time = np.concatenate([issued_at[put_codes], q_times])
+        event_kind = np.concatenate([np.full(len(put_codes), PUT, dtype=np.int8),
+                                     np.full(len(q_times), GET, dtype=np.int8)])
+        event_alert = np.concatenate([put_codes, q_alerts])
+        # Arrivals are processed before queries within a time step, as in run.ts
+        order = np.lexsort((event_kind, event_time))
+
+        traces.append(Trace(
+            run_id=str(run_id),
+            scenario=str(run['scenario'].iat[0]) if 'scenario' in run.columns and len(run) else 'Urban',
+            seed=str(run['seed'].iat[0]) if 'seed' in run.columns and len(run) else '',
+            issued_at=issued_at,
+            ttl=ttl,
+            pf_base_sev=_weight(severity, PF_SEVERITY_WEIGHT, 2),
+            pf_base_urg=_weight(urgency, PF_URGENCY_WEIGHT, 1.5),
+            actionable=((urgency == 'Immediate') | severity.isin(['Extreme', 'Severe'])).to_numpy(),
+            thread=pd.factorize(thread_key)[0],
+            has_thread_key=has_thread.to_numpy(),
+            id_slots=sketch_slots(ids.values),
+            admit_slots=sketch_slots(thread_key.where(has_thread, ids).values),
+            delivered=delivered,
+            event_time=event_time[order],
+            event_kind=event_kind[order],
+            event_alert=event_alert[order],
+            duration_sec=run_duration,
+            query_model=SYNTHETIC_QUERY_MODEL if queries is None else RECORDED_QUERY_MODEL,
+        ))
+    return traces
+
+
+# ---------------------------------------------------------------------------
+# Policies
+# ---------------------------------------------------------------------------
+
+class _ReplayCache:
+    """Residency and expiry shared by all policies; alerts are integer codes."""
+
+    def __init__(self, trace: Trace, capacity: int):
+        self.capacity = capacity
+        self.expires = trace.issued_at + trace.ttl
+        self.resident = np.zeros(trace.n_alerts, dtype=bool)
+        self.size = 0
+        self._heap = []
+
+    def purge(self, now: float) -> None:
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, k = heapq.heappop(heap)
+            if self.resident[k]:
+                self._remove(k)
+
+    def _add(self, k: int) -> None:
+        self.resident[k] = True
+        self.size += 1
+        heapq.heappush(self._heap, (self.expires[k], k))
+
+    def _remove(self, k: int) -> None:
+        self.resident[k] = False
+        self.size -= 1
+
+
+class _LinkedOrder:
+    """Array-based doubly linked list over alert codes; head is the oldest."""
+
+    def __init__(self, n: int):
+        self.sentinel = n
+        self.prev = np.full(n + 1, n, dtype=np.int64).tolist()
+        self.next = list(self.prev)
+
+    def push_back(self, k: int) -> None:
+        s = self.sentinel
+        tail = self.prev[s]
+        self.next[tail] = k
+        self.prev[k] = tail
+        self.next[k] = s
+        self.prev[s] = k
+
+    def unlink(self, k: int) -> None:
+        p, n = self.prev[k], self.next[k]
+        self.next[p] = n
+        self.prev[n] = p
+
+    def move_to_back(self, k: int) -> None:
+        self.unlink(k)
+        self.push_back(k)
+
+    def head(self) -> int:
+        return self.next[self.sentinel]
+
+
+class LRUReplay(_ReplayCache):
+    name = 'LRU'
+
+    def __init__(self, trace: Trace, capacity: int):
+        super().__init__(trace, capacity)
+        self.order = _LinkedOrder(trace.n_alerts)
+
+    def _remove(self, k: int) -> None:
+        super()._remove(k)
+        self.order.unlink(k)
+
+    def put(self, k: int, now: float) -> None:
+        self.purge(now)
+        if self.resident[k]:
+            self.order.move_to_back(k)
+        else:
+            self._add(k)
+            self.order.push_back(k)
+        while self.size > self.capacity:
+            self._remove(self.order.head())
+
+    def get(self, k: int, now: float) -> bool:
+        self.purge(now)
+        if k >= 0 and self.resident[k]:
+            self.order.move_to_back(k)
+            return True
+        return False
+
+
+class TTLOnlyReplay(LRUReplay):
+    """Insertion-ordered; evicts the oldest insert only when over capacity."""
+    name = 'TTLOnly'
+
+    def get(self, k: int, now: float) -> bool:
+        self.purge(now)
+        return k >= 0 and bool(self.resident[k])
+
+
+class PriorityFreshReplay(_ReplayCache):
+    """Evicts the lowest wS·severity + wU·urgency + wF·freshness, scored over slot arrays."""
+    name = 'PriorityFresh'
+
+    def __init__(self, trace: Trace, capacity: int, weights: Optional[Dict[str, float]] = None):
+        super().__init__(trace, capacity)
+        w = {**PF_DEFAULT_WEIGHTS, **{k: v for k, v in (weights or {}).items() if v is not None}}
+        self.base = w['wS'] * trace.pf_base_sev + w['wU'] * trace.pf_base_urg
+        self.w_fresh = w['wF']
+        self.issued_at = trace.issued_at
+        cap = max(capacity, 1)
+        self.slot_alert = np.full(cap, -1, dtype=np.int64)
+        self.slot_base = np.zeros(cap)
+        self.slot_issued = np.zeros(cap)
+        self.slot_seq = np.zeros(cap, dtype=np.int64)
+        self.slot_of = np.full(trace.n_alerts, -1, dtype=np.int64)
+        self.free = list(range(cap - 1, -1, -1))
+        self.seq = 0
+
+    def _remove(self, k: int) -> None:
+        super()._remove(k)
+        slot = self.slot_of[k]
+        self.slot_alert[slot] = -1
+        self.slot_of[k] = -1
+        self.free.append(slot)
+
+    def _place(self, k: int) -> None:
+        slot = self.free.pop()
+        self.slot_alert[slot] = k
+        self.slot_base[slot] = self.base[k]
+        self.slot_issued[slot] = self.issued_at[k]
+        self.slot_seq[slot] = self.seq
+        self.seq += 1
+        self.slot_of[k] = slot
+        self._add(k)
+
+    def put(self, k: int, now: float) -> None:
+        self.purge(now)
+        if self.resident[k] or self.capacity <= 0:
+            return
+        if self.size >= self.capacity:
+            fresh = np.exp(-PF_LAMBDA * np.maximum(0.0, now - self.slot_issued))
+            score = self.slot_base + self.w_fresh * fresh
+            worst = np.flatnonzero(score == score.min())
+            # Ties go to the earliest insert, like iterating the Map in order
+            slot = worst[np.argmin(self.slot_seq[worst])] if len(worst) > 1 else worst[0]
+            self._remove(int(self.slot_alert[slot]))
+        self._place(k)
+
+    def get(self, k: int, now: float) -> bool:
+        self.purge(now)
+        return k >= 0 and bool(self.resident[k])
+
+
+class PAFTinyLFUReplay(LRUReplay):
+    """TinyLFU admission against the least frequent of the 8 oldest entries."""
+    name = 'PAFTinyLFU'
+    VICTIM_SAMPLE = 8
+
+    def __init__(self, trace: Trace, capacity: int):
+        super().__init__(trace, capacity)
+        # Rows are laid out back to back so each key maps to 4 flat cell offsets;
+        # the memoryview gives cheap scalar access to the uint8 buffer
+        self.sketch = np.zeros(4 * SKETCH_WIDTH, dtype=np.uint8)
+        self._cells = memoryview(self.sketch)
+        row_offsets = np.arange(4) * SKETCH_WIDTH
+        self.id_cells = (trace.id_slots + row_offsets).tolist()
+        self.admit_cells = (trace.admit_slots + row_offsets).tolist()
+
+    def _increment(self, cells) -> None:
+        c = self._cells
+        for i in cells:
+            if c[i] < 255:
+                c[i] += 1
+
+    def _estimate(self, cells) -> int:
+        c = self._cells
+        return min(c[cells[0]], c[cells[1]], c[cells[2]], c[cells[3]])
+
+    def _touch(self, k: int) -> None:
+        self.order.move_to_back(k)
+        self._increment(self.id_cells[k])
+
+    def put(self, k: int, now: float) -> None:
+        self.purge(now)
+        admit = self.admit_cells[k]
+        self._increment(admit)
+        if self.size < self.capacity or self.resident[k]:
+            if not self.resident[k]:
+                self._add(k)
+                self.order.push_back(k)
+            self._touch(k)
+            return
+        if self.capacity <= 0:
+            return
+
+        victim, victim_score = -1, None
+        node = self.order.head()
+        for _ in range(min(self.VICTIM_SAMPLE, self.size)):
+            score = self._estimate(self.id_cells[node])
+            if victim_score is None or score < victim_score:
+                victim, victim_score = node, score
+            node = self.order.next[node]
+        if self._estimate(admit) >= victim_score:
+            self._remove(victim)
+            self._add(k)
+            self.order.push_back(k)
+            self._touch(k)
+
+    def get(self, k: int, now: float) -> bool:
+        self.purge(now)
+        if k >= 0 and self.resident[k]:
+            self._touch(k)
+            return True
+        return False
+
+
+POLICIES = {
+    'LRU': LRUReplay,
+    'TTLOnly': TTLOnlyReplay,
+    'PriorityFresh': PriorityFreshReplay,
+    'PAFTinyLFU': PAFTinyLFUReplay,
+}
+
+
+def make_policy(name: str, trace: Trace, capacity: int, weights=None) -> _ReplayCache:
+    if name == 'PriorityFresh':
+        return PriorityFreshReplay(trace, capacity, weights)
+    return POLICIES[name](trace, capacity)
+
+
+# ---------------------------------------------------------------------------
+# Replay and metrics
+# ---------------------------------------------------------------------------
+
+def trace_metrics(trace: Trace, delivered: Optional[np.ndarray] = None) -> Dict[str, float]:
+    """Policy-independent metrics: delivery and redundancy from the put stream."""
+    delivered = trace.delivered if delivered is None else delivered
+    n_delivered = int(delivered.sum())
+    threaded = delivered & trace.has_thread_key
+    counts = np.bincount(trace.thread[threaded]) if threaded.any() else np.zeros(0, dtype=np.int64)
+    duplicates = int(np.maximum(counts - 1, 0).sum())
+    return {
+        'deliveryRate': n_delivered / trace.n_alerts if trace.n_alerts else 0.0,
+        'redundancyIndex': duplicates / n_delivered if n_delivered else 0.0,
+    }
+
+
+def replay(trace: Trace, policy: str, cache_size: int, weights=None) -> Dict[str, float]:
+    """Replay one trace through one policy and return the simulator's metrics."""
+    cache = make_policy(policy, trace, cache_size, weights)
+    put, get = cache.put, cache.get
+    issued_at, ttl = trace.issued_at.tolist(), trace.ttl.tolist()
+    thread = trace.thread.tolist()
+    first_retrieval = {}
+    hits = misses = stale = 0
+    fresh_sum = 0.0
+
+    for now, kind, k in zip(trace.event_time.tolist(), trace.event_kind.tolist(), trace.event_alert.tolist()):
+        if kind == PUT:
+            put(k, now)
+        elif get(k, now):
+            hits += 1
+            fresh = math.exp(-max(0.0, now - issued_at[k]) / max(1.0, ttl[k]))
+            fresh_sum += fresh
+            if fresh <= 0:
+                stale += 1
+            th = thread[k]
+            if th not in first_retrieval:
+                first_retrieval[th] = (now, k)
+        else:
+            misses += 1
+
+    total = hits + misses
+    sla = TARGET_FIRST_DELIVERY_SEC.get(trace.scenario, TARGET_FIRST_DELIVERY_SEC['Urban'])
+    n_threads = max(1, len(first_retrieval))
+    timely = sum(1 for t, _ in first_retrieval.values() if t <= sla)
+    actionable = sum(1 for _, k in first_retrieval.values() if trace.actionable[k])
+    return {
+        'cacheHitRate': hits / total if total else 0.0,
+        **trace_metrics(trace),
+        'avgFreshness': fresh_sum / hits if hits else 0.0,
+        'staleAccessRate': stale / total if total else 0.0,
+        'actionabilityFirstRatio': actionable / n_threads,
+        'timelinessConsistency': timely / n_threads,
+        'pushesSent': 0,
+        'pushSuppressRate': 0.0,
+        'pushDuplicateRate': 0.0,
+        'pushTimelyFirstRatio': 0.0,
+    }
+
+
+def replay_rows(traces: Sequence[Trace], policies: Sequence[str], cache_sizes: Sequence[int],
+                weights=None) -> pd.DataFrame:
+    """Replay every trace × cache size × policy into exportMultiPolicyCSV rows (plus queryModel)."""
+    rows = []
+    for trace in traces:
+        reliability = round(float(trace.delivered.mean()), 3) if trace.n_alerts else 0.0
+        query_rate = trace.n_queries / trace.duration_sec * 60 if trace.duration_sec else 0.0
+        for cache_size in cache_sizes:
+            for policy in policies:
+                rows.append({
+                    'policy': policy,
+                    'seed': trace.seed,
+                    'scenario': trace.scenario,
+                    'cacheSize': int(cache_size),
+                    'alerts': trace.n_alerts,
+                    'reliability': reliability,
+                    'durationSec': int(trace.duration_sec),
+                    'queryRatePerMin': round(query_rate, 3),
+                    **replay(trace, policy, int(cache_size), weights),
+                    QUERY_MODEL_COLUMN: trace.query_model,
+                })
+    return pd.DataFrame(rows, columns=REPLAY_COLUMNS)
+
+
+# ---------------------------------------------------------------------------
+# Batched replay: many (cacheSize, reliability) states in one pass
+# ---------------------------------------------------------------------------
+
+def max_live_alerts(trace: Trace) -> int:
+    """Most alerts simultaneously unexpired at any arrival, an upper bound on residency."""
+    if trace.n_alerts == 0:
+        return 0
+    starts = np.sort(trace.issued_at)
+    ends = np.sort(trace.issued_at + trace.ttl)
+    live = np.arange(1, len(starts) + 1) - np.searchsorted(ends, starts, side='right')
+    return int(live.max())
+
+
+class _BatchCache:
+    """K independent cache states of one policy, stored as structure-of-arrays.
+
+    Per-alert arrays are alert-major (``[alert, state]``) so the K-vector for
+    the alert of the current event is contiguous. Each state has its own
+    capacity and delivery mask; expiry times are shared, so a single heap
+    drives the lazy purge for all K states.
+    """
+
+    def __init__(self, trace: Trace, capacities: np.ndarray, delivered: np.ndarray):
+        n, self.K = trace.n_alerts, len(capacities)
+        self.capacity = np.asarray(capacities, dtype=np.int64)
+        # A zero-capacity state never stores anything: treat it as receiving nothing
+        self.delivered = delivered & (self.capacity > 0)[None, :]
+        self.expires = (trace.issued_at + trace.ttl).tolist()
+        self.resident = np.zeros((n, self.K), dtype=bool)
+        self.size = np.zeros(self.K, dtype=np.int64)
+        self._queued = np.zeros(n, dtype=bool)
+        self._heap = []
+
+    def purge(self, now: float) -> None:
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, k = heapq.heappop(heap)
+            rows = np.nonzero(self.resident[k])[0]
+            if len(rows):
+                self._remove(rows, k)
+
+    def _add(self, rows: np.ndarray, k: int) -> None:
+        self.resident[k, rows] = True
+        self.size[rows] += 1
+        if not self._queued[k]:
+            self._queued[k] = True
+            heapq.heappush(self._heap, (self.expires[k], k))
+
+    def _remove(self, rows: np.ndarray, k) -> None:
+        self.resident[k, rows] = False
+        self.size[rows] -= 1
+
+
+class _BatchLinkedOrder:
+    """K array-based doubly linked lists over alert codes; row ``n`` is the sentinel."""
+
+    def __init__(self, n: int, K: int):
+        self.sentinel = n
+        self.prev = np.full((n + 1, K), n, dtype=np.int32)
+        self.next = self.prev.copy()
+
+    def push_back(self, rows, k) -> None:
+        s, prev, nxt = self.sentinel, self.prev, self.next
+        tail = prev[s, rows]
+        nxt[tail, rows] = k
+        prev[k, rows] = tail
+        nxt[k, rows] = s
+        prev[s, rows] = k
+
+    def unlink(self, rows, k) -> None:
+        prev, nxt = self.prev, self.next
+        p, n = prev[k, rows], nxt[k, rows]
+        nxt[p, rows] = n
+        prev[n, rows] = p
+
+    def move_to_back(self, rows, k) -> None:
+        self.unlink(rows, k)
+        self.push_back(rows, k)
+
+    def head(self, rows) -> np.ndarray:
+        return self.next[self.sentinel, rows]
+
+
+class LRUBatch(_BatchCache):
+    touch_on_hit = True
+
+    def __init__(self, trace: Trace, capacities, delivered):
+        super().__init__(trace, capacities, delivered)
+        self.order = _BatchLinkedOrder(trace.n_alerts, self.K)
+
+    def _remove(self, rows, k) -> None:
+        super()._remove(rows, k)
+        self.order.unlink(rows, k)
+
+    def put(self, k: int, now: float) -> None:
+        self.purge(now)
+        rows = np.nonzero(self.delivered[k])[0]
+        if len(rows) == 0:
+            return
+        again = self.resident[k, rows]
+        if again.any():
+            self.order.unlink(rows[again], k)
+            rows_new = rows[~again]
+        else:
+            rows_new = rows
+        self.order.push_back(rows, k)
+        self._add(rows_new, k)
+        over = rows[self.size[rows] > self.capacity[rows]]
+        if len(over):
+            self._remove(over, self.order.head(over))
+
+    def get(self, k: int, now: float) -> np.ndarray:
+        self.purge(now)
+        hit = self.resident[k].copy()
+        if self.touch_on_hit:
+            rows = np.nonzero(hit)[0]
+            if len(rows):
+                self.order.move_to_back(rows, k)
+        return hit
+
+
+class TTLOnlyBatch(LRUBatch):
+    touch_on_hit = False
+
+
+class PriorityFreshBatch(_BatchCache):
+    """Slot arrays per state; eviction scores every full state's slots at once."""
+
+    def __init__(self, trace: Trace, capacities, delivered, weights=None):
+        super().__init__(trace, capacities, delivered)
+        w = {**PF_DEFAULT_WEIGHTS, **{k: v for k, v in (weights or {}).items() if v is not None}}
+        self.base = w['wS'] * trace.pf_base_sev + w['wU'] * trace.pf_base_urg
+        self.w_fresh = w['wF']
+        self.issued_at = trace.issued_at
+        # No state can hold more than the alerts live at once, so wider slot
+        # arrays than that would only add never-used columns to every scan
+        width = max(1, min(int(self.capacity.max()), max_live_alerts(trace)))
+        # -1 marks a free slot; -2 pads states whose capacity is below the widest.
+        # Free and padding slots score +inf, so argmin only ever picks an entry
+        self.slot_alert = np.where(np.arange(width)[None, :] < self.capacity[:, None], -1, -2)
+        self.slot_base = np.full((self.K, width), np.inf)
+        # exp(λ·(issuedAt - t0)) per slot: freshness is then one multiply by
+        # exp(-λ·(now - t0)) instead of an exp per slot on every eviction
+        self.slot_growth = np.zeros((self.K, width))
+        self.slot_seq = np.zeros((self.K, width), dtype=np.int64)
+        self.slot_of = np.full((trace.n_alerts, self.K), -1, dtype=np.int32)
+        self.seq = 0
+        self.t0 = 0.0
+
+    def _remove(self, rows, k) -> None:
+        super()._remove(rows, k)
+        slots = self.slot_of[k, rows]
+        self.slot_alert[rows, slots] = -1
+        self.slot_base[rows, slots] = np.inf
+        self.slot_of[k, rows] = -1
+
+    def _victim_slots(self, full: np.ndarray, now: float) -> np.ndarray:
+        decay = self.w_fresh * math.exp(-PF_LAMBDA * (now - self.t0))
+        if len(full) == self.K:
+            score = self.slot_base + decay * self.slot_growth
+        else:
+            score = self.slot_base[full] + decay * self.slot_growth[full]
+        slot = score.argmin(axis=1)
+        lowest = score == score[np.arange(len(full)), slot][:, None]
+        tied = np.nonzero(lowest.sum(axis=1) > 1)[0]
+        if len(tied):
+            # Ties go to the earliest insert, like iterating the Map in order
+            seq = np.where(lowest[tied], self.slot_seq[full[tied]], np.iinfo(np.int64).max)
+            slot[tied] = seq.argmin(axis=1)
+        return slot
+
+    def put(self, k: int, now: float) -> None:
+        self.purge(now)
+        rows = np.nonzero(self.delivered[k] & ~self.resident[k])[0]
+        if len(rows) == 0:
+            return
+        if PF_LAMBDA * (now - self.t0) > 200:
+            self.slot_growth *= math.exp(-PF_LAMBDA * (now - self.t0))
+            self.t0 = now
+        is_full = self.size[rows] >= self.capacity[rows]
+        slot = np.empty(len(rows), dtype=np.int64)
+        if is_full.any():
+            full = rows[is_full]
+            victim_slot = self._victim_slots(full, now)
+            self._remove(full, self.slot_alert[full, victim_slot])
+            slot[is_full] = victim_slot
+        if not is_full.all():
+            free = rows[~is_full]
+            slot[~is_full] = (self.slot_alert[free] == -1).argmax(axis=1)
+        self.slot_alert[rows, slot] = k
+        self.slot_base[rows, slot] = self.base[k]
+        self.slot_growth[rows, slot] = math.exp(PF_LAMBDA * (self.issued_at[k] - self.t0))
+        self.slot_seq[rows, slot] = self.seq
+        self.seq += 1
+        self.slot_of[k, rows] = slot
+        self._add(rows, k)
+
+    def get(self, k: int, now: float) -> np.ndarray:
+        self.purge(now)
+        return self.resident[k].copy()
+
+
+class PAFTinyLFUBatch(LRUBatch):
+    """One uint8 count-min sketch per state (K x 4·4096), updated with fancy indexing."""
+    VICTIM_SAMPLE = PAFTinyLFUReplay.VICTIM_SAMPLE
+
+    def __init__(self, trace: Trace, capacities, delivered):
+        super().__init__(trace, capacities, delivered)
+        self.sketch = np.zeros((self.K, 4 * SKETCH_WIDTH), dtype=np.uint8)
+        row_offsets = np.arange(4) * SKETCH_WIDTH
+        self.id_cells = trace.id_slots + row_offsets
+        self.admit_cells = trace.admit_slots + row_offsets
+
+    def _increment(self, rows, cells) -> None:
+        idx = (rows[:, None], cells)
+        vals = self.sketch[idx]
+        self.sketch[idx] = vals + (vals < 255)
+
+    def _estimate(self, rows, cells) -> np.ndarray:
+        return self.sketch[rows[:, None], cells].min(axis=1)
+
+    def _insert(self, rows, k) -> None:
+        self._add(rows, k)
+        self.order.push_back(rows, k)
+        self._increment(rows, self.id_cells[k])
+
+    def put(self, k: int, now: float) -> None:
+        self.purge(now)
+        rows = np.nonzero(self.delivered[k])[0]
+        if len(rows) == 0:
+            return
+        self._increment(rows, self.admit_cells[k])
+        again = self.resident[k, rows]
+        if again.any():
+            self.order.move_to_back(rows[again], k)
+            self._increment(rows[again], self.id_cells[k])
+            rows = rows[~again]
+        room = self.size[rows] < self.capacity[rows]
+        if room.any():
+            self._insert(rows[room], k)
+        full = rows[~room]
+        if len(full) == 0:
+            return
+
+        sample = min(self.VICTIM_SAMPLE, int(self.size[full].max()))
+        nodes = np.empty((len(full), sample), dtype=np.int64)
+        node = self.order.head(full)
+        for j in range(sample):
+            nodes[:, j] = node
+            node = self.order.next[node, full]
+        # Walking past the tail of a short list reaches the sentinel; clamp it
+        # for the lookup, the score is masked out below
+        cells = self.id_cells[np.minimum(nodes, len(self.id_cells) - 1)]
+        scores = self.sketch[full[:, None, None], cells].min(axis=2).astype(np.int64)
+        scores[np.arange(sample)[None, :] >= self.size[full][:, None]] = np.iinfo(np.int64).max
+        pick = scores.argmin(axis=1)
+        victim = nodes[np.arange(len(full)), pick]
+        admit = self._estimate(full, self.admit_cells[k]) >= scores[np.arange(len(full)), pick]
+        if admit.any():
+            self._remove(full[admit], victim[admit])
+            self._insert(full[admit], k)
+
+    def get(self, k: int, now: float) -> np.ndarray:
+        self.purge(now)
+        hit = self.resident[k].copy()
+        rows = np.nonzero(hit)[0]
+        if len(rows):
+            self.order.move_to_back(rows, k)
+            self._increment(rows, self.id_cells[k])
+        return hit
+
+
+BATCH_POLICIES = {
+    'LRU': LRUBatch,
+    'TTLOnly': TTLOnlyBatch,
+    'PriorityFresh': PriorityFreshBatch,
+    'PAFTinyLFU': PAFTinyLFUBatch,
+}
+
+
+def replay_batch(trace: Trace, policies: Sequence[str], capacities: Sequence[int],
+                 delivered: np.ndarray, weights=None) -> Dict[str, Dict[str, np.ndarray]]:
+    """Advance every policy × state through the trace in one pass over its events.
+
+    ``capacities`` holds the K cache sizes and ``delivered`` the matching
+    ``(n_alerts, K)`` delivery mask. Puts for alerts a state never received are
+    skipped for that state only. Returns ``{policy: {metric: (K,) array}}``.
+    """
+    K = len(capacities)
+    caches = {}
+    for policy in policies:
+        if policy == 'PriorityFresh':
+            caches[policy] = PriorityFreshBatch(trace, capacities, delivered, weights)
+        else:
+            caches[policy] = BATCH_POLICIES[policy](trace, capacities, delivered)
+    n_threads = int(trace.thread.max()) + 1 if trace.n_alerts else 0
+    acc = {p: {'hits': np.zeros(K, dtype=np.int64), 'stale': np.zeros(K, dtype=np.int64),
+               'fresh_sum': np.zeros(K), 'first_t': np.full((n_threads, K), np.inf),
+               'first_k': np.full((n_threads, K), -1, dtype=np.int64)}
+           for p in policies}
+    issued_at, ttl, thread = trace.issued_at, trace.ttl, trace.thread
+    puts = [c.put for c in caches.values()]
+    gets = [(c.get, acc[p]) for p, c in caches.items()]
+
+    for now, kind, k in zip(trace.event_time.tolist(), trace.event_kind.tolist(), trace.event_alert.tolist()):
+        if kind == PUT:
+            for put in puts:
+                put(k, now)
+        elif k >= 0:
+            fresh = math.exp(-max(0.0, now - issued_at[k]) / max(1.0, ttl[k]))
+            th = thread[k]
+            for get, a in gets:
+                hit = get(k, now)
+                if not hit.any():
+                    continue
+                a['hits'] += hit
+                a['fresh_sum'] += hit * fresh
+                if fresh <= 0:
+                    a['stale'] += hit
+                first = hit & np.isinf(a['first_t'][th])
+                a['first_t'][th, first] = now
+                a['first_k'][th, first] = k
+        else:
+            # No live target: a miss for every state; purge to keep time moving
+            for c in caches.values():
+                c.purge(now)
+
+    total = trace.n_queries
+    sla = TARGET_FIRST_DELIVERY_SEC.get(trace.scenario, TARGET_FIRST_DELIVERY_SEC['Urban'])
+    results = {}
+    for policy, a in acc.items():
+        retrieved = a['first_k'] >= 0
+        n_first = np.maximum(1, retrieved.sum(axis=0))
+        actionable = (retrieved & trace.actionable[np.maximum(a['first_k'], 0)]).sum(axis=0)
+        results[policy] = {
+            'cacheHitRate': a['hits'] / total if total else np.zeros(K),
+            'avgFreshness': np.divide(a['fresh_sum'], a['hits'], out=np.zeros(K), where=a['hits'] > 0),
+            'staleAccessRate': a['stale'] / total if total else np.zeros(K),
+            'actionabilityFirstRatio': actionable / n_first,
+            'timelinessConsistency': (a['first_t'] <= sla).sum(axis=0) / n_first,
+        }
+    return results
+
+
+def delivery_masks(trace: Trace, reliabilities: Sequence[float], seed: int = 0) -> np.ndarray:
+    """``(n_alerts, len(reliabilities))`` delivery draws, one uniform per alert.
+
+    Every level reuses the same draw (delivered if ``u < reliability``), so a
+    more reliable network receives a superset of a less reliable one's alerts
+    and grid cells differ only by the parameters, not by sampling noise.
+    """
+    u = np.random.default_rng(seed).random(trace.n_alerts)
+    return u[:, None] < np.asarray(reliabilities, dtype=np.float64)[None, :]
+
+
+def grid_rows(trace: Trace, policies: Sequence[str], cells, weights=None, seed: int = 0) -> List[dict]:
+    """exportCombinedComparisonCSV rows (plus queryModel) for ``cells`` × ``policies`` of one trace.
+
+    ``cells`` are ((device, cacheSize), (network, reliability)) pairs. The
+    delivery draw depends only on ``seed`` and the trace, so any subset of a
+    grid reproduces the same rows as the whole grid.
+    """
+    networks = sorted({n for _, n in cells}, key=lambda n: -n[1])
+    levels = delivery_masks(trace, [r for _, r in networks], seed)
+    level_of = {n: j for j, n in enumerate(networks)}
+    capacities = np.array([size for (_, size), _ in cells], dtype=np.int64)
+    delivered = levels[:, [level_of[n] for _, n in cells]]
+    results = replay_batch(trace, policies, capacities, delivered, weights)
+    query_rate = trace.n_queries / trace.duration_sec * 60 if trace.duration_sec else 0.0
+    per_level = [trace_metrics(trace, levels[:, j]) for j in range(len(networks))]
+    rows = []
+    for j, ((device, cache_size), (network, reliability)) in enumerate(cells):
+        for policy in policies:
+            rows.append({
+                'device': device,
+                'network': network,
+                'policy': policy,
+                'seed': trace.seed,
+                'scenario': trace.scenario,
+                'cacheSize': int(cache_size),
+                'alerts': trace.n_alerts,
+                'reliability': round(float(reliability), 3),
+                'durationSec': int(trace.duration_sec),
+                'queryRatePerMin': round(query_rate, 3),
+                **{m: float(v[j]) for m, v in results[policy].items()},
+                **per_level[level_of[(network, reliability)]],
+                'pushesSent': 0,
+                'pushSuppressRate': 0.0,
+                'pushDuplicateRate': 0.0,
+                'pushTimelyFirstRatio': 0.0,
+                QUERY_MODEL_COLUMN: trace.query_model,
+            })
+    return rows
+
+
+def replay_grid_rows(traces: Sequence[Trace], policies: Sequence[str], devices, networks,
+                     weights=None, seed: int = 0) -> pd.DataFrame:
+    """The combined-comparison grid (device × network × policy) in one pass per trace.
+
+    ``devices`` are (name, cacheSize) and ``networks`` (name, reliability)
+    pairs; the trace's own ``delivered`` column is replaced by a delivery draw
+    per network level.
+    """
+    cells = [(d, n) for d in devices for n in networks]
+    rows = []
+    for i, trace in enumerate(traces):
+        rows.extend(grid_rows(trace, policies, cells, weights, seed + i))
+    return pd.DataFrame(rows, columns=REPLAY_COMBINED_COLUMNS)
+
+
+def device_profiles_for(cache_sizes: Sequence[int]):
+    """(name, cacheSize) pairs, reusing the simulator's device names where sizes match."""
+    names = {size: name for name, size in DEVICE_PROFILES}
+    return [(names.get(int(c), f'Cache {int(c)}'), int(c)) for c in cache_sizes]
+
+
+def network_profiles_for(reliabilities: Sequence[float]):
+    """(name, reliability) pairs, reusing the simulator's network names where levels match."""
+    names = {rel: name for name, rel in NETWORK_PROFILES}
+    return [(names.get(round(float(r), 3), f'Reliability {float(r):g}'), round(float(r), 3))
+            for r in reliabilities]
+
+
+def load_csv(csv_path, required):
+    try:
+        df = read_csv_cached(csv_path)
+    except FileNotFoundError:
+        print(f"Error: File not found: {csv_path}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error loading CSV: {e}")
+        sys.exit(1)
+    missing = [col for col in required if col not in df.columns]
+    if missing:
+        print(f"Error: Missing required columns in {csv_path}: {missing}")
+        sys.exit(1)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Replay an alert/query trace through the cache policies and export multi-policy CSV rows',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # All four policies at one cache size, synthetic queries at 6/min
+  python trace_replay.py data/aware-alerts-1234.csv --cache-sizes 128 --output replay.csv
+  python plot_metrics.py replay.csv
+
+  # Recorded queries, several cache sizes (one CSV per size for the scaling script)
+  python trace_replay.py data/aware-alerts-1234.csv --queries data/queries.csv \\
+      --cache-sizes 32,128,512 --split-by-size --output replay
+
+  # Whole device × network grid in one pass, for plot_combined_comparison.py
+  python trace_replay.py data/aware-alerts-1234.csv --grid --output combined.csv
+  python plot_combined_comparison.py --file combined.csv
+
+Queries name their target alert instead of picking from each policy's
+resident set as run.ts does, so hit rate, freshness and first-retrieval
+metrics differ in meaning from simulator exports; rows carry a queryModel
+column and the plotting scripts caption their figures.
+        """
+    )
+    parser.add_argument('alerts_csv', help='Alerts export (runId,...,alertId,...,issuedAt,ttlSec,...,delivered)')
+    parser.add_argument('--queries', help='Query trace CSV with time,alertId[,runId] (default: synthesize)')
+    parser.add_argument('--query-rate', type=float, default=DEFAULT_QUERY_RATE_PER_MIN,
+                       help=f'Synthetic queries per minute (default: {DEFAULT_QUERY_RATE_PER_MIN})')
+    parser.add_argument('--duration', type=float, help='Run length in seconds (default: last issuedAt + 1)')
+    parser.add_argument('--policies', default=','.join(POLICY_ORDER),
+                       help=f"Comma-separated policies (default: {','.join(POLICY_ORDER)})")
+    parser.add_argument('--cache-sizes',
+                       help='Comma-separated cache sizes (default: 128; with --grid: the device profiles)')
+    parser.add_argument('--grid', action='store_true',
+                       help='Replay every cache size × reliability × policy in one batched pass and '
+                            'write the combined-comparison CSV')
+    parser.add_argument('--reliabilities',
+                       help='Comma-separated network reliabilities for --grid (default: the network profiles)')
+    parser.add_argument('--wS', type=float, help='PriorityFresh severity weight (default: 2)')
+    parser.add_argument('--wU', type=float, help='PriorityFresh urgency weight (default: 3)')
+    parser.add_argument('--wF', type=float, help='PriorityFresh freshness weight (default: 4)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Seed for synthetic queries and --grid delivery draws (default: 0)')
+    parser.add_argument('--output', '-o', default='replay.csv', help='Output CSV (default: replay.csv)')
+    parser.add_argument('--split-by-size', action='store_true',
+                       help='Write OUTPUT-<cacheSize>.csv per cache size instead of one file')
+
+    args = parser.parse_args()
+
+    policies = [p.strip() for p in args.policies.split(',') if p.strip()]
+    unknown = [p for p in policies if p not in POLICIES]
+    if unknown:
+        print(f"Error: Unknown policies: {unknown}. Choose from: {', '.join(POLICIES)}")
+        sys.exit(1)
+    if args.grid and args.split_by_size:
+        print("Error: --split-by-size cannot be combined with --grid")
+        sys.exit(1)
+    if args.cache_sizes:
+        cache_sizes = [int(float(c)) for c in args.cache_sizes.split(',')]
+        devices = device_profiles_for(cache_sizes)
+    else:
+        cache_sizes = [128]
+        devices = list(DEVICE_PROFILES)
+    if args.reliabilities:
+        networks = network_profiles_for([float(r) for r in args.reliabilities.split(',')])
+    else:
+        networks = list(NETWORK_PROFILES)
+
+    print(f"Loading alerts: {args.alerts_csv}")
+    alerts = load_csv(args.alerts_csv, ['alertId', 'issuedAt', 'ttlSec'])
+    queries = load_csv(args.queries, ['time', 'alertId']) if args.queries else None
+    if args.grid:
+        # Delivery is redrawn per network level, so every alert is a potential put
+        alerts = alerts.drop(columns='delivered', errors='ignore')
+    traces = build_traces(alerts, queries, args.query_rate, args.duration, args.seed)
+    print(f"Runs: {len(traces)} | Alerts: {sum(t.n_alerts for t in traces)} | "
+          f"Queries: {sum(t.n_queries for t in traces)}")
+
+    weights = {'wS': args.wS, 'wU': args.wU, 'wF': args.wF}
+    if args.grid:
+        print(f"Grid: {len(devices)} cache sizes × {len(networks)} reliabilities × {len(policies)} policies")
+        df = replay_grid_rows(traces, policies, devices, networks, weights, args.seed)
+    else:
+        df = replay_rows(traces, policies, cache_sizes, weights)
+
+    if args.split_by_size:
+        prefix = args.output[:-4] if args.output.endswith('.csv') else args.output
+        for cache_size, part in df.groupby('cacheSize', sort=True):
+            out = f"{prefix}-{cache_size}.csv"
+            part.to_csv(out, index=False)
+            print(f"✓ Saved: {out}")
+    else:
+        df.to_csv(args.output, index=False)
+        print(f"✓ Saved: {args.output}")
+
+    print(f"\n{'Policy':<15} {'Cache':>6} {'Hit Rate':>9} {'Freshness':>10}")
+    summary = df.groupby(['policy', 'cacheSize'], sort=False)[['cacheHitRate', 'avgFreshness']].mean()
+    for (policy, cache_size), row in summary.iterrows():
+        print(f"{policy:<15} {cache_size:>6} {row['cacheHitRate'] * 100:>8.2f}% {row['avgFreshness']:>10.3f}")
+    print(f"\nQuery model: {', '.join(df[QUERY_MODEL_COLUMN].unique())} "
+          "(hit rate and freshness are not comparable with simulator exports)")
+
+
+if __name__ == '__main__':
+    main()